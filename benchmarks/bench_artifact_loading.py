@@ -0,0 +1,39 @@
+"""Compares building a parser from its grammar against loading its
+memory-mapped artifact.
+
+Run with `python -m benchmarks.bench_artifact_loading`.
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.build import ParserArtifact
+from compilers.parser.parser import LALRParser
+from compilers.parser.serialization import get_artifact_path, load, load_or_build
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for levels in (4, 16, 32):
+            g = precedence_grammar(levels)
+
+            start = time.perf_counter()
+            LALRParser(g)
+            build_seconds = time.perf_counter() - start
+
+            load_or_build(Path(directory), g)
+            path = get_artifact_path(Path(directory), g)
+            start = time.perf_counter()
+            LALRParser.from_artifact(ParserArtifact(g, load(path, g)))
+            load_seconds = time.perf_counter() - start
+
+            print(
+                f"levels={levels:<3} build={build_seconds * 1000:8.1f}ms "
+                f"load={load_seconds * 1000:6.2f}ms "
+                f"file={path.stat().st_size}B"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Compares building many grammars serially against `build_parsers`.
+
+Run with `python -m benchmarks.bench_batch_build`.
+"""
+import time
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.build import build_parsers
+from compilers.parser.parser import LALRParser
+
+
+def main() -> None:
+    grammars = [precedence_grammar(levels) for levels in range(2, 14)] * 2
+
+    start = time.perf_counter()
+    for g in grammars:
+        LALRParser(g)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reports = build_parsers(grammars, measure_memory=False)
+    pool_seconds = time.perf_counter() - start
+
+    print(
+        f"{len(grammars)} grammars: "
+        f"serial {serial_seconds:.2f}s, pool {pool_seconds:.2f}s"
+    )
+    for report in build_parsers(grammars[:4]):
+        print(
+            f"  states={report.artifact.table.state_count:<4} "
+            f"seconds={report.seconds:.3f} peak_memory={report.peak_memory} "
+            f"conflicts={len(report.conflicts)}"
+        )
+    assert len(reports) == len(grammars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares importing a generated parser module against building the
+parser from its grammar, each in a fresh interpreter.
+
+Run with `python -m benchmarks.bench_codegen_import`.
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.codegen import write_parser_module
+
+_REPEATS = 5
+
+_BUILD = """
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.parser import LALRParser
+LALRParser(precedence_grammar({levels}))
+"""
+
+
+def _run(code: str, cwd: Path, pythonpath: str) -> float:
+    """Best wall time of running `code` in a new interpreter."""
+    best = float("inf")
+    for _ in range(_REPEATS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=cwd,
+            env={"PYTHONPATH": pythonpath},
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    root = str(Path(__file__).resolve().parent.parent)
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = Path(directory)
+        baseline = _run("pass", cwd, root)
+        print(f"interpreter startup {baseline * 1000:.1f}ms (subtracted below)")
+
+        for levels in (4, 16, 32):
+            path = cwd / f"generated_{levels}.py"
+            write_parser_module(precedence_grammar(levels), path)
+
+            import_seconds = _run(f"import {path.stem}", cwd, root) - baseline
+            build_seconds = _run(_BUILD.format(levels=levels), cwd, root) - baseline
+            print(
+                f"levels={levels:<3} import={import_seconds * 1000:7.1f}ms "
+                f"build={build_seconds * 1000:8.1f}ms "
+                f"module={path.stat().st_size}B"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Reports the size of comb-vector compressed tables against the dense
+compiled arrays, and the cost of a lookup in each.
+
+Run with `python -m benchmarks.bench_compression`.
+"""
+import timeit
+from typing import Callable
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.build import build_parser_artifact
+from compilers.parser.compression import CombTable
+
+
+def nanoseconds_per_lookup(
+    action: Callable[[int, int], int], keys: list[tuple[int, int]]
+) -> float:
+    def lookups() -> None:
+        for state, terminal in keys:
+            action(state, terminal)
+
+    seconds = min(timeit.repeat(lookups, number=5, repeat=3))
+    return seconds / (5 * len(keys)) * 1e9
+
+
+def main() -> None:
+    for levels in (2, 8, 16, 32):
+        compiled = build_parser_artifact(precedence_grammar(levels)).table
+        comb = CombTable(compiled)
+        keys = [
+            (state, terminal)
+            for state in range(compiled.state_count)
+            for terminal in range(len(compiled.terminals))
+        ]
+
+        print(
+            f"levels={levels:<3} states={compiled.state_count:<4} "
+            f"dense={compiled.nbytes}B comb={comb.nbytes}B "
+            f"ratio={comb.nbytes / compiled.nbytes:.2f} "
+            f"dense={nanoseconds_per_lookup(compiled.action, keys):.0f}ns/lookup "
+            f"comb={nanoseconds_per_lookup(comb.action, keys):.0f}ns/lookup"
+        )
+
+
+if __name__ == "__main__":
+    main()
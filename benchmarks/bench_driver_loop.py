@@ -0,0 +1,86 @@
+"""Compares the integer driver loop of `LALRParser.parse` against the
+previous loop, which pattern-matched on decoded `Action`s and kept item
+sets on its stack, in tokens per second on large expressions.
+
+Run with `python -m benchmarks.bench_driver_loop`.
+"""
+import timeit
+from collections import deque
+from typing import Iterable, Iterator
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.lexer.tokens import Token
+from compilers.parser.actions import Accept, Error, Goto, Reduce, Shift
+from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
+from compilers.parser.build import ParserArtifact, build_parser_artifact
+from compilers.parser.parser import LALRParser, UnexpectedTokenError
+
+
+def consume_token(chain: Iterator[Token]) -> Token:
+    return next(chain)
+
+
+def reference_parse(artifact: ParserArtifact, chain: Iterable[Token]) -> ASTNode:
+    table = artifact.table
+    productions = artifact.grammar.production_lines
+    parsing_stack = [table.start_state]
+    ast_stack: list[ASTNode] = []
+    chain_iterator = iter(chain)
+
+    token = consume_token(chain_iterator)
+    while True:
+        current_state = parsing_stack[-1]
+        action = table.get_default_reduction(current_state) or table[
+            current_state, token.terminal
+        ]
+        match action:
+            case Shift(target=target_state):
+                parsing_stack.append(target_state)
+                ast_stack.append(TerminalNode(token.terminal, token.value))
+                token = consume_token(chain_iterator)
+
+            case Reduce(production=production_id):
+                production = productions[production_id]
+                children: deque[ASTNode] = deque()
+                for _ in production.derivation:
+                    parsing_stack.pop()
+                    children.appendleft(ast_stack.pop())
+
+                node = NonterminalNode(production.nonterminal, children)
+                goto = table[parsing_stack[-1], production.nonterminal]
+                assert isinstance(goto, Goto)
+                parsing_stack.append(goto.target)
+                ast_stack.append(node)
+
+            case Accept():
+                return ast_stack[-1]
+
+            case Error():
+                raise UnexpectedTokenError(token, -1)
+
+
+def main() -> None:
+    g = expression_grammar()
+    artifact = build_parser_artifact(g)
+    parser = LALRParser.from_artifact(artifact)
+
+    # Comparing trees recurses through them, so only check a small one
+    tokens = expression_tokens(g, 100)
+    assert parser.parse(tokens) == reference_parse(artifact, tokens)
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+
+        for name, parse in (
+            ("reference loop", lambda: reference_parse(artifact, tokens)),
+            ("integer loop", lambda: parser.parse(tokens)),
+        ):
+            seconds = min(timeit.repeat(parse, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} {name:<15} "
+                f"{len(tokens) / seconds / 1000:7.1f}k tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares the peak memory and throughput of streaming parse events with
+building the whole AST, on expressions generated lazily token by token.
+
+Run with `python -m benchmarks.bench_event_stream`.
+"""
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Iterator
+
+from benchmarks.grammars import expression_grammar
+from compilers.grammar import Grammar, Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+
+
+def sum_tokens(g: Grammar, operand_count: int) -> Iterator[Token]:
+    """Yields `num + num + ... + num` without holding the chain in memory."""
+    plus, num = Terminal("+"), Terminal("num")
+    yield Token(num, "0")
+    for i in range(1, operand_count):
+        yield Token(plus, None)
+        yield Token(num, str(i))
+    yield Token(get_end_of_chain(g))
+
+
+def measure(run: Callable[[], object]) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main() -> None:
+    g = expression_grammar()
+    parser = LALRParser(g)
+
+    for operand_count in (10000, 100000, 500000):
+        token_count = 2 * operand_count
+        for name, run in (
+            ("parse", lambda: parser.parse(sum_tokens(g, operand_count))),
+            (
+                "events",
+                lambda: deque(parser.events(sum_tokens(g, operand_count)), 0),
+            ),
+        ):
+            seconds, peak = measure(run)
+            print(
+                f"tokens={token_count:<8} {name:<7} "
+                f"peak={peak / 1024:9.1f}KiB "
+                f"{token_count / seconds / 1000:7.1f}k tokens/s (traced)"
+            )
+
+
+if __name__ == "__main__":
+    main()
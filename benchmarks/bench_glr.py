@@ -0,0 +1,69 @@
+"""Compares `GLRParser` against `LALRParser` in tokens per second on the
+conflict-free expression grammar, and shows how GLR scales on the
+ambiguous grammar E -> E + E | num, whose sums of n numbers have
+Catalan(n - 1) trees.
+
+Run with `python -m benchmarks.bench_glr`.
+"""
+import timeit
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.grammar import Grammar, Nonterminal, Production, Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.glr import GLRParser, count_trees, get_tree
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+
+
+def ambiguous_grammar() -> Grammar:
+    # S -> E
+    # E -> E + E | num
+
+    S, E = Nonterminal("S"), Nonterminal("E")
+    plus, num = Terminal("+"), Terminal("num")
+    return Grammar([Production(S, [E]), Production(E, [(E, plus, E), num])], S)
+
+
+def sum_tokens(g: Grammar, operand_count: int) -> list[Token]:
+    plus, num = Terminal("+"), Terminal("num")
+    tokens = [Token(num, "0")]
+    for i in range(1, operand_count):
+        tokens += [Token(plus, None), Token(num, str(i))]
+    return tokens + [Token(get_end_of_chain(g))]
+
+
+def main() -> None:
+    g = expression_grammar()
+    lalr = LALRParser(g)
+    glr = GLRParser(g)
+
+    # Comparing trees recurses through them, so only check a small one
+    tokens = expression_tokens(g, 100)
+    assert get_tree(glr.parse(tokens)) == lalr.parse(tokens)
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+        for name, parse in (
+            ("LALR", lambda: lalr.parse(tokens)),
+            ("GLR", lambda: glr.parse(tokens)),
+        ):
+            seconds = min(timeit.repeat(parse, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} {name:<5} "
+                f"{len(tokens) / seconds / 1000:7.1f}k tokens/s"
+            )
+
+    g = ambiguous_grammar()
+    glr = GLRParser(g)
+    for operand_count in (10, 20, 40, 80):
+        tokens = sum_tokens(g, operand_count)
+        seconds = min(timeit.repeat(lambda: glr.parse(tokens), number=1, repeat=3))
+        trees = count_trees(glr.parse(tokens))
+        print(
+            f"ambiguous operands={operand_count:<3} {seconds * 1000:9.2f}ms "
+            f"trees={trees:.3e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compares reparsing a large expression after editing a single number,
+at the start, middle and end of the chain, with `IncrementalParser` and
+with a full `LALRParser.parse`.
+
+The nodes containing the edit are always rebuilt, and in the flat sums of
+a left recursive grammar those are all the sums after it. Edits near the
+end are therefore the cheapest.
+
+Run with `python -m benchmarks.bench_incremental`.
+"""
+import timeit
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.grammar import Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.incremental import IncrementalParser
+from compilers.parser.parser import LALRParser
+
+
+def main() -> None:
+    g = expression_grammar()
+    parser = LALRParser(g)
+    num = Terminal("num")
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+        incremental = IncrementalParser(parser, tokens)
+
+        seconds = min(timeit.repeat(lambda: parser.parse(tokens), number=1, repeat=5))
+        print(f"tokens={len(tokens):<7} full parse        {seconds * 1000:9.3f}ms")
+
+        numbers = [i for i, token in enumerate(tokens) if token.terminal == num]
+        for name, fraction in (("start", 0.0), ("middle", 0.5), ("end", 1.0)):
+            position = numbers[int(fraction * (len(numbers) - 1))]
+
+            def edit() -> None:
+                incremental.edit(position, position + 1, [Token(num, "0")])
+
+            seconds = min(timeit.repeat(edit, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} edit at {name:<9} "
+                f"{seconds * 1000:9.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Measures the cost of `parse_instrumented` over `LALRParser.translate`,
+and shows that `translate` itself is unchanged by the instrumentation.
+
+Run with `python -m benchmarks.bench_instrumentation`.
+"""
+import timeit
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.parser.instrumentation import parse_instrumented
+from compilers.parser.parser import LALRParser
+
+
+def main() -> None:
+    g = expression_grammar()
+    parser = LALRParser(g)
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+
+        for name, run in (
+            ("translate", lambda: parser.translate(tokens)),
+            ("instrumented", lambda: parse_instrumented(parser, tokens)),
+        ):
+            seconds = min(timeit.repeat(run, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} {name:<12} "
+                f"{len(tokens) / seconds / 1000:7.1f}k tokens/s"
+            )
+
+    _, metrics = parse_instrumented(parser, expression_tokens(g, 1000))
+    print(f"max depth={metrics.max_depth} reductions by production:")
+    for production, count in sorted(metrics.reductions_by_production.items()):
+        print(f"  {g.production_lines[production]}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compares canonical LR(1) construction against LALR construction in
+state counts and build time across grammar sizes.
+
+Run with `python -m benchmarks.bench_lr1_vs_lalr`.
+"""
+import time
+from typing import Callable, TypeVar
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.lalr_automata import LALRAutomata
+from compilers.parser.lr1_automata import LR1Automata
+
+T = TypeVar("T")
+
+
+def timed(build: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = build()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    print("levels  LR(1) states  LALR states  LR(1) time  merged time  LALR time")
+    for levels in (1, 2, 4, 8, 12, 16):
+        g = precedence_grammar(levels)
+        canonical, canonical_seconds = timed(lambda: LR1Automata(g))
+        _, merged_seconds = timed(lambda: LR1Automata(g, merge_cores=True))
+        lalr, lalr_seconds = timed(lambda: LALRAutomata(g))
+        print(
+            f"{levels:>6}  {len(canonical.states):>12}  {len(lalr.states):>11}  "
+            f"{canonical_seconds:>9.3f}s  {merged_seconds:>10.3f}s  "
+            f"{lalr_seconds:>8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Reports state counts and pickled table sizes before and after state
+minimization.
+
+Run with `python -m benchmarks.bench_minimization`.
+"""
+import pickle
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.lalr_automata import LALRAutomata
+from compilers.parser.optimizations import eliminate_unit_reductions, minimize_states
+
+
+def main() -> None:
+    for levels in (2, 4, 8, 16):
+        g = precedence_grammar(levels)
+        automata = LALRAutomata(g)
+        table = eliminate_unit_reductions(
+            automata.compute_parsing_table(default_reductions=True), g
+        )
+        minimized, _ = minimize_states(table, automata.start_state)
+
+        states, minimized_states = len(set(table.states)), len(set(minimized.states))
+        size, minimized_size = len(pickle.dumps(table)), len(pickle.dumps(minimized))
+        print(
+            f"levels={levels:<3} states {states} -> {minimized_states}  "
+            f"pickled {size} -> {minimized_size} bytes "
+            f"({1 - minimized_size / size:.0%} smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
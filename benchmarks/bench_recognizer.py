@@ -0,0 +1,32 @@
+"""Compares `LALRParser.validate`, which only keeps the state stack,
+against `parse` in tokens per second on large expressions.
+
+Run with `python -m benchmarks.bench_recognizer`.
+"""
+import timeit
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.parser.parser import LALRParser
+
+
+def main() -> None:
+    g = expression_grammar()
+    parser = LALRParser(g)
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+        assert parser.recognize(tokens)
+
+        for name, run in (
+            ("parse", lambda: parser.parse(tokens)),
+            ("validate", lambda: parser.validate(tokens)),
+        ):
+            seconds = min(timeit.repeat(run, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} {name:<9} "
+                f"{len(tokens) / seconds / 1000:7.1f}k tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compares evaluating expressions with reduce and shift callbacks, which
+never build the AST, against parsing to an AST and walking it afterwards.
+
+Run with `python -m benchmarks.bench_semantic_actions`.
+"""
+import timeit
+from typing import Sequence
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.grammar import Nonterminal, Terminal
+from compilers.grammar.productions import ProductionLine
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
+from compilers.parser.parser import LALRParser, ReduceCallback, ShiftCallback
+
+# Keeps the values small, so big integer arithmetic does not dominate
+MODULUS = 2**31 - 1
+
+
+def get_callbacks(
+    parser: LALRParser,
+) -> tuple[dict[ProductionLine, ReduceCallback], dict[Terminal, ShiftCallback]]:
+    g = parser.grammar
+    E, T, F = (Nonterminal(value) for value in ("E", "T", "F"))
+
+    e_to_e_plus_t, e_to_t = g.get_production(E)
+    t_to_t_mult_f, t_to_f = g.get_production(T)
+    f_to_parentheses, f_to_num = g.get_production(F)
+    reduce_callbacks: dict[ProductionLine, ReduceCallback] = {
+        e_to_e_plus_t: lambda children: (children[0] + children[2]) % MODULUS,
+        t_to_t_mult_f: lambda children: children[0] * children[2] % MODULUS,
+        f_to_parentheses: lambda children: children[1],
+        e_to_t: lambda children: children[0],
+        t_to_f: lambda children: children[0],
+        f_to_num: lambda children: children[0],
+    }
+    shift_callbacks: dict[Terminal, ShiftCallback] = {
+        Terminal("num"): lambda token: int(token.value)
+    }
+    return reduce_callbacks, shift_callbacks
+
+
+def evaluate_tree(root: ASTNode) -> int:
+    """Evaluates the AST bottom-up with an explicit stack, since left
+    recursive trees are too deep to walk recursively."""
+    values: list[int] = []
+    stack: list[tuple[ASTNode, bool]] = [(root, False)]
+
+    while len(stack) > 0:
+        node, visited = stack.pop()
+        if isinstance(node, TerminalNode):
+            if node.symbol == Terminal("num"):
+                values.append(int(node.value))
+            continue
+        assert isinstance(node, NonterminalNode)
+        if not visited:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+            continue
+
+        # Unit productions and parentheses leave the inner value as it is
+        operator = node.children[1] if len(node.children) == 3 else None
+        if isinstance(operator, TerminalNode):
+            right, left = values.pop(), values.pop()
+            if operator.symbol == Terminal("+"):
+                values.append((left + right) % MODULUS)
+            else:
+                values.append(left * right % MODULUS)
+
+    return values[-1]
+
+
+def parse_and_evaluate(parser: LALRParser, tokens: Sequence[Token]) -> int:
+    return evaluate_tree(parser.parse(tokens))
+
+
+def main() -> None:
+    g = expression_grammar()
+    parser = LALRParser(g)
+    reduce_callbacks, shift_callbacks = get_callbacks(parser)
+
+    for operand_count in (1000, 10000, 50000):
+        tokens = expression_tokens(g, operand_count)
+        expected = parse_and_evaluate(parser, tokens)
+        assert (
+            parser.translate(tokens, reduce_callbacks, shift_callbacks) == expected
+        )
+
+        for name, evaluate in (
+            ("parse and walk", lambda: parse_and_evaluate(parser, tokens)),
+            (
+                "callbacks",
+                lambda: parser.translate(tokens, reduce_callbacks, shift_callbacks),
+            ),
+        ):
+            seconds = min(timeit.repeat(evaluate, number=1, repeat=5))
+            print(
+                f"tokens={len(tokens):<7} {name:<15} "
+                f"{len(tokens) / seconds / 1000:7.1f}k tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compares the memory each worker process allocates for its parsing
+tables when loading a private copy against attaching to shared memory.
+
+Run with `python -m benchmarks.bench_shared_tables`.
+"""
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.build import ParserArtifact, build_parser_artifact
+from compilers.parser.parser import LALRParser
+from compilers.parser.serialization import dumps, loads
+from compilers.parser.shared import attach_table, publish_table
+
+_LEVELS = 32
+_WORKERS = 4
+
+
+def _load_private(data: bytes) -> int:
+    g = precedence_grammar(_LEVELS)
+    tracemalloc.start()
+    table = loads(bytearray(data), g)
+    LALRParser.from_artifact(ParserArtifact(g, table))
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated
+
+
+def _attach_shared(name: str) -> int:
+    g = precedence_grammar(_LEVELS)
+    tracemalloc.start()
+    table = attach_table(name, g)
+    LALRParser.from_artifact(ParserArtifact(g, table))
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated
+
+
+def main() -> None:
+    g = precedence_grammar(_LEVELS)
+    table = build_parser_artifact(g, keep_states=False).table
+    data = dumps(table, g)
+    print(f"levels={_LEVELS} table arrays={table.nbytes}B artifact={len(data)}B")
+
+    # Workers start after publishing, so they share the resource tracker
+    shared_memory = publish_table(table, g)
+    try:
+        with ProcessPoolExecutor(max_workers=_WORKERS) as executor:
+            private = list(executor.map(_load_private, [data] * _WORKERS))
+            names = [shared_memory.name] * _WORKERS
+            attached = list(executor.map(_attach_shared, names))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    for label, sizes in (("private copy", private), ("shared memory", attached)):
+        print(
+            f"{label:<14} per worker={max(sizes):>7}B "
+            f"{_WORKERS} workers={sum(sizes):>8}B"
+        )
+
+
+if __name__ == "__main__":
+    main()
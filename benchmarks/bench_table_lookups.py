@@ -0,0 +1,57 @@
+"""Compares lookups and sizes of `LRParsingTable` against its compiled
+integer arrays.
+
+Run with `python -m benchmarks.bench_table_lookups`.
+"""
+import itertools
+import pickle
+import timeit
+
+from benchmarks.grammars import precedence_grammar
+from compilers.parser.compiled import compile_table
+from compilers.parser.lalr_automata import LALRAutomata, get_end_of_chain
+
+
+def main() -> None:
+    g = precedence_grammar(8)
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table(default_reductions=True)
+    compiled = compile_table(table, automata.start_state, g)
+    compact = compile_table(table, automata.start_state, g, keep_states=False)
+
+    terminals = sorted(g.terminals | {get_end_of_chain(g)}, key=lambda t: t.value)
+    keys = list(itertools.product(automata.states, terminals))
+    id_keys = [
+        (state_id, terminal_id)
+        for state_id in range(compiled.state_count)
+        for terminal_id in range(len(compiled.terminals))
+    ]
+
+    def dict_lookups() -> None:
+        for key in keys:
+            table[key]
+
+    def view_lookups() -> None:
+        for key in keys:
+            compiled[key]
+
+    def array_lookups() -> None:
+        action = compiled.action
+        for state, terminal in id_keys:
+            action(state, terminal)
+
+    for name, lookups in (
+        ("LRParsingTable", dict_lookups),
+        ("compiled view", view_lookups),
+        ("compiled arrays", array_lookups),
+    ):
+        seconds = min(timeit.repeat(lookups, number=20, repeat=3))
+        print(f"{name:<16} {seconds / (20 * len(keys)) * 1e9:7.1f} ns/lookup")
+
+    print(f"pickled LRParsingTable: {len(pickle.dumps(table))} bytes")
+    print(f"pickled compiled table: {len(pickle.dumps(compact))} bytes")
+    print(f"compiled arrays:        {compiled.nbytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
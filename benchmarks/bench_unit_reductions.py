@@ -0,0 +1,42 @@
+"""Reports how many reductions per token the unit-production bypass saves.
+
+Run with `python -m benchmarks.bench_unit_reductions`.
+"""
+import timeit
+
+from benchmarks.grammars import expression_grammar, expression_tokens
+from compilers.parser.build import BuildOptions, build_parser_artifact
+from compilers.parser.parser import LALRParser
+from compilers.parser.profile import record_profile
+
+
+def main() -> None:
+    g = expression_grammar()
+    tokens = expression_tokens(g, 2000)
+
+    configurations = {
+        "baseline": (BuildOptions(), True),
+        "bypass, keep nodes": (BuildOptions(bypass_unit_reductions=True), True),
+        "bypass, collapse nodes": (BuildOptions(bypass_unit_reductions=True), False),
+    }
+
+    baseline_reductions = None
+    for name, (options, keep_unit_nodes) in configurations.items():
+        artifact = build_parser_artifact(g, options, keep_states=False)
+        parser = LALRParser.from_artifact(artifact, keep_unit_nodes=keep_unit_nodes)
+        seconds = min(timeit.repeat(lambda: parser.parse(tokens), number=5, repeat=3))
+
+        # Every reduction takes exactly one goto
+        profile = record_profile(artifact.table, [tokens])
+        reductions = sum(profile.nonterminal_counts.values())
+        if baseline_reductions is None:
+            baseline_reductions = reductions
+        saved = (baseline_reductions - reductions) / len(tokens)
+        print(
+            f"{name:<24} reductions/token={reductions / len(tokens):.3f} "
+            f"saved/token={saved:.3f} time/parse={seconds / 5 * 1000:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import random
+from typing import Sequence
+
+from compilers.grammar import Grammar, Nonterminal, Production, Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.lalr_automata import get_end_of_chain
+
+
+def expression_grammar() -> Grammar:
+    # S -> E
+    # E -> E + T | T
+    # T -> T * F | F
+    # F -> (E) | num
+
+    S, E, T, F = (Nonterminal(value) for value in ("S", "E", "T", "F"))
+    plus, mult, open, close, num = (
+        Terminal(value) for value in ("+", "*", "(", ")", "num")
+    )
+
+    return Grammar(
+        [
+            Production(S, [E]),
+            Production(E, [(E, plus, T), T]),
+            Production(T, [(T, mult, F), F]),
+            Production(F, [(open, E, close), num]),
+        ],
+        S,
+    )
+
+
+def expression_tokens(
+    g: Grammar, operand_count: int, seed: int = 0
+) -> Sequence[Token]:
+    """Returns a random well-formed expression over `expression_grammar`
+    with `operand_count` numbers, terminated by the end of chain token."""
+    plus, mult, open, close, num = (
+        Terminal(value) for value in ("+", "*", "(", ")", "num")
+    )
+    rng = random.Random(seed)
+    tokens = []
+    depth = 0
+
+    for i in range(operand_count):
+        if i > 0:
+            tokens.append(Token(rng.choice((plus, mult)), None))
+        while rng.random() < 0.2:
+            tokens.append(Token(open, None))
+            depth += 1
+        tokens.append(Token(num, str(i)))
+        while depth > 0 and rng.random() < 0.3:
+            tokens.append(Token(close, None))
+            depth -= 1
+
+    tokens.extend(Token(close, None) for _ in range(depth))
+    tokens.append(Token(get_end_of_chain(g)))
+    return tokens
+
+
+def precedence_grammar(levels: int) -> Grammar:
+    """Expression grammar with one binary operator per precedence level.
+    Grows linearly in productions and roughly quadratically in states."""
+    # S -> E0
+    # Ei -> Ei opi Ei+1 | Ei+1
+    # En -> (E0) | num
+
+    S = Nonterminal("S")
+    expressions = [Nonterminal(f"E{i}") for i in range(levels + 1)]
+    open, close, num = Terminal("("), Terminal(")"), Terminal("num")
+
+    productions = [Production(S, [expressions[0]])]
+    for i in range(levels):
+        operator = Terminal(f"op{i}")
+        productions.append(
+            Production(
+                expressions[i],
+                [(expressions[i], operator, expressions[i + 1]), expressions[i + 1]],
+            )
+        )
+    productions.append(
+        Production(expressions[-1], [(open, expressions[0], close), num])
+    )
+
+    return Grammar(productions, S)
+
+
+def precedence_tokens(
+    g: Grammar, levels: int, operand_count: int, seed: int = 0
+) -> Sequence[Token]:
+    """Returns a random well-formed expression over `precedence_grammar`.
+    Operators are skewed towards the first few levels, as in real code
+    where a handful of operators dominate."""
+    open, close, num = Terminal("("), Terminal(")"), Terminal("num")
+    operators = [Terminal(f"op{i}") for i in range(levels)]
+    weights = [1 / (i + 1) ** 2 for i in range(levels)]
+    rng = random.Random(seed)
+    tokens = []
+    depth = 0
+
+    for i in range(operand_count):
+        if i > 0:
+            tokens.append(Token(rng.choices(operators, weights)[0], None))
+        while rng.random() < 0.1:
+            tokens.append(Token(open, None))
+            depth += 1
+        tokens.append(Token(num, str(i)))
+        while depth > 0 and rng.random() < 0.3:
+            tokens.append(Token(close, None))
+            depth -= 1
+
+    tokens.extend(Token(close, None) for _ in range(depth))
+    tokens.append(Token(get_end_of_chain(g)))
+    return tokens
@@ -1,9 +1,12 @@
-from typing import Iterable, Iterator
+import hashlib
+from typing import Iterable, Iterator, Sequence
+
+from compilers.utils import PhaseTimings
 
 from .first_set import FirstSet
 from .follow_set import FollowSet
 from .nonterminals import Nonterminal
-from .productions import Chain, Production
+from .productions import Chain, Production, ProductionLine
 from .symbols import Symbol, is_nonterminal, is_terminal
 from .terminals import Terminal
 
@@ -13,6 +16,8 @@ class Grammar:
     terminals: frozenset[Terminal]
     nonterminals: frozenset[Nonterminal]
     start_symbol: Nonterminal
+    # Time spent computing the FIRST and FOLLOW sets
+    timings: PhaseTimings
 
     def __init__(
         self,
@@ -27,14 +32,28 @@ class Grammar:
         self._productions = {
             production.nonterminal: production for production in productions
         }
+        self._production_lines = tuple(
+            line
+            for production in sorted(
+                self._productions.values(),
+                key=lambda production: production.nonterminal != start_symbol,
+            )
+            for line in production.derivations
+        )
+        self._production_ids = {
+            line: i for i, line in enumerate(self._production_lines)
+        }
         self._first_sets = {symbol: FirstSet() for symbol in self.nonterminals}
         self._follow_sets = {
             nonterminal: FollowSet() for nonterminal in self.nonterminals
         }
 
         self._validate_grammar()
-        self._calculate_first_sets()
-        self._calculate_follow_sets()
+        self.timings = PhaseTimings()
+        with self.timings.measure("first"):
+            self._calculate_first_sets()
+        with self.timings.measure("follow"):
+            self._calculate_follow_sets()
 
     def get_production(self, nonterminal: Nonterminal) -> Production:
         return self._productions[nonterminal]
@@ -51,6 +70,27 @@ class Grammar:
     def productions(self) -> Iterable[Production]:
         return self._productions.values()
 
+    @property
+    def production_lines(self) -> Sequence[ProductionLine]:
+        """Every production line, starting with the start symbol's and
+        otherwise in the order the productions were given."""
+        return self._production_lines
+
+    def get_production_id(self, line: ProductionLine) -> int:
+        """Index of `line` in `production_lines`."""
+        return self._production_ids[line]
+
+    def fingerprint(self) -> str:
+        """Hex digest of the start symbol and every production line, in
+        order. Grammars with equal fingerprints compile to equal tables."""
+        digest = hashlib.sha256(f"{self.start_symbol.value!r}\n".encode())
+        for nonterminal, derivation in self.production_lines:
+            symbols = " ".join(
+                f"{type(symbol).__name__}:{symbol.value!r}" for symbol in derivation
+            )
+            digest.update(f"{nonterminal.value!r} -> {symbols}\n".encode())
+        return digest.hexdigest()
+
     @property
     def derivations(self) -> Iterable[tuple[Nonterminal, Chain]]:
         for production in self._productions.values():
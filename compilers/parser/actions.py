@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from typing import Generic
 
-from compilers.grammar.productions import ProductionLine
 from compilers.parser.lr_sets import StateType
 
 
@@ -17,12 +16,16 @@ class Shift(Action, Generic[StateType]):
 
 @dataclass(frozen=True)
 class Reduce(Action):
-    production: ProductionLine
+    # Index of the production in `Grammar.production_lines`
+    production: int
 
 
 @dataclass(frozen=True)
 class Goto(Generic[StateType]):
     target: StateType
+    # Ids of the unit productions reduced implicitly when taking this goto,
+    # innermost first
+    bypassed: tuple[int, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,124 @@
+import dataclasses
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Sequence
+
+from compilers.grammar.grammar import Grammar
+from compilers.parser.compiled import CompiledConflict, CompiledTable, compile_table
+from compilers.parser.lalr_automata import LALRAutomata
+from compilers.parser.lr_sets import LR1Set
+from compilers.parser.optimizations import (
+    eliminate_unit_reductions,
+    get_reachable_states,
+    minimize_states,
+)
+from compilers.parser.statistics import BuildStatistics
+from compilers.utils import PhaseTimings
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    bypass_unit_reductions: bool = False
+    minimize: bool = False
+
+
+@dataclass(frozen=True)
+class ParserArtifact:
+    """Everything a parser needs at runtime, without the automaton."""
+
+    grammar: Grammar
+    table: CompiledTable[LR1Set]
+    # Only known when the artifact was built in this session
+    statistics: BuildStatistics | None = None
+
+
+@dataclass(frozen=True)
+class BuildReport:
+    artifact: ParserArtifact
+    seconds: float
+    # Peak traced allocation while building, if memory was measured
+    peak_memory: int | None
+
+    @property
+    def conflicts(self) -> Sequence[CompiledConflict]:
+        return self.artifact.table.conflicts
+
+
+def build_parser_artifact(
+    g: Grammar,
+    options: BuildOptions = BuildOptions(),
+    *,
+    keep_states: bool = True,
+    measure_memory: bool = False,
+) -> ParserArtifact:
+    """If `keep_states` is not set, the compiled table refers to states by
+    number only, dropping the automaton's item sets. If `measure_memory` is
+    set, the statistics include the size of the automaton's structures."""
+    timings = PhaseTimings()
+    automata = LALRAutomata(g)
+    start_state = automata.start_state
+    table = automata.compute_parsing_table(default_reductions=True)
+
+    if options.bypass_unit_reductions:
+        with timings.measure("unit_reductions"):
+            table = eliminate_unit_reductions(table, g)
+    if options.minimize:
+        with timings.measure("minimization"):
+            table, representatives = minimize_states(table, start_state)
+        start_state = representatives[start_state]
+
+    with timings.measure("compilation"):
+        compiled = compile_table(table, start_state, g, keep_states=keep_states)
+
+    # Bypassing unit reductions leaves states that are never reached, and
+    # that the compiled table drops
+    statistics = automata.get_statistics(
+        table,
+        states=get_reachable_states(table, start_state),
+        measure_memory=measure_memory,
+    )
+    statistics = dataclasses.replace(
+        statistics,
+        memory={**statistics.memory, "compiled_table": compiled.nbytes},
+        phase_seconds={**statistics.phase_seconds, **timings.seconds},
+    )
+    return ParserArtifact(g, compiled, statistics)
+
+
+def build_parsers(
+    grammars: Iterable[Grammar],
+    options: BuildOptions = BuildOptions(),
+    *,
+    max_workers: int | None = None,
+    measure_memory: bool = True,
+) -> list[BuildReport]:
+    """Builds the parsing tables of every grammar in a process pool.
+    Reports are returned in the same order as `grammars`, and their
+    compiled tables refer to states by number only.
+
+    Measuring memory traces every allocation, which slows down the
+    build itself; pass `measure_memory=False` for accurate timings."""
+    build = partial(_build_report, options=options, measure_memory=measure_memory)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(build, grammars))
+
+
+def _build_report(
+    g: Grammar, options: BuildOptions, measure_memory: bool
+) -> BuildReport:
+    if measure_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    artifact = build_parser_artifact(g, options, keep_states=False)
+    seconds = time.perf_counter() - start
+
+    peak_memory = None
+    if measure_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return BuildReport(artifact, seconds, peak_memory)
@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import NamedTuple
+
+from compilers.grammar.grammar import Grammar
+from compilers.parser.build import BuildOptions, ParserArtifact, build_parser_artifact
+from compilers.parser.serialization import load_or_build
+
+CacheKey = tuple[str, BuildOptions]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    nbytes: int
+
+
+class ParserCache:
+    """Thread-safe LRU cache of parser artifacts, keyed by grammar
+    fingerprint and build options.
+
+    Concurrent requests for a missing grammar build it once: the first
+    builds it outside the lock while the others wait for its result.
+    Failed builds are not cached. If `directory` is given, artifacts are
+    also saved there and memory-mapped from it on later misses, so they
+    survive eviction and are shared between processes.
+
+    Cached tables refer to states by number only. Their size is that of
+    their integer arrays, so a byte budget does not count the grammar and
+    symbol tables kept alongside them."""
+
+    def __init__(
+        self,
+        max_entries: int | None = 64,
+        max_bytes: int | None = None,
+        directory: Path | None = None,
+    ) -> None:
+        """Entries are evicted, least recently used first, while there are
+        more than `max_entries` or they take more than `max_bytes`."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict[CacheKey, ParserArtifact]()
+        self._building = dict[CacheKey, Future[ParserArtifact]]()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self, g: Grammar, options: BuildOptions = BuildOptions()
+    ) -> ParserArtifact:
+        key = (g.fingerprint(), options)
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self._misses += 1
+            future = self._building.get(key)
+            if is_builder := future is None:
+                future = self._building[key] = Future()
+
+        if not is_builder:
+            return future.result()
+
+        try:
+            artifact = self._build(g, options)
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._building[key]
+            self._insert(key, artifact)
+        future.set_result(artifact)
+        return artifact
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries), self._nbytes)
+
+    def clear(self) -> None:
+        """Empties the in-memory tier. Artifacts on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _build(self, g: Grammar, options: BuildOptions) -> ParserArtifact:
+        if self.directory is not None:
+            return ParserArtifact(g, load_or_build(self.directory, g, options))
+        return build_parser_artifact(g, options, keep_states=False)
+
+    def _insert(self, key: CacheKey, artifact: ParserArtifact) -> None:
+        self._entries[key] = artifact
+        self._nbytes += artifact.table.nbytes
+        while len(self._entries) > 0 and self._is_over_budget():
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.table.nbytes
+
+    def _is_over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._nbytes > self.max_bytes
+
+
+_default_cache = ParserCache()
+
+
+def get_default_cache() -> ParserCache:
+    return _default_cache
+
+
+def set_default_cache(cache: ParserCache) -> None:
+    """Replaces the process-wide cache used by `LALRParser.from_cache`."""
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,208 @@
+import sys
+from array import array
+from pathlib import Path
+from string import Template
+
+from compilers.grammar.grammar import Grammar
+from compilers.parser.build import BuildOptions, build_parser_artifact
+from compilers.parser.compiled import IntArray
+
+_MODULE_TEMPLATE = Template(
+    '''"""LALR(1) parser generated by compilers.parser.codegen. Do not edit.
+
+Grammar fingerprint: $fingerprint
+
+Importing this module only loads its tables. The AST and error classes
+are imported from `compilers` on the first call to `parse`, without the
+modules that build parsers.
+"""
+import sys
+from array import array
+from typing import Any, Iterable
+
+FINGERPRINT = "$fingerprint"
+
+_TERMINAL_IDS = $terminal_ids
+_NONTERMINAL_NAMES = $nonterminal_names
+_TERMINAL_COUNT = $terminal_count
+_NONTERMINAL_COUNT = $nonterminal_count
+_ACCEPT = -1
+
+# Encoded as in compilers.parser.compiled, as little-endian C ints
+_ACTIONS = array("i", $actions)
+_GOTOS = array("i", $gotos)
+_DEFAULT_ACTIONS = array("i", $default_actions)
+if sys.byteorder == "big":
+    for _array in (_ACTIONS, _GOTOS, _DEFAULT_ACTIONS):
+        _array.byteswap()
+
+# Per production: number of symbols popped and left-hand side
+_LENGTHS = $lengths
+_LEFT_HAND_SIDES = $left_hand_sides
+$unit_chains_table# Per state: bit i is set if terminal i has an action
+_EXPECTED_TERMINALS = $expected_terminals
+
+_runtime: Any = None
+
+
+def _load_runtime() -> Any:
+    global _runtime
+    from compilers.grammar.nonterminals import Nonterminal
+    from compilers.grammar.terminals import Terminal
+    from compilers.parser import ast, errors
+
+    class Runtime:
+        terminal_node = ast.TerminalNode
+        nonterminal_node = ast.NonterminalNode
+        nonterminals = tuple(Nonterminal(name) for name in _NONTERMINAL_NAMES)
+        terminals = tuple(Terminal(name) for name in _TERMINAL_IDS)
+        unexpected_token_error = errors.UnexpectedTokenError
+        no_end_of_input_error = errors.NoEndOfInputTokenError
+
+    _runtime = Runtime
+    return _runtime
+
+
+def parse(tokens: Iterable[Any]) -> Any:
+    runtime = _runtime or _load_runtime()
+    terminal_node = runtime.terminal_node
+    nonterminal_node = runtime.nonterminal_node
+    nonterminals = runtime.nonterminals
+
+    actions = _ACTIONS
+    gotos = _GOTOS
+    default_actions = _DEFAULT_ACTIONS
+    lengths = _LENGTHS
+    left_hand_sides = _LEFT_HAND_SIDES
+$bind_unit_chains    terminal_ids = _TERMINAL_IDS
+    terminal_count = _TERMINAL_COUNT
+    nonterminal_count = _NONTERMINAL_COUNT
+
+    states = [0]
+    values: list[Any] = []
+    iterator = iter(tokens)
+    index = 0
+
+    try:
+        token = next(iterator)
+    except StopIteration:
+        raise runtime.no_end_of_input_error() from None
+    terminal = terminal_ids.get(token.terminal.value, -1)
+
+    while True:
+        state = states[-1]
+        action = default_actions[state]
+        if not action and terminal >= 0:
+            action = actions[state * terminal_count + terminal]
+
+        if action > 0:
+            states.append(action - 1)
+            values.append(terminal_node(token.terminal, token.value))
+            index += 1
+            try:
+                token = next(iterator)
+            except StopIteration:
+                raise runtime.no_end_of_input_error() from None
+            terminal = terminal_ids.get(token.terminal.value, -1)
+
+        elif action == _ACCEPT:
+            return values[-1]
+
+        elif action < 0:
+            production = -action - 1
+            length = lengths[production]
+            if length > 0:
+                children = values[-length:]
+                del values[-length:]
+                del states[-length:]
+            else:
+                children = []
+
+            left_hand_side = left_hand_sides[production]
+            node = nonterminal_node(nonterminals[left_hand_side], children)
+            goto_index = states[-1] * nonterminal_count + left_hand_side
+$wrap_unit_nodes            states.append(gotos[goto_index])
+            values.append(node)
+
+        else:
+            expected = _EXPECTED_TERMINALS[state]
+            raise runtime.unexpected_token_error(
+                token,
+                index,
+                (
+                    terminal
+                    for i, terminal in enumerate(runtime.terminals)
+                    if expected & (1 << i)
+                ),
+            )
+'''
+)
+
+# Only generated if unit nodes are kept and the table bypasses any
+_UNIT_CHAINS_TABLE = """\
+# Unit productions wrapped around the node taken by a goto, by goto index
+_UNIT_CHAINS: dict[int, tuple[int, ...]] = $unit_chains
+"""
+_BIND_UNIT_CHAINS = """\
+    unit_chains = _UNIT_CHAINS
+"""
+_WRAP_UNIT_NODES = """\
+            for unit_production in unit_chains.get(goto_index, ()):
+                node = nonterminal_node(
+                    nonterminals[left_hand_sides[unit_production]], (node,)
+                )
+"""
+
+
+def generate_parser_module(
+    g: Grammar,
+    options: BuildOptions = BuildOptions(),
+    *,
+    keep_unit_nodes: bool = True,
+) -> str:
+    """Returns the source of a Python module with the compiled tables of `g`
+    as literals and a `parse` function specialized to them. The generated
+    parser builds the same ASTs as `LALRParser` with the same options,
+    without importing `compilers` or building any automaton at import."""
+    table = build_parser_artifact(g, options, keep_states=False).table
+    wraps_unit_nodes = keep_unit_nodes and len(table.unit_chains) > 0
+    unit_chains_table = Template(_UNIT_CHAINS_TABLE).substitute(
+        unit_chains=repr(table.unit_chains)
+    )
+
+    return _MODULE_TEMPLATE.substitute(
+        fingerprint=g.fingerprint(),
+        terminal_ids=repr(
+            {terminal.value: i for i, terminal in enumerate(table.terminals)}
+        ),
+        nonterminal_names=repr(tuple(symbol.value for symbol in table.nonterminals)),
+        terminal_count=len(table.terminals),
+        nonterminal_count=len(table.nonterminals),
+        actions=_to_bytes_literal(table.actions),
+        gotos=_to_bytes_literal(table.gotos),
+        default_actions=_to_bytes_literal(table.default_actions),
+        lengths=repr(tuple(table.production_lengths)),
+        left_hand_sides=repr(tuple(table.left_hand_sides)),
+        unit_chains_table=unit_chains_table if wraps_unit_nodes else "",
+        bind_unit_chains=_BIND_UNIT_CHAINS if wraps_unit_nodes else "",
+        wrap_unit_nodes=_WRAP_UNIT_NODES if wraps_unit_nodes else "",
+        expected_terminals=repr(table.expected_terminals),
+    )
+
+
+def write_parser_module(
+    g: Grammar,
+    path: Path,
+    options: BuildOptions = BuildOptions(),
+    *,
+    keep_unit_nodes: bool = True,
+) -> None:
+    source = generate_parser_module(g, options, keep_unit_nodes=keep_unit_nodes)
+    path.write_text(source)
+
+
+def _to_bytes_literal(buffer: IntArray) -> str:
+    little_endian = array("i", buffer)
+    if sys.byteorder == "big":
+        little_endian.byteswap()
+    return repr(little_endian.tobytes())
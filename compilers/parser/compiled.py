@@ -0,0 +1,274 @@
+from array import array
+from typing import Generic, Iterable, NamedTuple, Sequence, TypeAlias
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.nonterminals import Nonterminal
+from compilers.grammar.productions import ProductionLine
+from compilers.grammar.symbols import Symbol, is_terminal
+from compilers.grammar.terminals import Terminal
+from compilers.parser.actions import Accept, Action, Error, Goto, Reduce, Shift
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.lr_sets import StateType
+from compilers.parser.tables import LRParsingTable
+
+# Flat buffer of C ints: an `array` when built, a memoryview when loaded
+IntArray: TypeAlias = "array[int] | memoryview"
+
+# Encoded actions. Production 0 is the start production, and reducing by
+# it is accepting, so ACCEPT == encode_reduce(0).
+ERROR = 0
+ACCEPT = -1
+NO_GOTO = -1
+
+
+def encode_shift(state: int) -> int:
+    return state + 1
+
+
+def encode_reduce(production: int) -> int:
+    return -production - 1
+
+
+def decode_shift(code: int) -> int:
+    return code - 1
+
+
+def decode_reduce(code: int) -> int:
+    return -code - 1
+
+
+class CompiledConflict(NamedTuple):
+    state: int
+    terminal: int
+    actions: tuple[int, ...]
+
+
+class CompiledTable(Generic[StateType]):
+    """LR parsing table compiled to flat integer arrays.
+
+    States, terminals, nonterminals and productions are numbered, with the
+    start state as state 0. `actions` holds one row of encoded actions per
+    state, `gotos` one row of target states per state, and
+    `default_actions` the encoded default reduction of each state (or
+    ERROR). Indexing with (state, symbol) decodes entries back into
+    `Action`s and `Goto`s, so a compiled table can stand in for an
+    `LRParsingTable`. States are given as `LRSet`s when the compiled table
+    knows them, and as state numbers otherwise."""
+
+    def __init__(
+        self,
+        terminals: Sequence[Terminal],
+        nonterminals: Sequence[Nonterminal],
+        productions: Sequence[ProductionLine],
+        actions: IntArray,
+        gotos: IntArray,
+        default_actions: IntArray,
+        unit_chains: dict[int, tuple[int, ...]] | None = None,
+        conflicts: Iterable[CompiledConflict] = (),
+        states: Sequence[StateType] = (),
+        expected_terminals: Sequence[int] | None = None,
+    ) -> None:
+        """`expected_terminals` are computed from `actions` if not given."""
+        self.terminals = tuple(terminals)
+        self.nonterminals = tuple(nonterminals)
+        self.productions = tuple(productions)
+        self.actions = actions
+        self.gotos = gotos
+        self.default_actions = default_actions
+        # Bypassed unit productions of a goto, keyed by its index in `gotos`
+        self.unit_chains = unit_chains or {}
+        self.conflicts = tuple(conflicts)
+        self.states = tuple(states)
+
+        self.terminal_ids = {terminal: i for i, terminal in enumerate(self.terminals)}
+        self.nonterminal_ids = {
+            nonterminal: i for i, nonterminal in enumerate(self.nonterminals)
+        }
+        # Per production: symbols popped when reducing, and left-hand side id
+        self.production_lengths = array(
+            "i", (len(derivation) for _, derivation in self.productions)
+        )
+        self.left_hand_sides = array(
+            "i",
+            (self.nonterminal_ids[nonterminal] for nonterminal, _ in self.productions),
+        )
+        # Per state: bit i is set if terminal i has an action
+        if expected_terminals is None:
+            expected_terminals = _get_expected_terminals(
+                actions, len(self.terminals), len(default_actions)
+            )
+        self.expected_terminals = tuple(expected_terminals)
+        self._state_ids = {state: i for i, state in enumerate(self.states)}
+        self._decoded_actions: dict[int, Action] = {}
+
+    @property
+    def state_count(self) -> int:
+        return len(self.default_actions)
+
+    @property
+    def start_state(self) -> StateType | int:
+        return self._get_state(0)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the integer arrays."""
+        return sum(
+            memoryview(buffer).nbytes
+            for buffer in (self.actions, self.gotos, self.default_actions)
+        )
+
+    def action(self, state: int, terminal: int) -> int:
+        """Encoded action of `state` on `terminal`, default reductions first."""
+        return (
+            self.default_actions[state]
+            or self.actions[state * len(self.terminals) + terminal]
+        )
+
+    def goto(self, state: int, nonterminal: int) -> int:
+        return self.gotos[state * len(self.nonterminals) + nonterminal]
+
+    def decode_action(self, code: int) -> Action:
+        if code not in self._decoded_actions:
+            self._decoded_actions[code] = self._decode_action(code)
+        return self._decoded_actions[code]
+
+    def get_expected_terminals(self, state: StateType | int) -> frozenset[Terminal]:
+        """Terminals with an explicit action in `state`."""
+        expected = self.expected_terminals[self._get_state_id(state)]
+        return frozenset(
+            terminal
+            for i, terminal in enumerate(self.terminals)
+            if expected & (1 << i)
+        )
+
+    def get_default_reduction(self, state: StateType | int) -> Reduce | None:
+        code = self.default_actions[self._get_state_id(state)]
+        return self.decode_action(code) if code != ERROR else None  # type: ignore
+
+    def __getitem__(self, key: tuple[StateType | int, Symbol]) -> Action | Goto:
+        state, symbol = key
+        state_id = self._get_state_id(state)
+
+        if is_terminal(symbol):
+            terminal_id = self.terminal_ids.get(symbol)
+            if terminal_id is None:
+                return self.decode_action(self.default_actions[state_id])
+            return self.decode_action(self.action(state_id, terminal_id))
+
+        index = state_id * len(self.nonterminals) + self.nonterminal_ids[symbol]
+        target = self.gotos[index]
+        if target == NO_GOTO:
+            raise KeyError(key)
+        return Goto(self._get_state(target), self.unit_chains.get(index, ()))
+
+    def _decode_action(self, code: int) -> Action:
+        if code == ERROR:
+            return Error()
+        if code == ACCEPT:
+            return Accept()
+        if code > 0:
+            return Shift(self._get_state(decode_shift(code)))
+        return Reduce(decode_reduce(code))
+
+    def _get_state(self, state_id: int) -> StateType | int:
+        return self.states[state_id] if len(self.states) > 0 else state_id
+
+    def _get_state_id(self, state: StateType | int) -> int:
+        if isinstance(state, int):
+            return state
+        return self._state_ids[state]
+
+
+def compile_table(
+    table: LRParsingTable[StateType],
+    start_state: StateType,
+    g: Grammar,
+    *,
+    keep_states: bool = True,
+) -> CompiledTable[StateType]:
+    """Numbers the states reachable from `start_state` breadth-first and
+    packs `table` into integer arrays. Symbols are numbered by name, and
+    productions in `g.production_lines` order, so equal grammars compile
+    to equal arrays. If `keep_states` is not set, the compiled table only
+    refers to states by number."""
+    terminals = sorted(g.terminals | {get_end_of_chain(g)}, key=_symbol_name)
+    nonterminals = sorted(g.nonterminals, key=_symbol_name)
+    symbols: list[Symbol] = [*terminals, *nonterminals]
+
+    states = [start_state]
+    state_ids = {start_state: 0}
+    for state in states:  # Grows while iterating
+        row = table.row(state)
+        for symbol in symbols:
+            entry = row.get(symbol)
+            if isinstance(entry, (Shift, Goto)) and entry.target not in state_ids:
+                state_ids[entry.target] = len(states)
+                states.append(entry.target)
+
+    def encode(action: Action) -> int:
+        if isinstance(action, Shift):
+            return encode_shift(state_ids[action.target])
+        if isinstance(action, Reduce):
+            return encode_reduce(action.production)
+        if isinstance(action, Accept):
+            return ACCEPT
+        return ERROR
+
+    terminal_count, nonterminal_count = len(terminals), len(nonterminals)
+    actions = array("i", [ERROR]) * (len(states) * terminal_count)
+    gotos = array("i", [NO_GOTO]) * (len(states) * nonterminal_count)
+    default_actions = array("i", [ERROR]) * len(states)
+    unit_chains = {}
+
+    for state_id, state in enumerate(states):
+        row = table.row(state)
+        if (default_reduction := table.get_default_reduction(state)) is not None:
+            default_actions[state_id] = encode(default_reduction)
+        for i, terminal in enumerate(terminals):
+            if isinstance(action := row.get(terminal), Action):
+                actions[state_id * terminal_count + i] = encode(action)
+        for i, nonterminal in enumerate(nonterminals):
+            if isinstance(goto := row.get(nonterminal), Goto):
+                index = state_id * nonterminal_count + i
+                gotos[index] = state_ids[goto.target]
+                if len(goto.bypassed) > 0:
+                    unit_chains[index] = goto.bypassed
+
+    terminal_ids = {terminal: i for i, terminal in enumerate(terminals)}
+    conflicts = (
+        CompiledConflict(
+            state_ids[conflict.state],
+            terminal_ids[conflict.terminal],
+            tuple(encode(action) for action in conflict.actions),
+        )
+        for conflict in table.conflicts
+        if conflict.state in state_ids
+    )
+
+    return CompiledTable(
+        terminals,
+        nonterminals,
+        [*g.production_lines],
+        actions,
+        gotos,
+        default_actions,
+        unit_chains,
+        conflicts,
+        states if keep_states else (),
+    )
+
+
+def _get_expected_terminals(
+    actions: IntArray, terminal_count: int, state_count: int
+) -> tuple[int, ...]:
+    expected = []
+    for start in range(0, state_count * terminal_count, terminal_count):
+        row = actions[start : start + terminal_count]
+        expected.append(
+            sum(1 << i for i, action in enumerate(row) if action != ERROR)
+        )
+    return tuple(expected)
+
+
+def _symbol_name(symbol: Symbol) -> str:
+    return symbol.value
@@ -0,0 +1,163 @@
+from array import array
+from collections import Counter
+from typing import Iterable, Sequence
+
+from compilers.parser.compiled import ERROR, NO_GOTO, CompiledTable, IntArray
+
+# Packed entry: (index within its row or column, encoded value)
+Entries = list[tuple[int, int]]
+
+
+class CombTable:
+    """Row-displacement ("comb vector") compression of a compiled table,
+    in the style of yacc/bison's pact/check/table arrays.
+
+    Each action row keeps only the entries that differ from its default
+    action, and is shifted by `action_base[state]` into a shared vector
+    so that no two rows collide. `action_check` records which state owns
+    each slot, so lookups stay O(1). Goto columns are packed the same way,
+    one per nonterminal, around the most common target of the column.
+
+    Rows without an explicit entry for a terminal take their default
+    action, which is their most common reduction when they have one. Like
+    default reductions, this only delays errors until before the next
+    shift."""
+
+    def __init__(
+        self, compiled: CompiledTable, row_order: Sequence[int] | None = None
+    ) -> None:
+        """`row_order` is the order in which action rows are packed,
+        by default the densest rows first."""
+        self.terminals = compiled.terminals
+        self.nonterminals = compiled.nonterminals
+        self.productions = compiled.productions
+        self.default_actions = compiled.default_actions
+        self.unit_chains = compiled.unit_chains
+        self.conflicts = compiled.conflicts
+
+        terminal_count = len(self.terminals)
+        nonterminal_count = len(self.nonterminals)
+        state_count = compiled.state_count
+
+        row_defaults = array("i", [ERROR]) * state_count
+        action_rows: list[Entries] = []
+        for state in range(state_count):
+            start = state * terminal_count
+            row = compiled.actions[start : start + terminal_count]
+            default_action = compiled.default_actions[state]
+            row_defaults[state] = _get_row_default(row, default_action)
+            action_rows.append(
+                [
+                    (terminal, action)
+                    for terminal, action in enumerate(row)
+                    if action not in (ERROR, row_defaults[state])
+                ]
+            )
+
+        goto_defaults = array("i", [NO_GOTO]) * nonterminal_count
+        goto_columns: list[Entries] = []
+        for nonterminal in range(nonterminal_count):
+            column = compiled.gotos[nonterminal::nonterminal_count]
+            targets = Counter(target for target in column if target != NO_GOTO)
+            if len(targets) > 0:
+                goto_defaults[nonterminal] = targets.most_common(1)[0][0]
+            goto_columns.append(
+                [
+                    (state, target)
+                    for state, target in enumerate(column)
+                    if target not in (NO_GOTO, goto_defaults[nonterminal])
+                ]
+            )
+
+        if row_order is None:
+            row_order = sorted(
+                range(state_count), key=lambda state: -len(action_rows[state])
+            )
+
+        self.row_defaults = row_defaults
+        self.action_base, self.action_check, self.action_table = pack(
+            action_rows, row_order, terminal_count
+        )
+        self.goto_defaults = goto_defaults
+        self.goto_base, self.goto_check, self.goto_table = pack(
+            goto_columns, range(nonterminal_count), state_count
+        )
+
+    @property
+    def state_count(self) -> int:
+        return len(self.row_defaults)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            memoryview(buffer).nbytes
+            for buffer in (
+                self.default_actions,
+                self.row_defaults,
+                self.action_base,
+                self.action_check,
+                self.action_table,
+                self.goto_defaults,
+                self.goto_base,
+                self.goto_check,
+                self.goto_table,
+            )
+        )
+
+    def action(self, state: int, terminal: int) -> int:
+        index = self.action_base[state] + terminal
+        if self.action_check[index] == state:
+            return self.action_table[index]
+        return self.row_defaults[state]
+
+    def goto(self, state: int, nonterminal: int) -> int:
+        index = self.goto_base[nonterminal] + state
+        if self.goto_check[index] == nonterminal:
+            return self.goto_table[index]
+        return self.goto_defaults[nonterminal]
+
+
+def pack(
+    vectors: list[Entries], order: Iterable[int], width: int
+) -> tuple[IntArray, IntArray, IntArray]:
+    """Places every vector at the lowest base where its entries only fall
+    on free slots, first-fit in the given order. Returns the base of each
+    vector, the owner of each slot (-1 if free) and the packed values.
+    The packed arrays are padded so any index below `width` can be looked
+    up from any base."""
+    bases = array("i", [0]) * len(vectors)
+    check: list[int] = []
+    table: list[int] = []
+
+    for owner in order:
+        entries = vectors[owner]
+        base = 0
+        while not all(
+            base + index >= len(check) or check[base + index] == -1
+            for index, _ in entries
+        ):
+            base += 1
+
+        bases[owner] = base
+        for index, value in entries:
+            slot = base + index
+            if slot >= len(check):
+                check.extend([-1] * (slot + 1 - len(check)))
+                table.extend([0] * (slot + 1 - len(table)))
+            check[slot] = owner
+            table[slot] = value
+
+    padding = max(bases, default=0) + width - len(check)
+    check.extend([-1] * max(padding, 0))
+    table.extend([0] * max(padding, 0))
+    return bases, array("i", check), array("i", table)
+
+
+def _get_row_default(row: Iterable[int], default_action: int) -> int:
+    if default_action != ERROR:
+        return default_action
+    reductions = Counter(action for action in row if action < -1)
+    if len(reductions) == 0:
+        return ERROR
+    # Most common reduction, the earliest production on ties
+    return max(reductions, key=lambda action: (reductions[action], action))
@@ -0,0 +1,30 @@
+from typing import Iterable
+
+from compilers.grammar.terminals import Terminal
+from compilers.lexer.tokens import Token
+
+
+class ParsingError(Exception):
+    pass
+
+
+class UnexpectedTokenError(ParsingError):
+    def __init__(
+        self, token: Token, index: int, expected: Iterable[Terminal] = ()
+    ) -> None:
+        """`index` is the position of `token` in the chain, and `expected`
+        the terminals that were valid in its place."""
+        self.token = token
+        self.index = index
+        self.expected = frozenset(expected)
+
+        message = f"Parsing error on token {token} at position {index}"
+        if len(self.expected) > 0:
+            names = ", ".join(sorted(terminal.value for terminal in self.expected))
+            message += f", expected one of: {names}"
+        super().__init__(message)
+
+
+class NoEndOfInputTokenError(ParsingError):
+    def __init__(self) -> None:
+        super().__init__("Token chain does not end with end_of_chain token")
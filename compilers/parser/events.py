@@ -0,0 +1,17 @@
+from typing import NamedTuple, TypeAlias
+
+from compilers.lexer.tokens import Token
+
+
+class ShiftEvent(NamedTuple):
+    token: Token
+
+
+class ReduceEvent(NamedTuple):
+    # Index of the production in `Grammar.production_lines`
+    production: int
+    # Number of values taken off the stack, the last ones shifted or reduced
+    child_count: int
+
+
+ParseEvent: TypeAlias = ShiftEvent | ReduceEvent
@@ -0,0 +1,312 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, NamedTuple, TypeAlias
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.nonterminals import Nonterminal
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
+from compilers.parser.build import BuildOptions, build_parser_artifact
+from compilers.parser.compiled import ACCEPT, ERROR, NO_GOTO
+from compilers.parser.parser import (
+    NoEndOfInputTokenError,
+    ParsingError,
+    UnexpectedTokenError,
+)
+from compilers.parser.runtime import ParserTables
+
+
+class AmbiguityError(ParsingError):
+    pass
+
+
+class PackedNode(NamedTuple):
+    # Index of the production in `Grammar.production_lines`
+    production: int
+    children: tuple["ForestChild", ...]
+
+
+@dataclass(eq=False)
+class ForestNode:
+    """Every derivation of `symbol` from the tokens in [start, end), each
+    alternative sharing the nodes of its children with the others."""
+
+    symbol: Nonterminal
+    start: int
+    end: int
+    alternatives: list[PackedNode] = field(default_factory=list)
+
+    @property
+    def is_ambiguous(self) -> bool:
+        return len(self.alternatives) > 1
+
+    def add_alternative(
+        self, production: int, children: tuple["ForestChild", ...]
+    ) -> None:
+        alternative = PackedNode(production, children)
+        for existing in self.alternatives:
+            if existing.production == production and all(
+                child is other for child, other in zip(children, existing.children)
+            ):
+                return
+        self.alternatives.append(alternative)
+
+
+ForestChild: TypeAlias = ForestNode | TerminalNode
+
+
+def count_trees(root: ForestChild) -> int:
+    """Returns the number of trees in the forest, without enumerating them.
+    Forests of cyclic grammars hold infinitely many trees and are not
+    supported."""
+    counts: dict[int, int] = {}
+    stack: list[ForestChild] = [root]
+    while len(stack) > 0:
+        node = stack[-1]
+        if isinstance(node, TerminalNode) or id(node) in counts:
+            stack.pop()
+            continue
+        pending = [
+            child
+            for alternative in node.alternatives
+            for child in alternative.children
+            if isinstance(child, ForestNode) and id(child) not in counts
+        ]
+        if len(pending) > 0:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        total = 0
+        for alternative in node.alternatives:
+            product = 1
+            for child in alternative.children:
+                if isinstance(child, ForestNode):
+                    product *= counts[id(child)]
+            total += product
+        counts[id(node)] = total
+    return counts.get(id(root), 1)
+
+
+def get_tree(root: ForestChild) -> ASTNode:
+    """Returns the only tree of an unambiguous forest, as `LALRParser.parse`
+    builds it. Raises `AmbiguityError` if any node has several
+    alternatives."""
+    trees: dict[int, ASTNode] = {}
+    stack: list[ForestChild] = [root]
+    while len(stack) > 0:
+        node = stack[-1]
+        if isinstance(node, TerminalNode) or id(node) in trees:
+            stack.pop()
+            continue
+        if node.is_ambiguous:
+            raise AmbiguityError(
+                f"{node.symbol} has {len(node.alternatives)} derivations "
+                f"from tokens {node.start} to {node.end}"
+            )
+        (alternative,) = node.alternatives
+        pending = [
+            child
+            for child in alternative.children
+            if isinstance(child, ForestNode) and id(child) not in trees
+        ]
+        if len(pending) > 0:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        trees[id(node)] = NonterminalNode(
+            node.symbol,
+            (
+                trees[id(child)] if isinstance(child, ForestNode) else child
+                for child in alternative.children
+            ),
+        )
+    return root if isinstance(root, TerminalNode) else trees[id(root)]
+
+
+def iter_trees(root: ForestChild) -> Iterator[ASTNode]:
+    """Yields every tree of the forest. There can be exponentially many."""
+    if isinstance(root, TerminalNode):
+        yield root
+        return
+    for alternative in root.alternatives:
+        for children in _iter_products(alternative.children):
+            yield NonterminalNode(root.symbol, children)
+
+
+def _iter_products(children: tuple[ForestChild, ...]) -> Iterator[list[ASTNode]]:
+    if len(children) == 0:
+        yield []
+        return
+    first, *rest = children
+    for tree in iter_trees(first):
+        for trees in _iter_products(tuple(rest)):
+            yield [tree, *trees]
+
+
+@dataclass(eq=False, slots=True)
+class _StackNode:
+    state: int
+    # Index of the token this node was pushed before
+    position: int
+    # Nodes below this one, with the forest node pushed between them
+    edges: dict["_StackNode", ForestChild] = field(default_factory=dict)
+
+
+class GLRParser:
+    """Generalized LR parser for any context-free grammar without cycles.
+
+    Every action of a conflict is followed at once: the stacks are merged
+    into a graph-structured stack, where stacks that reach the same state
+    at the same token share a node, and the trees into a shared packed
+    parse forest, where derivations of a symbol from the same tokens share
+    a node. Deterministic stretches of the input run as a single stack."""
+
+    grammar: Grammar
+    tables: ParserTables
+
+    def __init__(self, g: Grammar) -> None:
+        # Merged states could mix up the actions of their conflicts, and
+        # bypassed gotos would skip the nodes of the forest
+        artifact = build_parser_artifact(g, BuildOptions(), keep_states=False)
+        self.grammar = artifact.grammar
+        self.tables = ParserTables.from_table(artifact.table)
+        terminal_count = self.tables.terminal_count
+        self._conflicts = {
+            conflict.state * terminal_count + conflict.terminal: conflict.actions
+            for conflict in artifact.table.conflicts
+        }
+
+    def parse(self, chain: Iterable[Token]) -> ForestChild:
+        """Returns the forest of every derivation of `chain`."""
+        tables = self.tables
+        actions = tables.actions
+        gotos = tables.gotos
+        default_actions = tables.default_actions
+        production_lengths = tables.production_lengths
+        left_hand_sides = tables.left_hand_sides
+        nonterminals = tables.nonterminals
+        terminal_ids = tables.terminal_ids
+        terminal_count = tables.terminal_count
+        nonterminal_count = tables.nonterminal_count
+        conflicts = self._conflicts
+
+        def get_actions(state: int, terminal: int) -> tuple[int, ...]:
+            if terminal < 0:
+                default_action = default_actions[state]
+                return (default_action,) if default_action != ERROR else ()
+            # A state whose conflicts all resolve to the same reduction gets
+            # it as its default, so conflicts are looked up first
+            index = state * terminal_count + terminal
+            if index in conflicts:
+                return conflicts[index]
+            action = default_actions[state] or actions[index]
+            return (action,) if action != ERROR else ()
+
+        root = _StackNode(0, 0)  # Start state
+        frontier = {0: root}
+        chain_iterator = iter(chain)
+        index = 0
+
+        while True:
+            token = next(chain_iterator, None)
+            if token is None:
+                raise NoEndOfInputTokenError()
+            terminal = terminal_ids.get(token.terminal, -1)
+
+            # Reductions, with the forest nodes ending before this token
+            symbols: dict[tuple[int, int], ForestNode] = {}
+            pending = list(frontier.values())
+            processed: list[_StackNode] = []
+            accepted: list[_StackNode] = []
+
+            def reduce(
+                node: _StackNode,
+                production: int,
+                required: tuple[_StackNode, _StackNode] | None = None,
+            ) -> None:
+                length = production_lengths[production]
+                # The stack grows while reducing, so the paths are taken first
+                for bottom, children in list(_iter_paths(node, length, required)):
+                    left_hand_side = left_hand_sides[production]
+                    target = gotos[bottom.state * nonterminal_count + left_hand_side]
+                    if target == NO_GOTO:
+                        continue
+
+                    key = (left_hand_side, bottom.position)
+                    symbol = symbols.get(key)
+                    if symbol is None:
+                        symbol = symbols[key] = ForestNode(
+                            nonterminals[left_hand_side], bottom.position, index
+                        )
+                    symbol.add_alternative(production, children)
+
+                    top = frontier.get(target)
+                    if top is None:
+                        top = frontier[target] = _StackNode(target, index)
+                        top.edges[bottom] = symbol
+                        pending.append(top)
+                    elif bottom not in top.edges:
+                        top.edges[bottom] = symbol
+                        # Reductions already done may also go through the
+                        # new edge
+                        for done in processed:
+                            for action in get_actions(done.state, terminal):
+                                if action < ACCEPT:
+                                    reduce(done, -action - 1, (top, bottom))
+
+            while len(pending) > 0:
+                node = pending.pop()
+                processed.append(node)
+                for action in get_actions(node.state, terminal):
+                    if action == ACCEPT:
+                        accepted.append(node)
+                    elif action < ACCEPT:
+                        reduce(node, -action - 1)
+
+            for node in accepted:
+                if root in node.edges:
+                    return node.edges[root]
+
+            leaf = TerminalNode(token.terminal, token.value)
+            shifted: dict[int, _StackNode] = {}
+            for node in processed:
+                for action in get_actions(node.state, terminal):
+                    if action > 0:
+                        target = action - 1
+                        if target not in shifted:
+                            shifted[target] = _StackNode(target, index + 1)
+                        shifted[target].edges[node] = leaf
+
+            if len(shifted) == 0:
+                expected = frozenset().union(
+                    *(tables.get_expected_terminals(node.state) for node in processed)
+                )
+                raise UnexpectedTokenError(token, index, expected)
+            frontier = shifted
+            index += 1
+
+
+def _iter_paths(
+    node: _StackNode,
+    length: int,
+    required: tuple[_StackNode, _StackNode] | None,
+) -> Iterator[tuple[_StackNode, tuple[ForestChild, ...]]]:
+    """Yields the node `length` edges below `node` along every path, with
+    the forest nodes on the path in input order. If `required` is given,
+    only paths through that edge are followed."""
+    if length == 0:
+        if required is None:
+            yield node, ()
+        return
+
+    stack: list[tuple[_StackNode, tuple[ForestChild, ...], bool]] = [
+        (node, (), required is None)
+    ]
+    while len(stack) > 0:
+        current, children, found = stack.pop()
+        for below, child in current.edges.items():
+            through = found or (current, below) == required
+            if len(children) + 1 == length:
+                if through:
+                    yield below, (child, *children)
+            else:
+                stack.append((below, (child, *children), through))
@@ -0,0 +1,230 @@
+from typing import Iterable
+
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
+from compilers.parser.compiled import ACCEPT, ERROR
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    UnexpectedTokenError,
+)
+
+# Target of recorded nodes that were never pushed on their own, such as
+# the nodes wrapped in bypassed unit productions
+_NOT_PUSHED = -1
+
+# A nonterminal node recorded at its first token: (number of tokens spanned,
+# node, state it was pushed over, state pushed with it). The nodes starting
+# at a token are kept shortest first. Reducing ε-productions between them
+# changes the state, so they are not all pushed over the same one
+_Entry = tuple[int, ASTNode, int, int]
+
+
+class IncrementalParser:
+    """Keeps the tree of a token chain up to date as the chain is edited.
+
+    Every nonterminal node is recorded with its first token, its length and
+    the state it was pushed over. After an edit the chain is parsed again,
+    but whenever the parser is in the state a recorded node was pushed over,
+    at its first token, the node is pushed whole instead of parsed, as in
+    Wagner and Graham's incremental parser. A node is reused only if neither
+    its tokens nor its lookahead were edited, so the tree is always the one
+    `LALRParser.parse` would build. Besides the edited tokens, only the
+    nodes that contain them are rebuilt."""
+
+    def __init__(self, parser: LALRParser, chain: Iterable[Token]) -> None:
+        self.parser = parser
+        self.tokens = list(chain)
+        self.tree: ASTNode | None = None
+        self._chains: list[list[_Entry] | None] = [None] * len(self.tokens)
+        # Length of every recorded node, by id. The chains keep them alive
+        self._lengths: dict[int, int] = {}
+        self._reparse()
+
+    def edit(self, start: int, end: int, chain: Iterable[Token]) -> ASTNode:
+        """Replaces `tokens[start:end]` by `chain` and returns the new tree.
+        If the edited chain is rejected, the error is raised and the next
+        edit parses the whole chain again."""
+        if not 0 <= start <= end <= len(self.tokens):
+            raise IndexError(f"Invalid token range [{start}, {end})")
+        inserted = list(chain)
+
+        self._invalidate(start)
+        for edited in self._chains[start:end]:
+            if edited is not None:
+                self._forget(edited)
+        self.tokens[start:end] = inserted
+        self._chains[start:end] = [None] * len(inserted)
+
+        return self._reparse()
+
+    def _invalidate(self, start: int) -> None:
+        """Drops the nodes whose tokens or lookahead reach `start`, which
+        are the ancestors of the token before it."""
+        if self.tree is None or start == 0:
+            return
+
+        positions = []
+        node, position = self.tree, 0
+        while True:
+            positions.append(position)
+            child_position = position
+            for child in node.children:
+                length = self._get_length(child)
+                if child_position + length >= start:
+                    break
+                child_position += length
+            else:
+                break
+            if isinstance(child, TerminalNode):
+                break
+            node, position = child, child_position
+
+        for position in positions:
+            entries = self._chains[position]
+            if entries is None:
+                continue
+            while len(entries) > 0 and position + entries[-1][0] >= start:
+                self._forget([entries.pop()])
+            if len(entries) == 0:
+                self._chains[position] = None
+
+    def _get_length(self, node: ASTNode) -> int:
+        if isinstance(node, TerminalNode):
+            return 1
+        # Nodes spanning no tokens are not recorded
+        return self._lengths.get(id(node), 0)
+
+    def _forget(self, entries: list[_Entry]) -> None:
+        for _, node, _, _ in entries:
+            del self._lengths[id(node)]
+
+    def _reparse(self) -> ASTNode:
+        try:
+            self.tree = self._parse()
+        except Exception:
+            self.tree = None
+            self._chains = [None] * len(self.tokens)
+            self._lengths.clear()
+            raise
+        return self.tree
+
+    def _parse(self) -> ASTNode:
+        # Same loop as `runtime.drive`, recording the nodes it builds
+        # and pushing recorded nodes whole where it can
+        tables = self.parser.tables
+        actions = tables.actions
+        gotos = tables.gotos
+        default_actions = tables.default_actions
+        production_lengths = tables.production_lengths
+        left_hand_sides = tables.left_hand_sides
+        nonterminals = tables.nonterminals
+        terminal_ids = tables.terminal_ids
+        unit_chains = tables.unit_chains
+        terminal_count = tables.terminal_count
+        nonterminal_count = tables.nonterminal_count
+        tokens = self.tokens
+        chains = self._chains
+        lengths = self._lengths
+
+        states = [0]  # Start state
+        values: list[ASTNode] = []
+        # Index of the first token of each value
+        positions: list[int] = []
+
+        index = 0
+        if index == len(tokens):
+            raise NoEndOfInputTokenError()
+        token = tokens[index]
+        terminal = terminal_ids.get(token.terminal, -1)
+        chain = chains[index]
+
+        while True:
+            state = states[-1]
+            reused = -1
+            if chain is not None:
+                for i in range(len(chain) - 1, -1, -1):
+                    _, _, left_state, target = chain[i]
+                    if left_state == state and target != _NOT_PUSHED:
+                        reused = i
+                        break
+            if reused >= 0:
+                # The longer nodes are rebuilt if they are still in the tree
+                self._forget(chain[reused + 1 :])
+                del chain[reused + 1 :]
+                length, node, _, target = chain[reused]
+                states.append(target)
+                values.append(node)
+                positions.append(index)
+                index += length
+                if index == len(tokens):
+                    raise NoEndOfInputTokenError()
+                token = tokens[index]
+                terminal = terminal_ids.get(token.terminal, -1)
+                chain = chains[index]
+                continue
+
+            action = default_actions[state]
+            if action == ERROR and terminal >= 0:
+                action = actions[state * terminal_count + terminal]
+
+            if action > 0:
+                if chain is not None:  # Recorded by a parse that diverged
+                    self._forget(chain)
+                    chains[index] = None
+                states.append(action - 1)
+                values.append(TerminalNode(token.terminal, token.value))
+                positions.append(index)
+                index += 1
+                if index == len(tokens):
+                    raise NoEndOfInputTokenError()
+                token = tokens[index]
+                terminal = terminal_ids.get(token.terminal, -1)
+                chain = chains[index]
+
+            elif action < ACCEPT:
+                production = -action - 1
+                start = len(values) - production_lengths[production]
+                first = positions[start] if start < len(values) else index
+                left_state = states[start]
+                children = values[start:]
+                del values[start:]
+                del positions[start:]
+                del states[start + 1 :]  # The start state is not in `values`
+
+                left_hand_side = left_hand_sides[production]
+                node = NonterminalNode(nonterminals[left_hand_side], children)
+                goto_index = left_state * nonterminal_count + left_hand_side
+                target = gotos[goto_index]
+
+                if first < index:
+                    recorded = chains[first]
+                    if recorded is None:
+                        recorded = chains[first] = []
+                    length = index - first
+                    for unit_production in unit_chains.get(goto_index, ()):
+                        recorded.append((length, node, left_state, _NOT_PUSHED))
+                        lengths[id(node)] = length
+                        unit_nonterminal = nonterminals[
+                            left_hand_sides[unit_production]
+                        ]
+                        node = NonterminalNode(unit_nonterminal, (node,))
+                    recorded.append((length, node, left_state, target))
+                    lengths[id(node)] = length
+                else:
+                    for unit_production in unit_chains.get(goto_index, ()):
+                        unit_nonterminal = nonterminals[
+                            left_hand_sides[unit_production]
+                        ]
+                        node = NonterminalNode(unit_nonterminal, (node,))
+
+                states.append(target)
+                values.append(node)
+                positions.append(first)
+
+            elif action == ACCEPT:
+                return values[-1]
+
+            else:
+                expected = tables.get_expected_terminals(state)
+                raise UnexpectedTokenError(token, index, expected)
@@ -0,0 +1,176 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+from compilers.grammar.productions import ProductionLine
+from compilers.grammar.terminals import Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.compiled import ACCEPT, ERROR
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    UnexpectedTokenError,
+    resolve_callbacks,
+)
+from compilers.parser.runtime import ReduceCallback, ShiftCallback
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class ParseMetrics:
+    """Counters of instrumented parses, accumulated over every parse they
+    are passed to. States and productions are given by id."""
+
+    parses: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+    # Time spent in the given callbacks, included in `seconds`
+    callback_seconds: float = 0.0
+    max_depth: int = 0
+    # Shifts per state shifted from
+    shifts_by_state: Counter[int] = field(default_factory=Counter)
+    # Reductions per state reduced in, and per production
+    reductions_by_state: Counter[int] = field(default_factory=Counter)
+    reductions_by_production: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dicts and numbers only, e.g. to export as JSON."""
+        exported: dict[str, Any] = {}
+        for metric in fields(self):
+            value = getattr(self, metric.name)
+            exported[metric.name] = dict(value) if isinstance(value, dict) else value
+        return {**exported, "tokens_per_second": self.tokens_per_second}
+
+
+def parse_instrumented(
+    parser: LALRParser,
+    chain: Iterable[Token],
+    reduce_callbacks: Mapping[ProductionLine, ReduceCallback] | None = None,
+    shift_callbacks: Mapping[Terminal, ShiftCallback] | None = None,
+    *,
+    metrics: ParseMetrics | None = None,
+) -> tuple[Any, ParseMetrics]:
+    """Like `LALRParser.translate`, counting every shift and reduction into
+    `metrics`, or new metrics if not given. A separate loop, so parsing
+    without instrumentation pays nothing for it. Metrics are updated even
+    if the chain is rejected."""
+    metrics = metrics if metrics is not None else ParseMetrics()
+    callback_seconds = [0.0]
+
+    def timed(callback: Callable[[_T], Any]) -> Callable[[_T], Any]:
+        def run(argument: _T) -> Any:
+            started = time.perf_counter()
+            try:
+                return callback(argument)
+            finally:
+                callback_seconds[0] += time.perf_counter() - started
+
+        return run
+
+    reducers, shifters = resolve_callbacks(
+        parser.tables,
+        {line: timed(callback) for line, callback in (reduce_callbacks or {}).items()},
+        {
+            terminal: timed(callback)
+            for terminal, callback in (shift_callbacks or {}).items()
+        },
+    )
+
+    started = time.perf_counter()
+    try:
+        return _parse(parser, chain, reducers, shifters, metrics), metrics
+    finally:
+        metrics.parses += 1
+        metrics.seconds += time.perf_counter() - started
+        metrics.callback_seconds += callback_seconds[0]
+
+
+def _parse(
+    parser: LALRParser,
+    chain: Iterable[Token],
+    reducers: list[ReduceCallback],
+    shifters: list[ShiftCallback],
+    metrics: ParseMetrics,
+) -> Any:
+    # Same loop as `runtime.drive`, with counters
+    tables = parser.tables
+    actions = tables.actions
+    gotos = tables.gotos
+    default_actions = tables.default_actions
+    production_lengths = tables.production_lengths
+    left_hand_sides = tables.left_hand_sides
+    terminal_ids = tables.terminal_ids
+    unit_chains = tables.unit_chains
+    terminal_count = tables.terminal_count
+    nonterminal_count = tables.nonterminal_count
+    shifts_by_state = metrics.shifts_by_state
+    reductions_by_state = metrics.reductions_by_state
+    reductions_by_production = metrics.reductions_by_production
+
+    states = [0]  # Start state
+    values: list[Any] = []
+    max_depth = metrics.max_depth
+
+    chain_iterator = iter(chain)
+    token = next(chain_iterator, None)
+    if token is None:
+        raise NoEndOfInputTokenError()
+    terminal = terminal_ids.get(token.terminal, -1)
+    index = 0
+
+    try:
+        while True:
+            state = states[-1]
+            action = default_actions[state]
+            if action == ERROR and terminal >= 0:
+                action = actions[state * terminal_count + terminal]
+
+            if action > 0:
+                shifts_by_state[state] += 1
+                states.append(action - 1)
+                if len(states) > max_depth:
+                    max_depth = len(states)
+                values.append(shifters[terminal](token))
+                index += 1
+                token = next(chain_iterator, None)
+                if token is None:
+                    raise NoEndOfInputTokenError()
+                terminal = terminal_ids.get(token.terminal, -1)
+
+            elif action < ACCEPT:
+                production = -action - 1
+                reductions_by_state[state] += 1
+                reductions_by_production[production] += 1
+                start = len(values) - production_lengths[production]
+                children = values[start:]
+                del values[start:]
+                del states[start + 1 :]  # The start state is not in `values`
+
+                value = reducers[production](children)
+                goto_index = (
+                    states[-1] * nonterminal_count + left_hand_sides[production]
+                )
+                if goto_index in unit_chains:
+                    for unit_production in unit_chains[goto_index]:
+                        value = reducers[unit_production]([value])
+
+                states.append(gotos[goto_index])
+                if len(states) > max_depth:
+                    max_depth = len(states)
+                values.append(value)
+
+            elif action == ACCEPT:
+                return values[-1]
+
+            else:
+                expected = tables.get_expected_terminals(state)
+                raise UnexpectedTokenError(token, index, expected)
+    finally:
+        metrics.tokens += index
+        metrics.max_depth = max_depth
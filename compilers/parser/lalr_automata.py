@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 from compilers.grammar.grammar import Grammar
 from compilers.grammar.symbols import Symbol, is_nonterminal, is_terminal
@@ -8,8 +8,16 @@ from compilers.parser import actions
 from compilers.parser.lr_automata import LRAutomata
 from compilers.parser.lr_items import LRItem
 from compilers.parser.lr_sets import LR0Set, LR1Set
-from compilers.parser.tables import LRParsingTable
-from compilers.utils import GroupedDefaultDict, GroupedDict, flatten
+from compilers.parser.optimizations import apply_default_reductions
+from compilers.parser.statistics import BuildStatistics, get_table_statistics
+from compilers.parser.tables import Conflict, LRParsingTable
+from compilers.utils import (
+    GroupedDefaultDict,
+    GroupedDict,
+    PhaseTimings,
+    flatten,
+    get_deep_size,
+)
 
 StateLookaheads = GroupedDict[LR0Set, LRItem, set[Terminal]]
 PropagationTable = GroupedDict[LR0Set, LRItem, dict[LR0Set, set[LRItem]]]
@@ -21,10 +29,13 @@ class LALRAutomata:
     grammar: Grammar
     states: set[LR1Set]
     start_state: LR1Set
+    # Time spent on each construction phase, and on the last table fill
+    timings: PhaseTimings
     _transitions: GroupedDict[LR1Set, Symbol, LR1Set]
 
     def __init__(self, g: Grammar) -> None:
         self.grammar = g
+        self.timings = PhaseTimings()
         self._compute_states_and_transitions()
 
     @property
@@ -34,45 +45,63 @@ class LALRAutomata:
     def get_transition(self, state: LR1Set, symbol: Symbol) -> LR1Set:
         return self._transitions[state, symbol]
 
-    def compute_parsing_table(self) -> LRParsingTable[LR1Set]:
-        table = LRParsingTable[LR1Set]()
-        start_item, *_ = self.start_state.kernel
-        accept_item = start_item.next()
-
-        for state in self.states:
-            for item in state:
-                if item == accept_item:
-                    table[state, item.lookahead] = actions.Accept()
-                elif item.complete:
-                    table[state, item.lookahead] = actions.Reduce(item.production)
-
-            if state not in self._transitions:
-                continue
-
-            for symbol, target_state in self._transitions[state].items():
-                if is_nonterminal(symbol):
-                    table[state, symbol] = actions.Goto(target_state)
-                elif is_terminal(symbol):
-                    table[state, symbol] = actions.Shift(target_state)
+    def compute_parsing_table(
+        self, *, default_reductions: bool = False
+    ) -> LRParsingTable[LR1Set]:
+        """If `default_reductions` is set, consistent states reduce
+        without consulting the lookahead."""
+        with self.timings.measure("table_fill"):
+            return build_parsing_table(
+                self.grammar,
+                self.states,
+                self.start_state,
+                self._transitions,
+                default_reductions=default_reductions,
+            )
 
-        return table
+    def get_statistics(
+        self,
+        table: LRParsingTable[LR1Set] | None = None,
+        *,
+        states: Iterable[LR1Set] | None = None,
+        measure_memory: bool = False,
+    ) -> BuildStatistics:
+        """Statistics of `table`, by default the parsing table with default
+        reductions, along with build times (including the grammar's FIRST
+        and FOLLOW sets). Only `states` are counted if given, e.g. to skip
+        states a transformation left unreachable. Measuring the memory of
+        the automaton walks every object in it, so it is opt-in."""
+        if table is None:
+            table = self.compute_parsing_table(default_reductions=True)
+
+        memory: dict[str, int] = {}
+        if measure_memory:
+            memory = {
+                "states": get_deep_size(self.states),
+                "transitions": get_deep_size(self._transitions, exclude=self.states),
+                "parsing_table": get_deep_size(table, exclude=self.states),
+            }
+        phase_seconds = {**self.grammar.timings.seconds, **self.timings.seconds}
+        return get_table_statistics(self.grammar, table, memory, phase_seconds, states)
 
     def _compute_states_and_transitions(self) -> None:
-        lr0_automata = LRAutomata(self.grammar)
+        with self.timings.measure("lr0"):
+            lr0_automata = LRAutomata(self.grammar)
         lookaheads = self._propagate_lookaheads(lr0_automata)
 
         lr0_to_lr1_states: dict[LR0Set, LR1Set] = {}
 
         self.states = set()
-        for lr0_state in lr0_automata.states:
-            kernel_items = (
-                lr0_item.to_lr1(lookahead)
-                for lr0_item in lr0_state.kernel
-                for lookahead in lookaheads[lr0_state, lr0_item]
-            )
-            lr1_state = LR1Set(kernel_items).closure(self.grammar)
-            self.states.add(lr1_state)
-            lr0_to_lr1_states[lr0_state] = lr1_state
+        with self.timings.measure("lr1_closure"):
+            for lr0_state in lr0_automata.states:
+                kernel_items = (
+                    lr0_item.to_lr1(lookahead)
+                    for lr0_item in lr0_state.kernel
+                    for lookahead in lookaheads[lr0_state, lr0_item]
+                )
+                lr1_state = LR1Set(kernel_items).closure(self.grammar)
+                self.states.add(lr1_state)
+                lr0_to_lr1_states[lr0_state] = lr1_state
 
         self.start_state = lr0_to_lr1_states[lr0_automata.start_state]
 
@@ -82,18 +111,22 @@ class LALRAutomata:
             self._transitions[start, symbol] = end
 
     def _propagate_lookaheads(self, automata: LRAutomata) -> StateLookaheads:
-        lookaheads, table = self._compute_initial_lookaheads_and_propagations(automata)
+        with self.timings.measure("lookahead_relationships"):
+            lookaheads, table = self._compute_initial_lookaheads_and_propagations(
+                automata
+            )
 
-        changed = True
-        while changed:
-            changed = False
+        with self.timings.measure("propagation"):
+            changed = True
+            while changed:
+                changed = False
 
-            for start_state, start_item, propagations in table.flatten():
-                propagated_lookaheads = lookaheads[start_state, start_item]
-                for target_state, target_item in flatten(propagations):
-                    set_to_update = lookaheads[target_state, target_item]
-                    changed |= not (propagated_lookaheads <= set_to_update)
-                    set_to_update |= propagated_lookaheads
+                for start_state, start_item, propagations in table.flatten():
+                    propagated_lookaheads = lookaheads[start_state, start_item]
+                    for target_state, target_item in flatten(propagations):
+                        set_to_update = lookaheads[target_state, target_item]
+                        changed |= not (propagated_lookaheads <= set_to_update)
+                        set_to_update |= propagated_lookaheads
 
         return lookaheads
 
@@ -160,6 +193,55 @@ class LookaheadRelationships(NamedTuple):
         return is_equal
 
 
+def build_parsing_table(
+    g: Grammar,
+    states: Iterable[LR1Set],
+    start_state: LR1Set,
+    transitions: GroupedDict[LR1Set, Symbol, LR1Set],
+    *,
+    default_reductions: bool = False,
+) -> LRParsingTable[LR1Set]:
+    """Fills an LR(1) parsing table from an automaton's states and transitions.
+
+    Conflicts are recorded in the table's `conflicts` and resolved
+    yacc-style: shifts win over reductions, and earlier productions
+    win over later ones."""
+    table = LRParsingTable[LR1Set]()
+    start_item, *_ = start_state.kernel
+    accept_item = start_item.next()
+
+    for state in states:
+        candidates: defaultdict[Terminal, set[actions.Action]] = defaultdict(set)
+        for item in state:
+            if item == accept_item:
+                candidates[item.lookahead].add(actions.Accept())
+            elif item.complete:
+                production = g.get_production_id(item.production)
+                candidates[item.lookahead].add(actions.Reduce(production))
+
+        for symbol, target_state in transitions.get(state, {}).items():
+            if is_nonterminal(symbol):
+                table[state, symbol] = actions.Goto(target_state)
+            elif is_terminal(symbol):
+                candidates[symbol].add(actions.Shift(target_state))
+
+        for terminal, terminal_actions in candidates.items():
+            ordered = sorted(terminal_actions, key=_resolution_priority)
+            if len(ordered) > 1:
+                table.conflicts.append(Conflict(state, terminal, tuple(ordered)))
+            table[state, terminal] = ordered[0]
+
+    if default_reductions:
+        return apply_default_reductions(table)
+    return table
+
+
+def _resolution_priority(action: actions.Action) -> int:
+    if isinstance(action, actions.Reduce):
+        return 1 + action.production
+    return 0
+
+
 def get_dummy(g: Grammar) -> Terminal:
     return Terminal("#")  # TODO: Dynamically change value to not conflict with grammar
 
@@ -0,0 +1,196 @@
+from collections import defaultdict, deque
+from typing import Iterable
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import ProductionLine
+from compilers.grammar.symbols import Symbol, is_nonterminal
+from compilers.grammar.terminals import Terminal
+from compilers.parser.lalr_automata import build_parsing_table, get_end_of_chain
+from compilers.parser.lr_automata import get_initial_lr_item, is_augmented
+from compilers.parser.lr_items import LR1Item
+from compilers.parser.lr_sets import LR1Set
+from compilers.parser.tables import LRParsingTable
+from compilers.utils import GroupedDict
+
+# Items are grouped by core, each core holding all of its lookaheads
+Core = tuple[ProductionLine, int]
+ItemSet = dict[Core, set[Terminal]]
+Kernel = frozenset[tuple[Core, frozenset[Terminal]]]
+KernelAndClosure = tuple[ItemSet, ItemSet]
+
+
+class LR1Automata:
+    """Canonical LR(1) automaton. States are built over compact item sets,
+    interned by kernel, and only turned into `LR1Set`s at the end.
+
+    If `merge_cores` is set, states with the same LR(0) core are merged,
+    which yields the same automaton as `LALRAutomata`."""
+
+    grammar: Grammar
+    states: set[LR1Set]
+    start_state: LR1Set
+    _transitions: GroupedDict[LR1Set, Symbol, LR1Set]
+
+    def __init__(self, g: Grammar, *, merge_cores: bool = False) -> None:
+        if not is_augmented(g):
+            raise ValueError("Given grammar is not augmented with start production")
+
+        self.grammar = g
+        self._first_cache: dict[Core, tuple[frozenset[Terminal], bool]] = {}
+        item_sets, transitions = self._compute_item_sets_and_transitions()
+        if merge_cores:
+            item_sets, transitions = merge_item_set_cores(item_sets, transitions)
+        self._materialize(item_sets, transitions)
+
+    @property
+    def transition_count(self) -> int:
+        return self._transitions.flat_len()
+
+    def get_transition(self, state: LR1Set, symbol: Symbol) -> LR1Set:
+        return self._transitions[state, symbol]
+
+    def compute_parsing_table(
+        self, *, default_reductions: bool = False
+    ) -> LRParsingTable[LR1Set]:
+        return build_parsing_table(
+            self.grammar,
+            self.states,
+            self.start_state,
+            self._transitions,
+            default_reductions=default_reductions,
+        )
+
+    def _compute_item_sets_and_transitions(
+        self,
+    ) -> tuple[list[KernelAndClosure], dict[tuple[int, Symbol], int]]:
+        """Returns each state's kernel and closure, numbered in discovery
+        order, and the transitions between state numbers."""
+        start_line = get_initial_lr_item(self.grammar).production
+        start_kernel: ItemSet = {(start_line, 0): {get_end_of_chain(self.grammar)}}
+
+        kernels = [start_kernel]
+        closures = []
+        state_ids = {freeze(start_kernel): 0}
+        transitions: dict[tuple[int, Symbol], int] = {}
+        work = deque([0])
+
+        while len(work) > 0:
+            state_id = work.popleft()
+            items = self._closure(kernels[state_id])
+            closures.append(items)
+
+            for symbol, target_kernel in compute_goto_kernels(items):
+                key = freeze(target_kernel)
+                if key not in state_ids:
+                    state_ids[key] = len(kernels)
+                    kernels.append(target_kernel)
+                    work.append(state_ids[key])
+                transitions[state_id, symbol] = state_ids[key]
+
+        return list(zip(kernels, closures)), transitions
+
+    def _closure(self, kernel: ItemSet) -> ItemSet:
+        items = {core: set(lookaheads) for core, lookaheads in kernel.items()}
+        work = list(items)
+
+        while len(work) > 0:
+            core = work.pop()
+            line, position = core
+            if position == len(line.derivation):
+                continue
+            symbol = line.derivation[position]
+            if not is_nonterminal(symbol):
+                continue
+
+            first, nullable = self._get_first_after(core)
+            lookaheads = first | items[core] if nullable else first
+            for derivation_line in self.grammar.get_production(symbol).derivations:
+                new_core = (derivation_line, 0)
+                current = items.setdefault(new_core, set())
+                if not lookaheads <= current:
+                    current |= lookaheads
+                    work.append(new_core)
+
+        return items
+
+    def _get_first_after(self, core: Core) -> tuple[frozenset[Terminal], bool]:
+        """FIRST set of whatever follows the symbol after the dot in `core`."""
+        if core not in self._first_cache:
+            line, position = core
+            first = self.grammar.get_first(line.derivation[position + 1 :])
+            self._first_cache[core] = frozenset(first.terminals), first.nullable
+        return self._first_cache[core]
+
+    def _materialize(
+        self,
+        item_sets: list[KernelAndClosure],
+        transitions: dict[tuple[int, Symbol], int],
+    ) -> None:
+        states = [
+            LR1Set(
+                to_lr1_items(kernel),
+                to_lr1_items(
+                    {
+                        core: lookaheads
+                        for core, lookaheads in closure.items()
+                        if core not in kernel
+                    }
+                ),
+            )
+            for kernel, closure in item_sets
+        ]
+
+        self.states = set(states)
+        self.start_state = states[0]
+        self._transitions = GroupedDict()
+        for (start, symbol), end in transitions.items():
+            self._transitions[states[start], symbol] = states[end]
+
+
+def freeze(items: ItemSet) -> Kernel:
+    return frozenset(
+        (core, frozenset(lookaheads)) for core, lookaheads in items.items()
+    )
+
+
+def compute_goto_kernels(items: ItemSet) -> Iterable[tuple[Symbol, ItemSet]]:
+    kernels: defaultdict[Symbol, ItemSet] = defaultdict(dict)
+    for (line, position), lookaheads in items.items():
+        if position < len(line.derivation):
+            kernel = kernels[line.derivation[position]]
+            kernel.setdefault((line, position + 1), set()).update(lookaheads)
+    return kernels.items()
+
+
+def to_lr1_items(items: ItemSet) -> Iterable[LR1Item]:
+    for (line, position), lookaheads in items.items():
+        for lookahead in lookaheads:
+            yield LR1Item(line, lookahead, stack_position=position)
+
+
+def merge_item_set_cores(
+    item_sets: list[KernelAndClosure], transitions: dict[tuple[int, Symbol], int]
+) -> tuple[list[KernelAndClosure], dict[tuple[int, Symbol], int]]:
+    """Merges the lookaheads of states sharing the same LR(0) core.
+    The start state keeps its number."""
+    merged: list[KernelAndClosure] = []
+    merged_ids: dict[frozenset[Core], int] = {}
+    state_map = []
+
+    for kernel, closure in item_sets:
+        core = frozenset(kernel)
+        if core not in merged_ids:
+            merged_ids[core] = len(merged)
+            merged.append((defaultdict(set), defaultdict(set)))
+        merged_kernel, merged_closure = merged[merged_ids[core]]
+        for item_core, lookaheads in kernel.items():
+            merged_kernel[item_core] |= lookaheads
+        for item_core, lookaheads in closure.items():
+            merged_closure[item_core] |= lookaheads
+        state_map.append(merged_ids[core])
+
+    merged_transitions = {
+        (state_map[start], symbol): state_map[end]
+        for (start, symbol), end in transitions.items()
+    }
+    return merged, merged_transitions
@@ -0,0 +1,228 @@
+from collections import deque
+from typing import Generic, Hashable, Iterable, NamedTuple
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import ProductionLine
+from compilers.grammar.symbols import Symbol, is_nonterminal, is_terminal
+from compilers.parser.actions import Action, Goto, Reduce, Shift
+from compilers.parser.lr_sets import StateType
+from compilers.parser.tables import LRParsingTable
+
+
+def is_unit_production(production: ProductionLine) -> bool:
+    return len(production.derivation) == 1 and is_nonterminal(production.derivation[0])
+
+
+def get_unit_reduction(
+    table: LRParsingTable[StateType], state: StateType, g: Grammar
+) -> int | None:
+    """Returns the id of the unit production `state` reduces by on every
+    lookahead, or None if `state` does anything else."""
+    reductions = set()
+    if (default_reduction := table.get_default_reduction(state)) is not None:
+        reductions.add(default_reduction.production)
+    for action in table.row(state).values():
+        if not isinstance(action, Reduce):
+            return None
+        reductions.add(action.production)
+
+    if len(reductions) != 1:
+        return None
+    (production,) = reductions
+    return production if is_unit_production(g.production_lines[production]) else None
+
+
+def get_consistent_reduction(
+    table: LRParsingTable[StateType], state: StateType
+) -> Reduce | None:
+    """Returns the only reduction of `state` if it has no other
+    action on any terminal."""
+    terminal_actions = {
+        action for symbol, action in table.row(state).items() if is_terminal(symbol)
+    }
+    if len(terminal_actions) != 1:
+        return None
+    (action,) = terminal_actions
+    return action if isinstance(action, Reduce) else None
+
+
+def apply_default_reductions(
+    table: LRParsingTable[StateType],
+) -> LRParsingTable[StateType]:
+    """Returns a copy of `table` where consistent states (a single reduction
+    and no shifts) reduce by default, dropping their lookahead entries.
+    Errors are still detected before the next shift."""
+    defaults = {
+        state: action
+        for state in table.states
+        if (action := get_consistent_reduction(table, state)) is not None
+    }
+
+    optimized = LRParsingTable[StateType]()
+    optimized.conflicts.extend(table.conflicts)
+    for state, action in table.default_reductions.items():
+        optimized.set_default_reduction(state, action)
+    for state, action in defaults.items():
+        optimized.set_default_reduction(state, action)
+
+    for state, symbol, entry in table.entries():
+        if state in defaults and is_terminal(symbol):
+            continue
+        optimized[state, symbol] = entry  # type: ignore
+
+    return optimized
+
+
+def eliminate_unit_reductions(
+    table: LRParsingTable[StateType], g: Grammar
+) -> LRParsingTable[StateType]:
+    """Returns a copy of `table` where every goto into a state that can only
+    reduce by a unit production A -> B goes straight to the goto on A,
+    recording the bypassed productions in `Goto.bypassed`."""
+    unit_states = {
+        state: production
+        for state in table.states
+        if (production := get_unit_reduction(table, state, g)) is not None
+    }
+
+    optimized = LRParsingTable[StateType]()
+    optimized.conflicts.extend(table.conflicts)
+    for state, default_reduction in table.default_reductions.items():
+        optimized.set_default_reduction(state, default_reduction)
+    for state, symbol, action in table.entries():
+        if isinstance(action, Goto):
+            action = _bypass_unit_states(table, state, action, unit_states, g)
+        optimized[state, symbol] = action  # type: ignore
+
+    return optimized
+
+
+def _bypass_unit_states(
+    table: LRParsingTable[StateType],
+    state: StateType,
+    goto: Goto[StateType],
+    unit_states: dict[StateType, int],
+    g: Grammar,
+) -> Goto[StateType]:
+    target = goto.target
+    bypassed = list(goto.bypassed)
+    visited = {target}
+
+    while target in unit_states:
+        production = unit_states[target]
+        nonterminal = g.production_lines[production].nonterminal
+        next_target = table[state, nonterminal].target
+        if next_target in visited:  # Cyclic unit productions
+            break
+        bypassed.append(production)
+        visited.add(next_target)
+        target = next_target
+
+    return Goto(target, tuple(bypassed))
+
+
+class MinimizedTable(NamedTuple, Generic[StateType]):
+    table: LRParsingTable[StateType]
+    # Maps every reachable state of the original table to the state
+    # standing in for its equivalence class
+    representatives: dict[StateType, StateType]
+
+
+def minimize_states(
+    table: LRParsingTable[StateType], start_state: StateType
+) -> MinimizedTable[StateType]:
+    """Merges states with equivalent rows by partition refinement, as in
+    DFA minimization, and drops states unreachable from `start_state`."""
+    states = get_reachable_states(table, start_state)
+    blocks = _number_blocks({state: _row_signature(table, state) for state in states})
+
+    while True:
+        refined = _number_blocks(
+            {
+                state: (
+                    blocks[state],
+                    frozenset(
+                        (symbol, blocks[target])
+                        for symbol, target in _get_targets(table, state)
+                    ),
+                )
+                for state in states
+            }
+        )
+        converged = len(set(refined.values())) == len(set(blocks.values()))
+        blocks = refined
+        if converged:
+            break
+
+    block_representatives = {blocks[start_state]: start_state}
+    for state in states:
+        block_representatives.setdefault(blocks[state], state)
+    representatives = {
+        state: block_representatives[blocks[state]] for state in states
+    }
+
+    minimized = LRParsingTable[StateType]()
+    minimized.conflicts.extend(
+        conflict for conflict in table.conflicts if conflict.state in representatives
+    )
+    for state in block_representatives.values():
+        if (default_reduction := table.get_default_reduction(state)) is not None:
+            minimized.set_default_reduction(state, default_reduction)
+        for symbol, action in table.row(state).items():
+            if isinstance(action, Shift):
+                action = Shift(representatives[action.target])
+            elif isinstance(action, Goto):
+                action = Goto(representatives[action.target], action.bypassed)
+            minimized[state, symbol] = action  # type: ignore
+
+    return MinimizedTable(minimized, representatives)
+
+
+def get_reachable_states(
+    table: LRParsingTable[StateType], start_state: StateType
+) -> list[StateType]:
+    reachable = [start_state]
+    visited = {start_state}
+    work = deque([start_state])
+
+    while len(work) > 0:
+        state = work.popleft()
+        for _, target in _get_targets(table, state):
+            if target not in visited:
+                visited.add(target)
+                reachable.append(target)
+                work.append(target)
+
+    return reachable
+
+
+def _get_targets(
+    table: LRParsingTable[StateType], state: StateType
+) -> Iterable[tuple[Symbol, StateType]]:
+    for symbol, action in table.row(state).items():
+        if isinstance(action, (Shift, Goto)):
+            yield symbol, action.target
+
+
+def _row_signature(table: LRParsingTable[StateType], state: StateType) -> Hashable:
+    """Describes a row up to the identity of its target states."""
+
+    def action_signature(action: Action | Goto[StateType]) -> Hashable:
+        if isinstance(action, Shift):
+            return Shift
+        if isinstance(action, Goto):
+            return Goto, action.bypassed
+        return action
+
+    return table.get_default_reduction(state), frozenset(
+        (symbol, action_signature(action))
+        for symbol, action in table.row(state).items()
+    )
+
+
+def _number_blocks(signatures: dict[StateType, Hashable]) -> dict[StateType, int]:
+    block_numbers: dict[Hashable, int] = {}
+    return {
+        state: block_numbers.setdefault(signature, len(block_numbers))
+        for state, signature in signatures.items()
+    }
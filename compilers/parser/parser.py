@@ -1,91 +1,323 @@
-from collections import deque
-from typing import Iterable, Iterator
+from functools import partial
+from typing import Any, AsyncIterable, Iterable, Iterator, Mapping
 
 from compilers.grammar.grammar import Grammar
 from compilers.grammar.productions import ProductionLine
+from compilers.grammar.terminals import Terminal
 from compilers.lexer.tokens import Token
-from compilers.parser.actions import Accept, Error, Reduce, Shift
 from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
-from compilers.parser.lalr_automata import LALRAutomata
-from compilers.parser.lr_sets import LR1Set
+from compilers.parser.build import BuildOptions, ParserArtifact, build_parser_artifact
+from compilers.parser.cache import ParserCache, get_default_cache
+from compilers.parser.compiled import ACCEPT, ERROR
+from compilers.parser.errors import (
+    NoEndOfInputTokenError,
+    ParsingError,
+    UnexpectedTokenError,
+)
+from compilers.parser.events import ParseEvent, ReduceEvent, ShiftEvent
+from compilers.parser.runtime import (
+    DriveResult,
+    ParserTables,
+    ReduceCallback,
+    ShiftCallback,
+    drive,
+)
+from compilers.parser.statistics import BuildStatistics
 
 
-class ParsingError(Exception):
-    pass
+class ParseSession:
+    """Push parser: tokens are fed one at a time, and the parse state is
+    kept between calls, so a session can be suspended while input arrives.
+    A session is meant for a single thread or task."""
 
+    def __init__(self, tables: ParserTables) -> None:
+        self.tables = tables
+        self._callbacks = resolve_callbacks(tables)
+        self._states = [0]  # Start state
+        self._values = list[ASTNode]()
+        # Reductions performed on the token being fed, to undo if it is rejected
+        self._undo: list[tuple[int, list[Any], list[int]]] = []
+        self._index = 0
+        self._result: ASTNode | None = None
 
-class UnexpectedTokenError(ParsingError):
-    def __init__(self, token: Token, index: int) -> None:
-        self.token = token
-        self.index = index
+    @property
+    def accepted(self) -> bool:
+        return self._result is not None
 
-        message = f"Parsing error on token {token} at position {index}"
-        super().__init__(message)
+    def feed(self, token: Token) -> None:
+        """Performs every reduction `token` triggers and shifts it, or
+        accepts if it is the end of the chain. On errors, `token` is not
+        consumed and the session is left as it was, so another token can
+        be fed in its place."""
+        if self._result is not None:
+            raise ParsingError("Session already accepted its input")
 
+        states, values, undo = self._states, self._values, self._undo
+        reducers, shifters = self._callbacks
+        stop = drive(
+            self.tables,
+            states,
+            values,
+            iter((token,)),
+            reducers,
+            shifters,
+            self._index,
+            undo,
+        )
+        if stop.rejected is not None:
+            error = _get_error(self.tables, states, stop)
+            for start, children, popped in reversed(undo):
+                del values[start:]
+                values.extend(children)
+                del states[start + 1 :]
+                states.extend(popped)
+            undo.clear()
+            raise error
 
-class NoEndOfInputTokenError(ParsingError):
-    def __init__(self) -> None:
-        super().__init__("Token chain does not end with end_of_chain token")
+        undo.clear()
+        self._index = stop.index
+        if stop.accepted:
+            self._result = values[-1]
+
+    def finish(self) -> ASTNode:
+        """Returns the AST once the end of the chain has been fed."""
+        if self._result is None:
+            raise NoEndOfInputTokenError()
+        return self._result
 
 
 class LALRParser:
+    """Parsers hold no parse state, so one instance can be shared between
+    threads and called reentrantly."""
+
     grammar: Grammar
+    # Build statistics, unless loaded from an artifact without them
+    statistics: BuildStatistics | None
+    tables: ParserTables
+
+    def __init__(
+        self,
+        g: Grammar,
+        *,
+        bypass_unit_reductions: bool = False,
+        keep_unit_nodes: bool = True,
+        minimize: bool = False,
+    ) -> None:
+        """If `bypass_unit_reductions` is set, chains of unit productions
+        are skipped through precomputed gotos. `keep_unit_nodes` controls
+        whether the skipped levels still show up in the AST. If `minimize`
+        is set, states with equivalent rows are merged."""
+        options = BuildOptions(bypass_unit_reductions, minimize)
+        artifact = build_parser_artifact(g, options, keep_states=False)
+        self._load_artifact(artifact, keep_unit_nodes)
+
+    @classmethod
+    def from_artifact(
+        cls, artifact: ParserArtifact, *, keep_unit_nodes: bool = True
+    ) -> "LALRParser":
+        """Creates a parser from prebuilt tables, e.g. from `build_parsers`."""
+        parser = cls.__new__(cls)
+        parser._load_artifact(artifact, keep_unit_nodes)
+        return parser
+
+    @classmethod
+    def from_cache(
+        cls,
+        g: Grammar,
+        *,
+        bypass_unit_reductions: bool = False,
+        keep_unit_nodes: bool = True,
+        minimize: bool = False,
+        cache: ParserCache | None = None,
+    ) -> "LALRParser":
+        """Like the constructor, but only builds the tables of grammars
+        missing from `cache`, by default the process-wide cache."""
+        options = BuildOptions(bypass_unit_reductions, minimize)
+        artifact = (cache or get_default_cache()).get(g, options)
+        return cls.from_artifact(artifact, keep_unit_nodes=keep_unit_nodes)
 
-    def __init__(self, g: Grammar) -> None:
-        self.grammar = g
-        automata = LALRAutomata(g)
-        self._start_state = automata.start_state
-        self._parsing_table = automata.compute_parsing_table()
-        self._parsing_stack = list[LR1Set]()
-        self._ast_stack = list[ASTNode]()
+    def _load_artifact(self, artifact: ParserArtifact, keep_unit_nodes: bool) -> None:
+        self.grammar = artifact.grammar
+        self.statistics = artifact.statistics
+        self.tables = ParserTables.from_table(
+            artifact.table, keep_unit_nodes=keep_unit_nodes
+        )
+        self._node_callbacks = resolve_callbacks(self.tables)
+
+    def start(self) -> ParseSession:
+        return ParseSession(self.tables)
+
+    async def parse_async(self, chain: AsyncIterable[Token]) -> ASTNode:
+        """Like `parse`, but consumes the tokens as they arrive."""
+        session = self.start()
+        async for token in chain:
+            session.feed(token)
+            if session.accepted:
+                break
+        return session.finish()
 
     def parse(self, chain: Iterable[Token]) -> ASTNode:
-        self._parsing_stack.clear()
-        self._ast_stack.clear()
+        return self.translate(chain)
+
+    def translate(
+        self,
+        chain: Iterable[Token],
+        reduce_callbacks: Mapping[ProductionLine, ReduceCallback] | None = None,
+        shift_callbacks: Mapping[Terminal, ShiftCallback] | None = None,
+    ) -> Any:
+        """Parses `chain` running the callbacks of each production and
+        terminal instead of building their nodes. Returns the value that
+        takes the place of the root `parse` would return. Productions and
+        terminals without a callback build AST nodes as in `parse`. Bypassed
+        unit productions only run their callbacks if the parser keeps unit
+        nodes."""
+        if reduce_callbacks is None and shift_callbacks is None:
+            reducers, shifters = self._node_callbacks
+        else:
+            reducers, shifters = resolve_callbacks(
+                self.tables, reduce_callbacks, shift_callbacks
+            )
+
+        states = [0]  # Start state
+        values: list[Any] = []
+        stop = drive(self.tables, states, values, iter(chain), reducers, shifters)
+        if not stop.accepted:
+            raise _get_error(self.tables, states, stop)
+        return values[-1]
+
+    def validate(self, chain: Iterable[Token]) -> None:
+        """Checks that `chain` is in the language, raising the same errors
+        as `parse`. Only the state stack is kept, and nothing is allocated
+        per token."""
+        tables = self.tables
+        actions = tables.actions
+        gotos = tables.gotos
+        default_actions = tables.default_actions
+        production_lengths = tables.production_lengths
+        left_hand_sides = tables.left_hand_sides
+        terminal_ids = tables.terminal_ids
+        terminal_count = tables.terminal_count
+        nonterminal_count = tables.nonterminal_count
+
+        states = [0]  # Start state
 
         chain_iterator = iter(chain)
-        self._parsing_stack.append(self._start_state)
+        token = next(chain_iterator, None)
+        if token is None:
+            raise NoEndOfInputTokenError()
+        terminal = terminal_ids.get(token.terminal, -1)
+        index = 0
 
-        token = consume_token(chain_iterator)
         while True:
-            current_state = self._parsing_stack[-1]
-            action = self._parsing_table[current_state, token.terminal]
-            match action:
-                case Shift(target=target_state):
-                    self._shift(target_state, token)
-                    token = consume_token(chain_iterator)
+            state = states[-1]
+            action = default_actions[state]
+            if action == ERROR and terminal >= 0:
+                action = actions[state * terminal_count + terminal]
+
+            if action > 0:
+                states.append(action - 1)
+                index += 1
+                token = next(chain_iterator, None)
+                if token is None:
+                    raise NoEndOfInputTokenError()
+                terminal = terminal_ids.get(token.terminal, -1)
+
+            elif action < ACCEPT:
+                production = -action - 1
+                length = production_lengths[production]
+                if length > 0:
+                    del states[-length:]
+                states.append(
+                    gotos[
+                        states[-1] * nonterminal_count + left_hand_sides[production]
+                    ]
+                )
+
+            elif action == ACCEPT:
+                return
+
+            else:
+                expected = tables.get_expected_terminals(state)
+                raise UnexpectedTokenError(token, index, expected)
 
-                case Reduce(production=production):
-                    self._reduce(production, token)
+    def recognize(self, chain: Iterable[Token]) -> bool:
+        """Returns whether `chain` is in the language."""
+        try:
+            self.validate(chain)
+        except ParsingError:
+            return False
+        return True
 
-                case Accept():
-                    return self._ast_stack[-1]
+    def events(self, chain: Iterable[Token]) -> Iterator[ParseEvent]:
+        """Parses `chain` lazily, yielding an event per shift and reduction
+        in the order `parse` performs them. No nodes are built, so memory
+        does not grow with the length of `chain`. Bypassed unit productions
+        are reported if the parser keeps unit nodes. The generator stops on
+        accepting."""
+        tables = self.tables
+        pending: list[ParseEvent] = []
 
-                case Error():
-                    raise UnexpectedTokenError(token, -1)
+        def shift(token: Token) -> None:
+            pending.append(ShiftEvent(token))
 
+        def reduce(production: int, children: list[None]) -> None:
+            pending.append(ReduceEvent(production, len(children)))
+
+        reducers = [
+            partial(reduce, production)
+            for production in range(len(tables.production_lengths))
+        ]
+        shifters = [shift] * tables.terminal_count
+
+        states = [0]  # Start state
+        values: list[None] = []
+        index = 0
+        for token in chain:
+            stop = drive(
+                tables, states, values, iter((token,)), reducers, shifters, index
+            )
+            index = stop.index
+            yield from pending
+            pending.clear()
+            if stop.accepted:
+                return
+            if stop.rejected is not None:
+                raise _get_error(tables, states, stop)
         raise NoEndOfInputTokenError()
 
-    def _push_to_stacks(self, state: LR1Set, node: ASTNode) -> None:
-        self._parsing_stack.append(state)
-        self._ast_stack.append(node)
 
-    def _shift(self, target_state: LR1Set, token: Token) -> None:
-        self._push_to_stacks(target_state, TerminalNode(token.terminal, token.value))
+def resolve_callbacks(
+    tables: ParserTables,
+    reduce_callbacks: Mapping[ProductionLine, ReduceCallback] | None = None,
+    shift_callbacks: Mapping[Terminal, ShiftCallback] | None = None,
+) -> tuple[list[ReduceCallback], list[ShiftCallback]]:
+    """Returns the callbacks indexed by production and terminal id, building
+    AST nodes where none is given."""
+    table = tables.table
+    production_ids = {line: i for i, line in enumerate(table.productions)}
+
+    reducers: list[ReduceCallback] = [
+        partial(NonterminalNode, tables.nonterminals[left_hand_side])
+        for left_hand_side in tables.left_hand_sides
+    ]
+    for line, reduce_callback in (reduce_callbacks or {}).items():
+        reducers[production_ids[line]] = reduce_callback
+
+    shifters: list[ShiftCallback] = [_build_terminal_node] * len(table.terminals)
+    for terminal, shift_callback in (shift_callbacks or {}).items():
+        shifters[tables.terminal_ids[terminal]] = shift_callback
 
-    def _reduce(self, production: ProductionLine, token: Token) -> None:
-        children: deque[ASTNode] = deque()
-        for _, _ in enumerate(production.derivation):
-            child = self._ast_stack.pop()
-            self._parsing_stack.pop()
-            children.appendleft(child)
+    return reducers, shifters
 
-        new_node = NonterminalNode(production.nonterminal, children)
-        top_state = self._parsing_stack[-1]
-        new_state = self._parsing_table[top_state, production.nonterminal].target
 
-        self._push_to_stacks(new_state, new_node)
+def _get_error(
+    tables: ParserTables, states: list[int], stop: DriveResult
+) -> ParsingError:
+    if stop.rejected is None:
+        return NoEndOfInputTokenError()
+    expected = tables.get_expected_terminals(states[-1])
+    return UnexpectedTokenError(stop.rejected, stop.index, expected)
 
 
-def consume_token(chain: Iterator[Token]) -> Token:
-    return next(chain)
+def _build_terminal_node(token: Token) -> TerminalNode:
+    return TerminalNode(token.terminal, token.value)
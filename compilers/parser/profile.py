@@ -0,0 +1,161 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from compilers.lexer.tokens import Token
+from compilers.parser.compiled import (
+    ACCEPT,
+    ERROR,
+    NO_GOTO,
+    CompiledConflict,
+    CompiledTable,
+    decode_reduce,
+    decode_shift,
+    encode_shift,
+)
+from compilers.parser.parser import NoEndOfInputTokenError, UnexpectedTokenError
+
+
+@dataclass
+class ParseProfile:
+    """How often a compiled table's entries were used while parsing."""
+
+    # Action lookups per state
+    state_counts: Counter[int] = field(default_factory=Counter)
+    # Lookups in the action array per (state, terminal)
+    action_counts: Counter[tuple[int, int]] = field(default_factory=Counter)
+    # Lookups in the action array per terminal
+    terminal_counts: Counter[int] = field(default_factory=Counter)
+    # Gotos taken per nonterminal
+    nonterminal_counts: Counter[int] = field(default_factory=Counter)
+
+    def get_state_order(self, state_count: int) -> list[int]:
+        """The start state, then every other state from most to least
+        visited, ties in state order."""
+        return [0] + sorted(
+            range(1, state_count), key=lambda state: -self.state_counts[state]
+        )
+
+
+def record_profile(
+    table: CompiledTable, corpus: Iterable[Iterable[Token]]
+) -> ParseProfile:
+    """Parses every token chain of `corpus` with `table`, without building
+    ASTs, counting the table entries used."""
+    profile = ParseProfile()
+    for chain in corpus:
+        _record_parse(table, chain, profile)
+    return profile
+
+
+def apply_profile(table: CompiledTable, profile: ParseProfile) -> CompiledTable:
+    """Returns a copy of `table` where states, terminals and nonterminals
+    are renumbered from most to least used in `profile`, so the entries
+    used most are contiguous in the arrays. The start state stays state 0
+    and production ids are unchanged. Compressing the result with rows in
+    state order packs the hot rows first."""
+    terminal_count, nonterminal_count = len(table.terminals), len(table.nonterminals)
+    state_order = profile.get_state_order(table.state_count)
+    terminal_order = _get_order(terminal_count, profile.terminal_counts)
+    nonterminal_order = _get_order(nonterminal_count, profile.nonterminal_counts)
+
+    state_ids = _invert(state_order)
+    terminal_ids = _invert(terminal_order)
+
+    def renumber(action: int) -> int:
+        if action > 0:
+            return encode_shift(state_ids[decode_shift(action)])
+        return action
+
+    actions = array("i", [ERROR]) * len(table.actions)
+    gotos = array("i", [NO_GOTO]) * len(table.gotos)
+    default_actions = array("i", [ERROR]) * table.state_count
+    unit_chains = {}
+
+    for state, old_state in enumerate(state_order):
+        default_actions[state] = table.default_actions[old_state]
+        for terminal, old_terminal in enumerate(terminal_order):
+            action = table.actions[old_state * terminal_count + old_terminal]
+            actions[state * terminal_count + terminal] = renumber(action)
+        for nonterminal, old_nonterminal in enumerate(nonterminal_order):
+            old_index = old_state * nonterminal_count + old_nonterminal
+            index = state * nonterminal_count + nonterminal
+            if (target := table.gotos[old_index]) != NO_GOTO:
+                gotos[index] = state_ids[target]
+            if old_index in table.unit_chains:
+                unit_chains[index] = table.unit_chains[old_index]
+
+    conflicts = (
+        CompiledConflict(
+            state_ids[conflict.state],
+            terminal_ids[conflict.terminal],
+            tuple(renumber(action) for action in conflict.actions),
+        )
+        for conflict in table.conflicts
+    )
+    states = [table.states[state] for state in state_order] if table.states else ()
+
+    return CompiledTable(
+        [table.terminals[terminal] for terminal in terminal_order],
+        [table.nonterminals[nonterminal] for nonterminal in nonterminal_order],
+        table.productions,
+        actions,
+        gotos,
+        default_actions,
+        unit_chains,
+        conflicts,
+        states,
+    )
+
+
+def _record_parse(
+    table: CompiledTable, chain: Iterable[Token], profile: ParseProfile
+) -> None:
+    terminal_count, nonterminal_count = len(table.terminals), len(table.nonterminals)
+    states = [0]
+    chain_iterator = iter(chain)
+    token = _next_token(chain_iterator)
+    index = 0
+
+    while True:
+        state = states[-1]
+        terminal = table.terminal_ids.get(token.terminal)
+        profile.state_counts[state] += 1
+
+        action = table.default_actions[state]
+        if action == ERROR and terminal is not None:
+            profile.terminal_counts[terminal] += 1
+            profile.action_counts[state, terminal] += 1
+            action = table.actions[state * terminal_count + terminal]
+
+        if action > 0:
+            states.append(decode_shift(action))
+            token = _next_token(chain_iterator)
+            index += 1
+        elif action == ACCEPT:
+            return
+        elif action < 0:
+            production = decode_reduce(action)
+            del states[len(states) - table.production_lengths[production] :]
+            left_hand_side = table.left_hand_sides[production]
+            profile.nonterminal_counts[left_hand_side] += 1
+            states.append(table.gotos[states[-1] * nonterminal_count + left_hand_side])
+        else:
+            expected = table.get_expected_terminals(state)
+            raise UnexpectedTokenError(token, index, expected)
+
+
+def _next_token(chain: Iterator[Token]) -> Token:
+    try:
+        return next(chain)
+    except StopIteration:
+        raise NoEndOfInputTokenError() from None
+
+
+def _get_order(count: int, counts: Counter[int]) -> list[int]:
+    return sorted(range(count), key=lambda i: -counts[i])
+
+
+def _invert(order: list[int]) -> dict[int, int]:
+    return {old: new for new, old in enumerate(order)}
@@ -0,0 +1,124 @@
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from compilers.grammar.terminals import Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import ASTNode
+from compilers.parser.compiled import ERROR
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    ParsingError,
+    UnexpectedTokenError,
+    resolve_callbacks,
+)
+from compilers.parser.runtime import drive
+
+
+@dataclass
+class RecoveryStatistics:
+    tokens_skipped: int = 0
+    states_popped: int = 0
+    # Time spent resynchronizing, excluding parsing
+    seconds: float = 0.0
+
+
+@dataclass
+class RecoveryResult:
+    # None unless the parse accepted. Discarded tokens and the nodes popped
+    # while recovering are missing from it
+    tree: ASTNode | None
+    errors: list[ParsingError] = field(default_factory=list)
+    statistics: RecoveryStatistics = field(default_factory=RecoveryStatistics)
+
+
+def parse_with_recovery(
+    parser: LALRParser,
+    chain: Iterable[Token],
+    sync_terminals: Iterable[Terminal] = (),
+    *,
+    max_errors: int = 100,
+) -> RecoveryResult:
+    """Parses `chain` collecting syntax errors instead of stopping at the
+    first one, by panic mode: after an error, tokens are discarded up to
+    the next synchronizing terminal, and states are popped until one has an
+    action on it. The end of chain always synchronizes. An error on the
+    token parsing resumed at is not reported again, and the token is
+    discarded instead. Parsing stops after `max_errors` errors."""
+    tables = parser.tables
+    actions = tables.actions
+    terminal_ids = tables.terminal_ids
+    terminal_count = tables.terminal_count
+    reducers, shifters = resolve_callbacks(tables)
+
+    end_of_chain = terminal_ids[get_end_of_chain(parser.grammar)]
+    sync_ids = {end_of_chain} | {
+        terminal_ids[terminal]
+        for terminal in sync_terminals
+        if terminal in terminal_ids
+    }
+    result = RecoveryResult(None)
+    statistics = result.statistics
+
+    states = [0]  # Start state
+    values: list[ASTNode] = []
+    # Index of the token parsing last resumed at after an error
+    resumed_at = -1
+
+    chain_iterator = iter(chain)
+    tokens: Iterator[Token] = chain_iterator
+    index = 0
+
+    while True:
+        stop = drive(tables, states, values, tokens, reducers, shifters, index)
+        index = stop.index
+        if stop.accepted:
+            result.tree = values[-1]
+            return result
+        token = stop.rejected
+        if token is None:
+            result.errors.append(NoEndOfInputTokenError())
+            return result
+
+        if index != resumed_at:
+            expected = tables.get_expected_terminals(states[-1])
+            result.errors.append(UnexpectedTokenError(token, index, expected))
+            if len(result.errors) >= max_errors:
+                return result
+
+        started = time.perf_counter()
+        terminal = terminal_ids.get(token.terminal, -1)
+        discard = index == resumed_at
+        while True:
+            if discard or terminal not in sync_ids:
+                if terminal == end_of_chain:
+                    statistics.seconds += time.perf_counter() - started
+                    return result
+                statistics.tokens_skipped += 1
+                index += 1
+                token = next(chain_iterator, None)
+                if token is None:
+                    result.errors.append(NoEndOfInputTokenError())
+                    return result
+                terminal = terminal_ids.get(token.terminal, -1)
+                discard = False
+                continue
+
+            depth = len(states) - 1
+            while depth >= 0 and (
+                actions[states[depth] * terminal_count + terminal] == ERROR
+            ):
+                depth -= 1
+            if depth >= 0:
+                statistics.states_popped += len(states) - 1 - depth
+                del states[depth + 1 :]
+                del values[depth:]
+                break
+            discard = True
+
+        resumed_at = index
+        statistics.seconds += time.perf_counter() - started
+        tokens = itertools.chain((token,), chain_iterator)
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, NamedTuple, Sequence
+
+from compilers.grammar.nonterminals import Nonterminal
+from compilers.grammar.terminals import Terminal
+from compilers.lexer.tokens import Token
+from compilers.parser.compiled import ACCEPT, ERROR, CompiledTable, IntArray
+
+# Semantic actions: a reduce callback gets the values of the children and
+# a shift callback the token, and their results replace the AST nodes
+ReduceCallback = Callable[[list[Any]], Any]
+ShiftCallback = Callable[[Token], Any]
+
+
+@dataclass(frozen=True)
+class ParserTables:
+    """Read-only parsing tables, laid out for the driver loops.
+
+    Parsing never writes to them, so one instance can be shared by every
+    thread, session and reentrant call of a parser. All parse state lives
+    in the stacks of each call or session."""
+
+    table: CompiledTable
+    actions: IntArray
+    gotos: IntArray
+    default_actions: IntArray
+    production_lengths: IntArray
+    left_hand_sides: IntArray
+    nonterminals: tuple[Nonterminal, ...]
+    terminal_ids: Mapping[Terminal, int]
+    # Empty unless the bypassed unit productions are kept in the AST
+    unit_chains: Mapping[int, tuple[int, ...]]
+    terminal_count: int
+    nonterminal_count: int
+
+    @classmethod
+    def from_table(
+        cls, table: CompiledTable, *, keep_unit_nodes: bool = True
+    ) -> "ParserTables":
+        return cls(
+            table,
+            table.actions,
+            table.gotos,
+            table.default_actions,
+            table.production_lengths,
+            table.left_hand_sides,
+            table.nonterminals,
+            MappingProxyType(table.terminal_ids),
+            MappingProxyType(table.unit_chains if keep_unit_nodes else {}),
+            len(table.terminals),
+            len(table.nonterminals),
+        )
+
+    def get_expected_terminals(self, state: int) -> frozenset[Terminal]:
+        return self.table.get_expected_terminals(state)
+
+
+class DriveResult(NamedTuple):
+    accepted: bool
+    # The token no action was found for, if any
+    rejected: Token | None
+    # Number of tokens shifted, counting from the index `drive` started at
+    index: int
+
+
+def drive(
+    tables: ParserTables,
+    states: list[int],
+    values: list[Any],
+    tokens: Iterator[Token],
+    reducers: Sequence[ReduceCallback],
+    shifters: Sequence[ShiftCallback],
+    index: int = 0,
+    undo: list[tuple[int, list[Any], list[int]]] | None = None,
+) -> DriveResult:
+    """Parses `tokens` on from the stacks `states` and `values`, pushing the
+    results of the shift callbacks, by terminal id, and of the reduce
+    callbacks, by production id. Stops on accepting, with the root on top
+    of `values`, on a token without an action, with the stacks as they were
+    when it was reached, or when `tokens` runs out, so parsing can go on
+    with more tokens. If `undo` is given, every reduction appends to it
+    the index it popped the stacks from, and the popped values and states,
+    so the stacks can be put back as they were."""
+    # Hot loop: every lookup is bound to a local, and actions are
+    # decoded inline (shift s is s + 1, reduce p is -p - 1, accept -1)
+    actions = tables.actions
+    gotos = tables.gotos
+    default_actions = tables.default_actions
+    production_lengths = tables.production_lengths
+    left_hand_sides = tables.left_hand_sides
+    terminal_ids = tables.terminal_ids
+    unit_chains = tables.unit_chains
+    terminal_count = tables.terminal_count
+    nonterminal_count = tables.nonterminal_count
+
+    token = next(tokens, None)
+    if token is None:
+        return DriveResult(False, None, index)
+    terminal = terminal_ids.get(token.terminal, -1)
+
+    while True:
+        state = states[-1]
+        action = default_actions[state]
+        if action == ERROR and terminal >= 0:
+            action = actions[state * terminal_count + terminal]
+
+        if action > 0:
+            states.append(action - 1)
+            values.append(shifters[terminal](token))
+            index += 1
+            token = next(tokens, None)
+            if token is None:
+                return DriveResult(False, None, index)
+            terminal = terminal_ids.get(token.terminal, -1)
+
+        elif action < ACCEPT:
+            production = -action - 1
+            start = len(values) - production_lengths[production]
+            children = values[start:]
+            if undo is not None:
+                undo.append((start, children, states[start + 1 :]))
+            del values[start:]
+            del states[start + 1 :]  # The start state is not in `values`
+
+            value = reducers[production](children)
+            goto_index = states[-1] * nonterminal_count + left_hand_sides[production]
+            if goto_index in unit_chains:
+                for unit_production in unit_chains[goto_index]:
+                    value = reducers[unit_production]([value])
+
+            states.append(gotos[goto_index])
+            values.append(value)
+
+        elif action == ACCEPT:
+            return DriveResult(True, None, index)
+
+        else:
+            return DriveResult(False, token, index)
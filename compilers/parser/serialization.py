@@ -0,0 +1,216 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.nonterminals import Nonterminal
+from compilers.grammar.productions import ProductionLine
+from compilers.grammar.symbols import Symbol
+from compilers.grammar.terminals import Terminal
+from compilers.parser.build import BuildOptions, build_parser_artifact
+from compilers.parser.compiled import CompiledConflict, CompiledTable, IntArray
+
+MAGIC = b"LRTABLE\0"
+VERSION = 1
+ARTIFACT_SUFFIX = ".lrtable"
+
+# magic, version, byte order, int size, fingerprint (sha256 digest),
+# state count, terminal count, nonterminal count, metadata size
+_HEADER = struct.Struct("<8sHcB32sIIII")
+_ALIGNMENT = 8
+
+
+class ArtifactError(Exception):
+    pass
+
+
+def dumps(table: CompiledTable, g: Grammar) -> bytes:
+    """Serializes `table` into the binary artifact format: a fixed header,
+    the integer arrays in native byte order, each aligned to 8 bytes, and
+    the symbol and production tables as JSON."""
+    metadata = json.dumps(_get_metadata(table)).encode()
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        _byte_order(),
+        array("i").itemsize,
+        bytes.fromhex(g.fingerprint()),
+        table.state_count,
+        len(table.terminals),
+        len(table.nonterminals),
+        len(metadata),
+    )
+
+    sections = [header]
+    for buffer in (table.actions, table.gotos, table.default_actions):
+        sections.append(_padding(sum(len(section) for section in sections)))
+        sections.append(memoryview(buffer).cast("B").tobytes())
+    sections.append(metadata)
+    return b"".join(sections)
+
+
+def loads(buffer: Any, g: Grammar | None = None) -> CompiledTable:
+    """Loads a compiled table from any buffer holding an artifact. The
+    integer arrays are zero-copy views into `buffer` whenever the byte
+    order matches. If `g` is given, the artifact must have been built from
+    a grammar with the same fingerprint."""
+    view = memoryview(buffer).cast("B")
+    if len(view) < _HEADER.size:
+        raise ArtifactError("Artifact is truncated")
+
+    (
+        magic,
+        version,
+        byte_order,
+        int_size,
+        fingerprint,
+        state_count,
+        terminal_count,
+        nonterminal_count,
+        metadata_size,
+    ) = _HEADER.unpack_from(view)
+
+    if magic != MAGIC:
+        raise ArtifactError("Not a parsing table artifact")
+    if version != VERSION:
+        raise ArtifactError(f"Unsupported artifact version {version}")
+    if int_size != array("i").itemsize:
+        raise ArtifactError(f"Artifact built with {int_size}-byte integers")
+    if g is not None and fingerprint.hex() != g.fingerprint():
+        raise ArtifactError("Artifact was built from a different grammar")
+
+    offset = _HEADER.size
+    arrays = []
+    for length in (
+        state_count * terminal_count,
+        state_count * nonterminal_count,
+        state_count,
+    ):
+        offset += len(_padding(offset))
+        size = length * int_size
+        if offset + size > len(view):
+            raise ArtifactError("Artifact is truncated")
+        arrays.append(_int_view(view[offset : offset + size], byte_order))
+        offset += size
+
+    if offset + metadata_size > len(view):
+        raise ArtifactError("Artifact is truncated")
+    try:
+        metadata = json.loads(bytes(view[offset : offset + metadata_size]))
+        return _from_metadata(metadata, *arrays)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ArtifactError("Artifact metadata is corrupt") from e
+
+
+def save(table: CompiledTable, g: Grammar, path: Path) -> None:
+    """Writes the artifact atomically, so concurrent readers never see a
+    partially written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(dumps(table, g))
+    os.replace(file.name, path)
+
+
+def load(path: Path, g: Grammar | None = None) -> CompiledTable:
+    """Memory-maps the artifact at `path` read-only. Every process loading
+    the same file shares its pages."""
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(mapped, g)
+
+
+def get_artifact_path(
+    directory: Path, g: Grammar, options: BuildOptions = BuildOptions()
+) -> Path:
+    flags = "".join(str(int(flag)) for flag in vars(options).values())
+    return directory / f"{g.fingerprint()}-{flags}-v{VERSION}{ARTIFACT_SUFFIX}"
+
+
+def load_or_build(
+    directory: Path, g: Grammar, options: BuildOptions = BuildOptions()
+) -> CompiledTable:
+    """Loads the artifact for `g` from `directory`, building and saving it
+    first if it does not exist yet, or if it cannot be loaded."""
+    path = get_artifact_path(directory, g, options)
+    if path.exists():
+        try:
+            return load(path, g)
+        except ArtifactError:
+            pass
+    table = build_parser_artifact(g, options, keep_states=False).table
+    save(table, g, path)
+    return load(path, g)
+
+
+def _get_metadata(table: CompiledTable) -> dict[str, Any]:
+    return {
+        "terminals": [terminal.value for terminal in table.terminals],
+        "nonterminals": [nonterminal.value for nonterminal in table.nonterminals],
+        "productions": [
+            [nonterminal.value, [_encode_symbol(symbol) for symbol in derivation]]
+            for nonterminal, derivation in table.productions
+        ],
+        "unit_chains": [[index, chain] for index, chain in table.unit_chains.items()],
+        "conflicts": [list(conflict) for conflict in table.conflicts],
+        "expected_terminals": table.expected_terminals,
+    }
+
+
+def _from_metadata(
+    metadata: dict[str, Any],
+    actions: IntArray,
+    gotos: IntArray,
+    default_actions: IntArray,
+) -> CompiledTable:
+    productions = [
+        ProductionLine(
+            Nonterminal(nonterminal),
+            tuple(_decode_symbol(symbol) for symbol in derivation),
+        )
+        for nonterminal, derivation in metadata["productions"]
+    ]
+    return CompiledTable(
+        [Terminal(value) for value in metadata["terminals"]],
+        [Nonterminal(value) for value in metadata["nonterminals"]],
+        productions,
+        actions,
+        gotos,
+        default_actions,
+        {index: tuple(chain) for index, chain in metadata["unit_chains"]},
+        (
+            CompiledConflict(state, terminal, tuple(codes))
+            for state, terminal, codes in metadata["conflicts"]
+        ),
+        expected_terminals=metadata.get("expected_terminals"),
+    )
+
+
+def _encode_symbol(symbol: Symbol) -> list[str]:
+    return ["T" if isinstance(symbol, Terminal) else "N", symbol.value]
+
+
+def _decode_symbol(encoded: list[str]) -> Symbol:
+    kind, value = encoded
+    return Terminal(value) if kind == "T" else Nonterminal(value)
+
+
+def _int_view(section: memoryview, byte_order: bytes) -> IntArray:
+    if byte_order == _byte_order():
+        return section.cast("i")
+    swapped = array("i", section.tobytes())
+    swapped.byteswap()
+    return swapped
+
+
+def _byte_order() -> bytes:
+    return b"<" if sys.byteorder == "little" else b">"
+
+
+def _padding(offset: int) -> bytes:
+    return bytes(-offset % _ALIGNMENT)
@@ -0,0 +1,63 @@
+import mmap
+import os
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+from compilers.grammar.grammar import Grammar
+from compilers.parser.compiled import CompiledTable
+from compilers.parser.serialization import dumps, loads
+
+# Where POSIX shared memory blocks can be opened as files
+_SHARED_MEMORY_DIRECTORY = "/dev/shm"
+
+
+def publish_table(
+    table: CompiledTable, g: Grammar, name: str | None = None
+) -> SharedMemory:
+    """Copies `table` into a new `multiprocessing.shared_memory` block, in
+    the binary artifact format. The caller owns the block, and should
+    `close` and `unlink` it once every worker is done with it."""
+    data = dumps(table, g)
+    shared_memory = SharedMemory(name, create=True, size=len(data))
+    shared_memory.buf[: len(data)] = data
+    return shared_memory
+
+
+def attach_table(name: str, g: Grammar | None = None) -> CompiledTable:
+    """Maps the table published as `name` read-only, without copying it.
+    Every process attached to a block shares its physical pages, so the
+    tables take the same memory however many workers use them, as with
+    `serialization.load` on an artifact file. The table stays valid until
+    dropped, even after the publisher unlinks the block. Raises `OSError`
+    on POSIX systems that do not expose blocks under `/dev/shm`.
+
+    Before Python 3.13, attaching registers the block with the resource
+    tracker, which unlinks it when the tracker exits. Start workers after
+    publishing so they share the publisher's tracker."""
+    options: dict[str, Any] = {}
+    if sys.version_info >= (3, 13):
+        options["track"] = False
+
+    shared_memory = SharedMemory(name, **options)
+    # A separate mapping outlives the `SharedMemory` handle, which cannot
+    # be closed while any view into its own buffer is alive
+    try:
+        mapped = _map_read_only(shared_memory)
+    finally:
+        shared_memory.close()
+    return loads(mapped, g)
+
+
+def _map_read_only(shared_memory: SharedMemory) -> mmap.mmap:
+    if os.name == "nt":
+        return mmap.mmap(
+            -1, shared_memory.size, tagname=shared_memory.name, access=mmap.ACCESS_READ
+        )
+    path = os.path.join(_SHARED_MEMORY_DIRECTORY, shared_memory.name)
+    if not os.path.exists(path):
+        # E.g. macOS, where blocks are not exposed as files. Copying the
+        # table into every worker would defeat sharing it
+        raise OSError(f"Cannot map shared memory block {shared_memory.name}")
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), shared_memory.size, access=mmap.ACCESS_READ)
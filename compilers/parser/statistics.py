@@ -0,0 +1,70 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Mapping
+
+from compilers.grammar.grammar import Grammar
+from compilers.parser.actions import Goto, Shift
+from compilers.parser.lr_sets import StateType
+from compilers.parser.tables import LRParsingTable
+
+
+@dataclass(frozen=True)
+class BuildStatistics:
+    """Size and build cost of a parsing table."""
+
+    state_count: int
+    # Shift and goto entries
+    transition_count: int
+    terminal_count: int
+    nonterminal_count: int
+    # Explicit entries, not counting default reductions
+    action_count: int
+    goto_count: int
+    default_reduction_count: int
+    conflict_count: int
+    # Approximate bytes used by each structure, e.g. "states", if measured
+    memory: Mapping[str, int]
+    # Wall time of each build phase, e.g. "first" or "table_fill"
+    phase_seconds: Mapping[str, float]
+
+    @property
+    def density(self) -> float:
+        """Fraction of the table's cells holding an explicit entry."""
+        cells = self.state_count * (self.terminal_count + self.nonterminal_count)
+        return (self.action_count + self.goto_count) / cells if cells > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "density": self.density}
+
+
+def get_table_statistics(
+    g: Grammar,
+    table: LRParsingTable[StateType],
+    memory: Mapping[str, int],
+    phase_seconds: Mapping[str, float],
+    states: Iterable[StateType] | None = None,
+) -> BuildStatistics:
+    """Counts the entries of `states`, by default every state of `table`."""
+    counted = set(table.states if states is None else states)
+    action_count = goto_count = transition_count = 0
+    for state, _, entry in table.entries():
+        if state not in counted:
+            continue
+        if isinstance(entry, Goto):
+            goto_count += 1
+        else:
+            action_count += 1
+        if isinstance(entry, (Shift, Goto)):
+            transition_count += 1
+
+    return BuildStatistics(
+        state_count=len(counted),
+        transition_count=transition_count,
+        terminal_count=len(g.terminals) + 1,  # End of chain
+        nonterminal_count=len(g.nonterminals),
+        action_count=action_count,
+        goto_count=goto_count,
+        default_reduction_count=len(counted & table.default_reductions.keys()),
+        conflict_count=sum(conflict.state in counted for conflict in table.conflicts),
+        memory=dict(memory),
+        phase_seconds=dict(phase_seconds),
+    )
@@ -1,16 +1,49 @@
-from typing import Generic, overload
+from typing import Generic, Iterable, Mapping, NamedTuple, overload
 
 from compilers.grammar.nonterminals import Nonterminal
 from compilers.grammar.symbols import Symbol, is_terminal
 from compilers.grammar.terminals import Terminal
-from compilers.parser.actions import Action, Error, Goto
+from compilers.parser.actions import Action, Error, Goto, Reduce
 from compilers.parser.lr_sets import StateType
 from compilers.utils import GroupedDict
 
 
+class Conflict(NamedTuple, Generic[StateType]):
+    state: StateType
+    terminal: Terminal
+    # Every action the state allows on `terminal`; the table keeps only one
+    actions: tuple[Action, ...]
+
+
 class LRParsingTable(Generic[StateType]):
+    conflicts: list[Conflict[StateType]]
+
     def __init__(self) -> None:
         self._table = GroupedDict[StateType, Symbol, Action | Goto[StateType]]()
+        self._default_reductions = dict[StateType, Reduce]()
+        self.conflicts = []
+
+    @property
+    def states(self) -> Iterable[StateType]:
+        return self._table.keys() | self._default_reductions.keys()
+
+    def row(self, state: StateType) -> dict[Symbol, Action | Goto[StateType]]:
+        return self._table.get(state, {})
+
+    def entries(self) -> Iterable[tuple[StateType, Symbol, Action | Goto[StateType]]]:
+        return self._table.flatten()
+
+    @property
+    def default_reductions(self) -> Mapping[StateType, Reduce]:
+        return self._default_reductions
+
+    def get_default_reduction(self, state: StateType) -> Reduce | None:
+        return self._default_reductions.get(state)
+
+    def set_default_reduction(self, state: StateType, action: Reduce) -> None:
+        """Makes `action` the action of `state` on every terminal
+        without an explicit entry."""
+        self._default_reductions[state] = action
 
     @overload
     def __getitem__(self, key: tuple[StateType, Terminal]) -> Action:
@@ -26,7 +59,7 @@ class LRParsingTable(Generic[StateType]):
             return self._table[state, symbol]
         except KeyError as e:
             if is_terminal(symbol):
-                return Error()
+                return self._default_reductions.get(state) or Error()
             raise e
 
     @overload
@@ -1,6 +1,9 @@
+import sys
+import time
 from collections import defaultdict
 from collections.abc import Mapping
-from typing import Any, Callable, Generic, Iterable, TypeVar, overload
+from contextlib import contextmanager
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar, overload
 
 T = TypeVar("T")
 Predicate = Callable[[T], bool]
@@ -90,3 +93,49 @@ def flatten(d: Mapping[K, Iterable[V]], /) -> Iterable[tuple[K, V]]:
     for key, iterable in d.items():
         for x in iterable:
             yield key, x
+
+
+class PhaseTimings:
+    """Wall time of named phases, in seconds."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Times the block as `phase`, replacing any earlier timing."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] = time.perf_counter() - start
+
+
+def get_deep_size(obj: object, exclude: Iterable[object] = ()) -> int:
+    """Approximate memory used by `obj` and everything it references,
+    counting each object once. Objects in `exclude`, types and functions
+    are neither counted nor followed."""
+    seen = {id(excluded) for excluded in exclude}
+    size = 0
+    pending = [obj]
+
+    while len(pending) > 0:
+        current = pending.pop()
+        if id(current) in seen or isinstance(current, type) or callable(current):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, Mapping):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pending.extend(current)
+        if hasattr(current, "__dict__"):
+            pending.append(vars(current))
+        for cls in type(current).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(current, slot):
+                    pending.append(getattr(current, slot))
+
+    return size
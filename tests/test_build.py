@@ -0,0 +1,94 @@
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser import actions
+from compilers.parser.build import BuildOptions, build_parser_artifact, build_parsers
+from compilers.parser.compiled import ERROR, NO_GOTO
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _ambiguous_grammar() -> Grammar:
+    S, E = get_nonterminals("S", "E")
+    plus, num = get_terminals("+", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, E), num])
+
+    return Grammar([s_prod, e_prod], S)
+
+
+def test_artifact_without_states_refers_to_state_numbers() -> None:
+    g = expression_grammar()
+    artifact = build_parser_artifact(g, keep_states=False)
+
+    assert artifact.table.states == ()
+    assert artifact.table.start_state == 0
+
+
+def test_build_parsers_reports_in_order() -> None:
+    grammars = [expression_grammar(), _ambiguous_grammar()]
+    reports = build_parsers(grammars, BuildOptions(minimize=True), max_workers=2)
+
+    assert [report.artifact.grammar.start_symbol for report in reports] == [
+        g.start_symbol for g in grammars
+    ]
+    assert all(report.seconds > 0 for report in reports)
+    assert all(report.peak_memory is not None for report in reports)
+
+    expression_report, ambiguous_report = reports
+    assert len(expression_report.conflicts) == 0
+    assert len(ambiguous_report.conflicts) > 0
+    for conflict in ambiguous_report.conflicts:
+        decoded = ambiguous_report.artifact.table.decode_action(conflict.actions[0])
+        assert isinstance(decoded, actions.Shift)
+
+
+def test_parser_from_built_artifact() -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    end_of_chain = get_end_of_chain(g)
+    input = [Token(num), Token(mult), Token(num), Token(plus), Token(num)]
+    input.append(Token(end_of_chain))
+
+    (report,) = build_parsers([g], max_workers=1, measure_memory=False)
+    parser = LALRParser.from_artifact(report.artifact)
+
+    assert report.peak_memory is None
+    assert parser.parse(input) == LALRParser(g).parse(input)
+
+
+def test_artifact_build_statistics() -> None:
+    g = expression_grammar()
+    options = BuildOptions(bypass_unit_reductions=True, minimize=True)
+    artifact = build_parser_artifact(g, options)
+
+    statistics = artifact.statistics
+    assert statistics is not None
+    assert LALRParser.from_artifact(artifact).statistics == statistics
+    assert statistics.state_count == artifact.table.state_count
+    assert set(statistics.memory) == {"compiled_table"}
+    assert statistics.memory["compiled_table"] == artifact.table.nbytes
+    assert {"first", "table_fill", "unit_reductions", "minimization"} <= set(
+        statistics.phase_seconds
+    )
+    assert statistics.to_dict()["density"] == statistics.density
+
+
+def test_artifact_statistics_count_compiled_states() -> None:
+    g = expression_grammar()
+    options = BuildOptions(bypass_unit_reductions=True)
+    artifact = build_parser_artifact(g, options, measure_memory=True)
+    table = artifact.table
+
+    # The bypassed states are unreachable, and not counted
+    statistics = artifact.statistics
+    assert statistics is not None
+    assert statistics.state_count == table.state_count
+    assert statistics.action_count == sum(a != ERROR for a in table.actions)
+    assert statistics.goto_count == sum(goto != NO_GOTO for goto in table.gotos)
+    assert statistics.transition_count == statistics.goto_count + sum(
+        action > 0 for action in table.actions
+    )
+    assert {"states", "transitions", "parsing_table"} <= set(statistics.memory)
@@ -0,0 +1,140 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser import cache as cache_module
+from compilers.parser.build import BuildOptions, ParserArtifact, build_parser_artifact
+from compilers.parser.cache import ParserCache
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+from compilers.parser.serialization import get_artifact_path
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _list_grammar(terminal: str) -> Grammar:
+    S, L = get_nonterminals("S", "L")
+    (item,) = get_terminals(terminal)
+
+    s_prod = Production(S, [L])
+    l_prod = Production(L, [(L, item), item])
+
+    return Grammar([s_prod, l_prod], S)
+
+
+def _count_builds(monkeypatch: pytest.MonkeyPatch, delay: float = 0) -> list[Grammar]:
+    built = []
+
+    def build(g: Grammar, options: BuildOptions, keep_states: bool) -> ParserArtifact:
+        built.append(g)
+        time.sleep(delay)
+        return build_parser_artifact(g, options, keep_states=keep_states)
+
+    monkeypatch.setattr(cache_module, "build_parser_artifact", build)
+    return built
+
+
+def test_cache_hits_equal_grammars(monkeypatch: pytest.MonkeyPatch) -> None:
+    built = _count_builds(monkeypatch)
+    cache = ParserCache()
+
+    artifact = cache.get(expression_grammar())
+    assert cache.get(expression_grammar()) is artifact
+    assert cache.get(expression_grammar(), BuildOptions(minimize=True)) is not artifact
+
+    assert len(built) == 2
+    hits, misses, entries, _ = cache.info()
+    assert (hits, misses, entries) == (1, 2, 2)
+
+
+def test_cache_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    built = _count_builds(monkeypatch)
+    cache = ParserCache(max_entries=2)
+    a, b, c = (_list_grammar(terminal) for terminal in "abc")
+
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)
+    cache.get(c)  # Evicts b
+    cache.get(a)
+    cache.get(b)
+
+    assert built == [a, b, c, b]
+    assert cache.info().entries == 2
+
+
+def test_cache_byte_budget() -> None:
+    a, b = _list_grammar("a"), _list_grammar("b")
+    size = build_parser_artifact(a, keep_states=False).table.nbytes
+    cache = ParserCache(max_entries=None, max_bytes=size)
+
+    cache.get(a)
+    cache.get(b)
+
+    assert cache.info().entries == 1
+    assert cache.info().nbytes == size
+
+
+def test_cache_builds_once_for_concurrent_requests(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    built = _count_builds(monkeypatch, delay=0.05)
+    cache = ParserCache()
+    artifacts = []
+
+    def request() -> None:
+        artifacts.append(cache.get(expression_grammar()))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert len(artifacts) == 8
+    assert all(artifact is artifacts[0] for artifact in artifacts)
+
+
+def test_cache_does_not_keep_failed_builds(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(g: Grammar, options: BuildOptions, keep_states: bool) -> ParserArtifact:
+        raise RuntimeError("build failed")
+
+    cache = ParserCache()
+    monkeypatch.setattr(cache_module, "build_parser_artifact", fail)
+    with pytest.raises(RuntimeError):
+        cache.get(expression_grammar())
+
+    monkeypatch.undo()
+    cache.get(expression_grammar())
+    assert cache.info().entries == 1
+
+
+def test_cache_disk_tier(tmp_path: Path) -> None:
+    g = expression_grammar()
+    ParserCache(directory=tmp_path).get(g)
+    path = get_artifact_path(tmp_path, g)
+    assert path.exists()
+
+    modified = path.stat().st_mtime_ns
+    artifact = ParserCache(directory=tmp_path).get(g)
+    assert path.stat().st_mtime_ns == modified
+    assert isinstance(artifact.table.actions, memoryview)
+
+
+def test_parser_from_cache() -> None:
+    g = expression_grammar()
+    plus, num = get_terminals("+", "num")
+    input = [Token(num), Token(plus), Token(num), Token(get_end_of_chain(g))]
+    cache = ParserCache()
+
+    parser = LALRParser.from_cache(g, bypass_unit_reductions=True, cache=cache)
+    again = LALRParser.from_cache(g, bypass_unit_reductions=True, cache=cache)
+
+    assert cache.info().hits == 1
+    expected = LALRParser(g, bypass_unit_reductions=True).parse(input)
+    assert parser.parse(input) == again.parse(input) == expected
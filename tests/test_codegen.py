@@ -0,0 +1,111 @@
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.lexer.tokens import Token
+from compilers.parser.build import BuildOptions
+from compilers.parser.codegen import write_parser_module
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    UnexpectedTokenError,
+)
+from tests.utils import expression_grammar, get_terminals
+
+
+def _expression_input(g: Grammar) -> list[Token]:
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    input = [Token(open), Token(num, 1), Token(plus), Token(num, 2), Token(close)]
+    input += [Token(mult), Token(num, 3), Token(get_end_of_chain(g))]
+    return input
+
+
+def _import_module(path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    "options, keep_unit_nodes",
+    [
+        (BuildOptions(), True),
+        (BuildOptions(bypass_unit_reductions=True), True),
+        (BuildOptions(bypass_unit_reductions=True), False),
+        (BuildOptions(minimize=True), True),
+    ],
+)
+def test_generated_parser_matches_lalr_parser(
+    tmp_path: Path, options: BuildOptions, keep_unit_nodes: bool
+) -> None:
+    g = expression_grammar()
+    path = tmp_path / "expression_parser.py"
+    write_parser_module(g, path, options, keep_unit_nodes=keep_unit_nodes)
+    module = _import_module(path)
+
+    parser = LALRParser(
+        g,
+        bypass_unit_reductions=options.bypass_unit_reductions,
+        keep_unit_nodes=keep_unit_nodes,
+        minimize=options.minimize,
+    )
+    input = _expression_input(g)
+    assert module.parse(input) == parser.parse(input)
+    assert module.FINGERPRINT == g.fingerprint()
+    # Unit chains are only generated where nodes are wrapped in them
+    assert hasattr(module, "_UNIT_CHAINS") == (
+        keep_unit_nodes and options.bypass_unit_reductions
+    )
+
+
+def test_generated_parser_errors(tmp_path: Path) -> None:
+    g = expression_grammar()
+    plus, num = get_terminals("+", "num")
+    path = tmp_path / "expression_parser.py"
+    write_parser_module(g, path)
+    module = _import_module(path)
+
+    input = [Token(num), Token(plus), Token(get_end_of_chain(g))]
+    with pytest.raises(UnexpectedTokenError) as error:
+        module.parse(input)
+    with pytest.raises(UnexpectedTokenError) as expected_error:
+        LALRParser(g).parse(input)
+    assert error.value.index == expected_error.value.index == 2
+    assert error.value.expected == expected_error.value.expected
+    with pytest.raises(NoEndOfInputTokenError):
+        module.parse([Token(num), Token(plus), Token(num)])
+
+
+def test_generated_module_imports_without_compilers(tmp_path: Path) -> None:
+    g = expression_grammar()
+    write_parser_module(g, tmp_path / "expression_parser.py")
+
+    check = (
+        "import sys, expression_parser; "
+        "assert not any(name.startswith('compilers') for name in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", check], cwd=tmp_path, check=True)
+
+    # Parsing loads the AST and error classes, but not the build stack
+    check = (
+        "import sys, expression_parser; "
+        "from compilers.grammar.terminals import Terminal; "
+        "from compilers.lexer.tokens import Token; "
+        "expression_parser.parse([Token(Terminal('num')), Token(Terminal('$'))]); "
+        "assert 'compilers.parser.build' not in sys.modules; "
+        "assert 'concurrent.futures' not in sys.modules"
+    )
+    root = Path(__file__).parent.parent
+    environment = {**os.environ, "PYTHONPATH": str(root)}
+    subprocess.run(
+        [sys.executable, "-c", check], cwd=tmp_path, env=environment, check=True
+    )
@@ -0,0 +1,113 @@
+import itertools
+
+import pytest
+
+from compilers.grammar.symbols import is_nonterminal
+from compilers.parser import actions
+from compilers.parser.compiled import (
+    ACCEPT,
+    ERROR,
+    NO_GOTO,
+    compile_table,
+    decode_reduce,
+    decode_shift,
+    encode_reduce,
+    encode_shift,
+)
+from compilers.parser.lalr_automata import LALRAutomata, get_end_of_chain
+from compilers.parser.optimizations import eliminate_unit_reductions
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def test_action_encoding_round_trips() -> None:
+    assert decode_shift(encode_shift(0)) == 0
+    assert decode_shift(encode_shift(7)) == 7
+    assert decode_reduce(encode_reduce(3)) == 3
+    assert encode_reduce(0) == ACCEPT
+    assert ERROR not in (encode_shift(0), encode_reduce(1), ACCEPT)
+
+
+def test_compiled_table_layout() -> None:
+    g = expression_grammar()
+    automata = LALRAutomata(g)
+    compiled = compile_table(automata.compute_parsing_table(), automata.start_state, g)
+
+    state_count = len(automata.states)
+    assert compiled.state_count == state_count
+    assert compiled.start_state == automata.start_state
+    assert compiled.productions[0] == g.get_production(g.start_symbol)[0]
+    assert len(compiled.actions) == state_count * len(compiled.terminals)
+    assert len(compiled.gotos) == state_count * len(compiled.nonterminals)
+    assert memoryview(compiled.actions).format == "i"
+    assert compiled.nbytes == 4 * (
+        len(compiled.actions) + len(compiled.gotos) + len(compiled.default_actions)
+    )
+
+
+def test_compiled_production_arrays() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    automata = LALRAutomata(g)
+    compiled = compile_table(automata.compute_parsing_table(), automata.start_state, g)
+
+    e_to_e_plus_t = g.get_production_id(g.get_production(E)[0])
+    f_to_num = g.get_production_id(g.get_production(F)[1])
+    assert compiled.production_lengths[e_to_e_plus_t] == 3
+    assert compiled.production_lengths[f_to_num] == 1
+    assert compiled.left_hand_sides[e_to_e_plus_t] == compiled.nonterminal_ids[E]
+    assert compiled.left_hand_sides[f_to_num] == compiled.nonterminal_ids[F]
+
+
+@pytest.mark.parametrize("default_reductions", [False, True])
+def test_compiled_table_view_matches_table(default_reductions: bool) -> None:
+    g = expression_grammar()
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table(default_reductions=default_reductions)
+    compiled = compile_table(table, automata.start_state, g)
+
+    symbols = g.symbols | {get_end_of_chain(g)}
+    for state, symbol in itertools.product(automata.states, symbols):
+        if is_nonterminal(symbol):
+            try:
+                expected = table[state, symbol]
+            except KeyError:
+                with pytest.raises(KeyError):
+                    compiled[state, symbol]
+                continue
+        else:
+            expected = table[state, symbol]
+        assert compiled[state, symbol] == expected
+
+    for state in automata.states:
+        expected_default = table.get_default_reduction(state)
+        assert compiled.get_default_reduction(state) == expected_default
+
+
+def test_compiled_table_keeps_bypassed_productions() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    automata = LALRAutomata(g)
+    table = eliminate_unit_reductions(automata.compute_parsing_table(), g)
+    compiled = compile_table(table, automata.start_state, g)
+
+    start = automata.start_state
+    assert compiled[start, F] == table[start, F]
+    assert compiled[start, F].bypassed == table[start, F].bypassed
+    # The state only reachable through the bypassed goto is dropped
+    assert compiled.state_count == len(automata.states) - 1
+
+
+def test_compiled_table_without_states_uses_numbers() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    (num,) = get_terminals("num")
+    automata = LALRAutomata(g)
+    compiled = compile_table(
+        automata.compute_parsing_table(), automata.start_state, g, keep_states=False
+    )
+
+    shift = compiled[0, num]
+    assert isinstance(shift, actions.Shift)
+    assert isinstance(shift.target, int)
+    assert compiled.goto(0, compiled.nonterminal_ids[S]) == NO_GOTO
+    assert compiled.goto(0, compiled.nonterminal_ids[E]) != NO_GOTO
@@ -0,0 +1,68 @@
+from compilers.parser.compiled import ERROR, NO_GOTO, CompiledTable, compile_table
+from compilers.parser.compression import CombTable, pack
+from compilers.parser.lalr_automata import LALRAutomata
+from tests.utils import expression_grammar
+
+
+def _compile_expression_grammar() -> CompiledTable:
+    g = expression_grammar()
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table(default_reductions=True)
+    return compile_table(table, automata.start_state, g)
+
+
+def test_pack_places_vectors_without_collisions() -> None:
+    vectors = [[(0, 10), (2, 12)], [(0, 20), (1, 21)], [], [(1, 31)]]
+    bases, check, table = pack(vectors, range(len(vectors)), 3)
+
+    for owner, entries in enumerate(vectors):
+        for index, value in entries:
+            assert check[bases[owner] + index] == owner
+            assert table[bases[owner] + index] == value
+    assert len(check) >= max(bases) + 3
+    assert len(table) < sum(3 for _ in vectors)
+
+
+def test_comb_table_matches_dense_actions() -> None:
+    compiled = _compile_expression_grammar()
+    comb = CombTable(compiled)
+
+    for state in range(compiled.state_count):
+        for terminal in range(len(compiled.terminals)):
+            dense = compiled.action(state, terminal)
+            packed = comb.action(state, terminal)
+            if dense != ERROR:
+                assert packed == dense
+            else:
+                assert packed in (ERROR, comb.row_defaults[state])
+                assert packed <= ERROR  # Never shifts on an error entry
+
+
+def test_comb_table_matches_dense_gotos() -> None:
+    compiled = _compile_expression_grammar()
+    comb = CombTable(compiled)
+
+    for state in range(compiled.state_count):
+        for nonterminal in range(len(compiled.nonterminals)):
+            dense = compiled.goto(state, nonterminal)
+            if dense != NO_GOTO:
+                assert comb.goto(state, nonterminal) == dense
+
+
+def test_comb_table_is_smaller_than_dense() -> None:
+    compiled = _compile_expression_grammar()
+    comb = CombTable(compiled)
+
+    assert len(comb.action_table) < len(compiled.actions)
+    assert len(comb.goto_table) < len(compiled.gotos)
+
+
+def test_comb_table_respects_row_order() -> None:
+    compiled = _compile_expression_grammar()
+    order = list(reversed(range(compiled.state_count)))
+    comb = CombTable(compiled, order)
+
+    for state in range(compiled.state_count):
+        for terminal in range(len(compiled.terminals)):
+            if (dense := compiled.action(state, terminal)) != ERROR:
+                assert comb.action(state, terminal) == dense
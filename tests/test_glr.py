@@ -0,0 +1,146 @@
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import NonterminalNode, TerminalNode
+from compilers.parser.glr import (
+    AmbiguityError,
+    ForestNode,
+    GLRParser,
+    count_trees,
+    get_tree,
+    iter_trees,
+)
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser, UnexpectedTokenError
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _ambiguous_grammar() -> Grammar:
+    # S -> E
+    # E -> E + E | num
+
+    S, E = get_nonterminals("S", "E")
+    plus, num = get_terminals("+", "num")
+
+    return Grammar([Production(S, [E]), Production(E, [(E, plus, E), num])], S)
+
+
+def _sum_tokens(g: Grammar, operand_count: int) -> list[Token]:
+    plus, num = get_terminals("+", "num")
+    tokens = [Token(num, "0")]
+    for i in range(1, operand_count):
+        tokens += [Token(plus), Token(num, str(i))]
+    return tokens + [Token(get_end_of_chain(g))]
+
+
+def test_glr_parser_matches_lalr_parser_without_conflicts() -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+
+    # (num + num) * num + num
+    chain = [
+        Token(open),
+        Token(num, "1"),
+        Token(plus),
+        Token(num, "2"),
+        Token(close),
+        Token(mult),
+        Token(num, "3"),
+        Token(plus),
+        Token(num, "4"),
+        Token(get_end_of_chain(g)),
+    ]
+    forest = GLRParser(g).parse(chain)
+
+    assert count_trees(forest) == 1
+    assert get_tree(forest) == LALRParser(g).parse(chain)
+
+
+def test_glr_parser_packs_ambiguous_derivations() -> None:
+    g = _ambiguous_grammar()
+    (E,) = get_nonterminals("E")
+    parser = GLRParser(g)
+
+    # Catalan numbers: the ways to parenthesize a sum
+    for operand_count, tree_count in [(1, 1), (2, 1), (3, 2), (4, 5), (8, 429)]:
+        forest = parser.parse(_sum_tokens(g, operand_count))
+        assert count_trees(forest) == tree_count
+
+    chain = _sum_tokens(g, 3)
+    forest = parser.parse(chain)
+    assert isinstance(forest, ForestNode)
+    assert forest.symbol == E and forest.is_ambiguous
+    assert (forest.start, forest.end) == (0, 5)
+
+    trees = list(iter_trees(forest))
+    assert len(trees) == 2 and trees[0] != trees[1]
+    # The table keeps one action of each conflict, so LALR finds one tree
+    assert LALRParser(g).parse(chain) in trees
+    with pytest.raises(AmbiguityError):
+        get_tree(forest)
+
+
+def test_glr_parser_follows_reduce_reduce_conflicts() -> None:
+    # S -> X
+    # X -> A | B
+    # A -> x
+    # B -> x
+
+    S, X, A, B = get_nonterminals("S", "X", "A", "B")
+    (x,) = get_terminals("x")
+    g = Grammar(
+        [
+            Production(S, [X]),
+            Production(X, [A, B]),
+            Production(A, [x]),
+            Production(B, [x]),
+        ],
+        S,
+    )
+    chain = [Token(x, "x"), Token(get_end_of_chain(g))]
+
+    # The table resolves the conflict, leaving a default reduction
+    forest = GLRParser(g).parse(chain)
+    assert isinstance(forest, ForestNode)
+    assert count_trees(forest) == 2
+    leaf = TerminalNode(x, "x")
+    trees = list(iter_trees(forest))
+    assert NonterminalNode(X, [NonterminalNode(A, [leaf])]) in trees
+    assert NonterminalNode(X, [NonterminalNode(B, [leaf])]) in trees
+
+
+def test_glr_parser_handles_hidden_left_recursion() -> None:
+    # S -> X
+    # X -> A X b | c
+    # A -> ε
+
+    S, X, A = get_nonterminals("S", "X", "A")
+    b, c = get_terminals("b", "c")
+    g = Grammar(
+        [
+            Production(S, [X]),
+            Production(X, [(A, X, b), c]),
+            Production(A, [()]),
+        ],
+        S,
+    )
+
+    chain = [Token(c), Token(b), Token(b), Token(get_end_of_chain(g))]
+    tree = get_tree(GLRParser(g).parse(chain))
+
+    empty = NonterminalNode(A, ())
+    innermost = NonterminalNode(X, (TerminalNode(c, None),))
+    inner = NonterminalNode(X, (empty, innermost, TerminalNode(b, None)))
+    assert tree == NonterminalNode(X, (empty, inner, TerminalNode(b, None)))
+
+
+def test_glr_parser_reports_errors() -> None:
+    g = _ambiguous_grammar()
+    plus, num = get_terminals("+", "num")
+
+    with pytest.raises(UnexpectedTokenError) as error:
+        GLRParser(g).parse([Token(num), Token(plus), Token(plus)])
+    assert error.value.index == 2
+    assert error.value.expected == {num}
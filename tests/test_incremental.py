@@ -0,0 +1,166 @@
+import random
+
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser.ast import TerminalNode
+from compilers.parser.incremental import IncrementalParser
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser, UnexpectedTokenError
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+@pytest.mark.parametrize(
+    "bypass_unit_reductions, keep_unit_nodes",
+    [(False, True), (True, True), (True, False)],
+)
+def test_incremental_parser_matches_full_parse(
+    bypass_unit_reductions: bool, keep_unit_nodes: bool
+) -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    parser = LALRParser(
+        g,
+        bypass_unit_reductions=bypass_unit_reductions,
+        keep_unit_nodes=keep_unit_nodes,
+    )
+
+    # 1 + (2 * 3) + 4
+    chain = [
+        Token(num, "1"),
+        Token(plus),
+        Token(open),
+        Token(num, "2"),
+        Token(mult),
+        Token(num, "3"),
+        Token(close),
+        Token(plus),
+        Token(num, "4"),
+        Token(get_end_of_chain(g)),
+    ]
+    incremental = IncrementalParser(parser, chain)
+    assert incremental.tree == parser.parse(chain)
+
+    edits = [
+        (3, 4, [Token(num, "5")]),  # 1 + (5 * 3) + 4
+        (0, 2, []),  # (5 * 3) + 4
+        (8, 8, [Token(mult), Token(num, "6")]),  # (5 * 3) + 4 * 6
+        (1, 4, [Token(num, "7")]),  # (7) + 4 * 6
+        (0, 0, [Token(num, "8"), Token(mult)]),  # 8 * (7) + 4 * 6
+    ]
+    for start, end, tokens in edits:
+        tree = incremental.edit(start, end, tokens)
+        assert tree == incremental.tree == parser.parse(incremental.tokens)
+
+
+def _list_grammar() -> Grammar:
+    # S -> L
+    # L -> L I | ε
+    # I -> a | b O c
+    # O -> x | ε
+
+    S, L, I, O = get_nonterminals("S", "L", "I", "O")
+    a, b, c, x = get_terminals("a", "b", "c", "x")
+
+    s_prod = Production(S, [L])
+    l_prod = Production(L, [(L, I), ()])
+    i_prod = Production(I, [a, (b, O, c)])
+    o_prod = Production(O, [x, ()])
+
+    return Grammar([s_prod, l_prod, i_prod, o_prod], S)
+
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_incremental_parser_with_epsilon_productions(minimize: bool) -> None:
+    g = _list_grammar()
+    a, b, c, x = get_terminals("a", "b", "c", "x")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g, minimize=minimize)
+
+    # `L -> L I` starts at the same token as its `I`, over another state
+    chain = [Token(t) for t in (b, x, c, b, c, a, a)] + [end_of_chain]
+    incremental = IncrementalParser(parser, chain)
+    tree = incremental.edit(5, 5, [Token(a)])
+    assert tree == parser.parse(incremental.tokens)
+
+    incremental = IncrementalParser(parser, [Token(a), end_of_chain])
+    tree = incremental.edit(0, 0, [Token(a), Token(b), Token(c)])
+    assert tree == parser.parse(incremental.tokens)
+
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_incremental_parser_matches_full_parse_on_random_edits(
+    minimize: bool,
+) -> None:
+    g = _list_grammar()
+    a, b, c, x = get_terminals("a", "b", "c", "x")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g, minimize=minimize)
+    items = [[a], [b, c], [b, x, c]]
+    rng = random.Random(0)
+
+    def get_items(count: int) -> list[Token]:
+        return [Token(t) for _ in range(count) for t in rng.choice(items)]
+
+    for _ in range(300):
+        chain = get_items(rng.randint(0, 6)) + [end_of_chain]
+        incremental = IncrementalParser(parser, chain)
+        for _ in range(30):
+            # Edits replace whole items, so the chain is always accepted
+            boundaries = [0] + [
+                i + 1
+                for i, token in enumerate(incremental.tokens[:-1])
+                if token.terminal in (a, c)
+            ]
+            start, end = sorted(rng.choices(boundaries, k=2))
+            tree = incremental.edit(start, end, get_items(rng.randint(0, 3)))
+            assert tree == parser.parse(incremental.tokens)
+
+
+def test_incremental_parser_reuses_unedited_subtrees() -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    parser = LALRParser(g)
+
+    # (1 * 2) + 3
+    chain = [
+        Token(open),
+        Token(num, "1"),
+        Token(mult),
+        Token(num, "2"),
+        Token(close),
+        Token(plus),
+        Token(num, "3"),
+        Token(get_end_of_chain(g)),
+    ]
+    incremental = IncrementalParser(parser, chain)
+    before = incremental.tree
+    assert before is not None
+
+    after = incremental.edit(6, 7, [Token(num, "4")])
+    assert after is not before
+    assert after.children[0] is before.children[0]
+    (number,) = after.children[2].children[0].children
+    assert isinstance(number, TerminalNode) and number.value == "4"
+
+
+def test_incremental_parser_recovers_from_rejected_edit() -> None:
+    g = expression_grammar()
+    plus, num = get_terminals("+", "num")
+    parser = LALRParser(g)
+
+    chain = [Token(num, "1"), Token(plus), Token(num, "2"), Token(get_end_of_chain(g))]
+    incremental = IncrementalParser(parser, chain)
+
+    with pytest.raises(UnexpectedTokenError) as error:
+        incremental.edit(2, 3, [])
+    assert error.value.index == 2
+    assert incremental.tree is None
+
+    tree = incremental.edit(2, 2, [Token(num, "3")])
+    assert tree == parser.parse(incremental.tokens)
+
+    with pytest.raises(IndexError):
+        incremental.edit(3, 2, [])
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from compilers.lexer.tokens import Token
+from compilers.parser.instrumentation import ParseMetrics, parse_instrumented
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser, UnexpectedTokenError
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def test_parse_instrumented_counts_actions() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    parser = LALRParser(g)
+
+    # num + num * num
+    chain = [
+        Token(num, "1"),
+        Token(plus),
+        Token(num, "2"),
+        Token(mult),
+        Token(num, "3"),
+        Token(get_end_of_chain(g)),
+    ]
+    tree, metrics = parse_instrumented(parser, chain)
+
+    assert tree == parser.parse(chain)
+    assert metrics.parses == 1
+    assert metrics.tokens == 5
+    assert sum(metrics.shifts_by_state.values()) == 5
+    f_to_num = g.get_production_id(g.get_production(F)[1])
+    e_to_e_plus_t = g.get_production_id(g.get_production(E)[0])
+    assert metrics.reductions_by_production[f_to_num] == 3
+    assert metrics.reductions_by_production[e_to_e_plus_t] == 1
+    assert sum(metrics.reductions_by_state.values()) == 8
+    # Start state, E, +, T, *, num
+    assert metrics.max_depth == 6
+    assert metrics.callback_seconds == 0.0
+
+
+def test_parse_instrumented_accumulates_and_exports() -> None:
+    g = expression_grammar()
+    plus, num = get_terminals("+", "num")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g)
+
+    metrics = ParseMetrics()
+    value, _ = parse_instrumented(
+        parser,
+        [Token(num, "2"), Token(plus), Token(num, "3"), end_of_chain],
+        shift_callbacks={num: lambda token: int(token.value)},
+        metrics=metrics,
+    )
+    assert value.children[0].children[0].children[0].children[0] == 2
+    assert metrics.callback_seconds > 0.0
+
+    with pytest.raises(UnexpectedTokenError):
+        parse_instrumented(parser, [Token(plus), end_of_chain], metrics=metrics)
+    assert metrics.parses == 2
+    assert metrics.tokens == 3
+
+    exported = metrics.to_dict()
+    assert type(exported["shifts_by_state"]) is dict
+    assert exported["tokens_per_second"] == metrics.tokens_per_second
+    assert json.loads(json.dumps(exported))["parses"] == 2
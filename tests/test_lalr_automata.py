@@ -229,6 +229,9 @@ def test_lalr_automata_parsing_table_creation_null_derivation() -> None:
 
     (start_item,) = items_from_production(start_prod)
     a_to_a, a_to_epsilon = items_from_production(a_prod)
+    reduce_a_to_a, reduce_a_to_epsilon = (
+        actions.Reduce(g.get_production_id(line)) for line in a_prod.derivations
+    )
 
     states = (
         LR1Set({start_item.to_lr1(end_of_chain)}),
@@ -238,10 +241,10 @@ def test_lalr_automata_parsing_table_creation_null_derivation() -> None:
 
     valid_transitions: LRTableTransitions = {
         (states[0], a): actions.Shift(states[2]),
-        (states[0], end_of_chain): actions.Reduce(a_to_epsilon.production),
+        (states[0], end_of_chain): reduce_a_to_epsilon,
         (states[0], A): actions.Goto(states[1]),
         (states[1], end_of_chain): actions.Accept(),
-        (states[2], end_of_chain): actions.Reduce(a_to_a.production),
+        (states[2], end_of_chain): reduce_a_to_a,
     }
 
     table = automata.compute_parsing_table()
@@ -263,6 +266,10 @@ def test_lalr_automata_parsing_table_creation() -> None:
     (start_item,) = items_from_production(start_prod)
     (s_to_c,) = items_from_production(s_prod)
     c_to_c, c_to_d = items_from_production(c_prod)
+    reduce_s_to_c = actions.Reduce(g.get_production_id(s_to_c.production))
+    reduce_c_to_c, reduce_c_to_d = (
+        actions.Reduce(g.get_production_id(line)) for line in c_prod.derivations
+    )
 
     states = (
         LR1Set(start_item.to_lr1([end_of_chain])),
@@ -286,19 +293,78 @@ def test_lalr_automata_parsing_table_creation() -> None:
         (states[3], c): actions.Shift(states[3]),
         (states[3], d): actions.Shift(states[4]),
         (states[3], C): actions.Goto(states[6]),
-        (states[4], c): actions.Reduce(c_to_d.production),
-        (states[4], d): actions.Reduce(c_to_d.production),
-        (states[4], end_of_chain): actions.Reduce(c_to_d.production),
-        (states[5], end_of_chain): actions.Reduce(s_to_c.production),
-        (states[6], c): actions.Reduce(c_to_c.production),
-        (states[6], d): actions.Reduce(c_to_c.production),
-        (states[6], end_of_chain): actions.Reduce(c_to_c.production),
+        (states[4], c): reduce_c_to_d,
+        (states[4], d): reduce_c_to_d,
+        (states[4], end_of_chain): reduce_c_to_d,
+        (states[5], end_of_chain): reduce_s_to_c,
+        (states[6], c): reduce_c_to_c,
+        (states[6], d): reduce_c_to_c,
+        (states[6], end_of_chain): reduce_c_to_c,
     }
 
     table = automata.compute_parsing_table()
     _compare_lr_tables(states, valid_transitions, table, g)
 
 
+def test_lalr_automata_parsing_table_records_conflicts() -> None:
+    # S -> E
+    # E -> E + E | num
+
+    S, E = get_nonterminals("S", "E")
+    plus, num = get_terminals("+", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, E), num])
+
+    g = Grammar([s_prod, e_prod], S)
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table()
+
+    (conflict,) = table.conflicts
+    shift, reduce = conflict.actions
+    assert conflict.terminal == plus
+    assert isinstance(shift, actions.Shift)
+    assert reduce == actions.Reduce(g.get_production_id(e_prod[0]))
+    assert table[conflict.state, plus] == shift
+
+
+def test_lalr_automata_statistics() -> None:
+    # S -> E
+    # E -> E + E | num
+
+    S, E = get_nonterminals("S", "E")
+    plus, num = get_terminals("+", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, E), num])
+
+    g = Grammar([s_prod, e_prod], S)
+    automata = LALRAutomata(g)
+    statistics = automata.get_statistics(
+        automata.compute_parsing_table(), measure_memory=True
+    )
+
+    assert statistics.state_count == len(automata.states) == 5
+    assert statistics.transition_count == automata.transition_count == 6
+    assert statistics.terminal_count == 3
+    assert statistics.nonterminal_count == 2
+    assert statistics.goto_count == 2
+    assert statistics.conflict_count == 1
+    assert statistics.density == (statistics.action_count + 2) / (5 * 5)
+    assert set(statistics.memory) == {"states", "transitions", "parsing_table"}
+    assert all(size > 0 for size in statistics.memory.values())
+    assert automata.get_statistics().memory == {}
+    assert set(statistics.phase_seconds) == {
+        "first",
+        "follow",
+        "lr0",
+        "lookahead_relationships",
+        "propagation",
+        "lr1_closure",
+        "table_fill",
+    }
+
+
 LRTableTransitions = dict[tuple[LRSet, Symbol], actions.Action | actions.Goto]
 
 
@@ -1,10 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator
+
+import pytest
+
 from compilers.grammar.grammar import Grammar
 from compilers.grammar.productions import Production
 from compilers.lexer.tokens import Token
-from compilers.parser.ast import NonterminalNode, TerminalNode
+from compilers.parser.ast import ASTNode, NonterminalNode, TerminalNode
+from compilers.parser.events import ReduceEvent, ShiftEvent
 from compilers.parser.lalr_automata import get_end_of_chain
-from compilers.parser.parser import LALRParser
-from tests.utils import get_nonterminals, get_terminals
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    ParsingError,
+    UnexpectedTokenError,
+)
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
 
 
 def test_parser_parses_single_terminal() -> None:
@@ -153,3 +165,324 @@ def test_parser_parses_expression_grammar() -> None:
         ],
     )
     assert ast_root == expected
+
+
+def test_parser_bypasses_unit_reductions() -> None:
+    # S -> E
+    # E -> E + T | T
+    # T -> T * F | F
+    # F -> (E) | num
+
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, T), T])
+    t_prod = Production(T, [(T, mult, F), F])
+    f_prod = Production(F, [(open, E, close), num])
+
+    g = Grammar([s_prod, e_prod, t_prod, f_prod], S)
+    end_of_chain = get_end_of_chain(g)
+
+    # (num + num) * num
+    input = [
+        Token(open),
+        Token(num),
+        Token(plus),
+        Token(num),
+        Token(close),
+        Token(mult),
+        Token(num),
+        Token(end_of_chain),
+    ]
+
+    expected = LALRParser(g).parse(input)
+    keeping = LALRParser(g, bypass_unit_reductions=True)
+    assert keeping.parse(input) == expected
+    minimized = LALRParser(g, bypass_unit_reductions=True, minimize=True)
+    assert minimized.parse(input) == expected
+
+    collapsing = LALRParser(g, bypass_unit_reductions=True, keep_unit_nodes=False)
+    ast_root = collapsing.parse([Token(num), Token(end_of_chain)])
+    assert ast_root == NonterminalNode(E, [NonterminalNode(F, [TerminalNode(num, "")])])
+
+
+def test_parser_detects_error_after_default_reduction() -> None:
+    # S -> A
+    # A -> ab
+
+    S, A = get_nonterminals("S", "A")
+    a, b = get_terminals("a", "b")
+
+    s_prod = Production(S, [A])
+    a_prod = Production(A, [(a, b)])
+
+    g = Grammar([s_prod, a_prod], S)
+    end_of_chain = get_end_of_chain(g)
+
+    parser = LALRParser(g)
+    with pytest.raises(UnexpectedTokenError) as error:
+        parser.parse([Token(a), Token(b), Token(b), Token(end_of_chain)])
+
+    assert error.value.token == Token(b)
+    assert error.value.index == 2
+    assert error.value.expected == {end_of_chain}
+
+
+def test_parser_error_reports_expected_terminals() -> None:
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, T), T])
+    t_prod = Production(T, [(T, mult, F), F])
+    f_prod = Production(F, [(open, E, close), num])
+
+    g = Grammar([s_prod, e_prod, t_prod, f_prod], S)
+    end_of_chain = get_end_of_chain(g)
+
+    parser = LALRParser(g)
+    with pytest.raises(UnexpectedTokenError) as error:
+        parser.parse([Token(num), Token(plus), Token(close), Token(end_of_chain)])
+
+    assert error.value.token == Token(close)
+    assert error.value.index == 2
+    assert error.value.expected == {open, num}
+    assert "expected one of: (, num" in str(error.value)
+
+
+def test_parser_rejects_chain_without_end_of_chain() -> None:
+    (S,) = get_nonterminals("S")
+    a, b = get_terminals("a", "b")
+
+    g = Grammar([Production(S, [a])], S)
+    parser = LALRParser(g)
+
+    with pytest.raises(NoEndOfInputTokenError):
+        parser.parse([Token(a)])
+    with pytest.raises(NoEndOfInputTokenError):
+        parser.parse([])
+    with pytest.raises(UnexpectedTokenError) as error:
+        parser.parse([Token(b), Token(get_end_of_chain(g))])
+    assert error.value.index == 0
+    assert error.value.expected == {a}
+
+
+def _sum_grammar() -> Grammar:
+    S, E, T = get_nonterminals("S", "E", "T")
+    plus, num = get_terminals("+", "num")
+
+    return Grammar(
+        [
+            Production(S, [E]),
+            Production(E, [(E, plus, T), T]),
+            Production(T, [num]),
+        ],
+        S,
+    )
+
+
+def _sum_tokens(g: Grammar, operand_count: int) -> list[Token]:
+    plus, num = get_terminals("+", "num")
+    tokens = [Token(num, "0")]
+    for i in range(1, operand_count):
+        tokens += [Token(plus), Token(num, str(i))]
+    return tokens + [Token(get_end_of_chain(g))]
+
+
+def test_parser_is_shared_between_threads() -> None:
+    g = _sum_grammar()
+    parser = LALRParser(g)
+    chains = [_sum_tokens(g, operand_count) for operand_count in range(1, 65)]
+    expected = [parser.parse(chain) for chain in chains]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(parser.parse, chains * 4))
+
+    assert results == expected * 4
+
+
+def test_parser_is_reentrant() -> None:
+    g = _sum_grammar()
+    parser = LALRParser(g)
+    inner_chain = _sum_tokens(g, 3)
+    inner_results = []
+
+    def outer_chain() -> Iterator[Token]:
+        for token in _sum_tokens(g, 5):
+            # Parse another chain while the outer parse is suspended
+            inner_results.append(parser.parse(inner_chain))
+            yield token
+
+    assert parser.parse(outer_chain()) == parser.parse(_sum_tokens(g, 5))
+    assert inner_results == [parser.parse(inner_chain)] * len(_sum_tokens(g, 5))
+
+
+def test_parse_session_matches_parse() -> None:
+    g = _sum_grammar()
+    parser = LALRParser(g)
+    chain = _sum_tokens(g, 4)
+
+    # Interleaved sessions keep their own state
+    first, second = parser.start(), parser.start()
+    for token in chain:
+        first.feed(token)
+        second.feed(token)
+
+    assert first.accepted
+    assert first.finish() == second.finish() == parser.parse(chain)
+
+
+def test_parse_session_errors() -> None:
+    g = _sum_grammar()
+    plus, num = get_terminals("+", "num")
+    parser = LALRParser(g)
+
+    session = parser.start()
+    session.feed(Token(num, "0"))
+    with pytest.raises(NoEndOfInputTokenError):
+        session.finish()
+
+    with pytest.raises(UnexpectedTokenError) as error:
+        session.feed(Token(num, "1"))
+    assert error.value.index == 1
+    assert error.value.expected == {plus, get_end_of_chain(g)}
+
+    # The rejected token was not consumed
+    session.feed(Token(get_end_of_chain(g)))
+    assert session.finish() == parser.parse(_sum_tokens(g, 1))
+    with pytest.raises(ParsingError):
+        session.feed(Token(get_end_of_chain(g)))
+
+
+def test_parse_session_is_unchanged_by_rejected_tokens() -> None:
+    g = expression_grammar()
+    plus, mult, close, num = get_terminals("+", "*", ")", "num")
+    end_of_chain = get_end_of_chain(g)
+    parser = LALRParser(g)
+    chain = [Token(num, "2"), Token(mult), Token(num, "3"), Token(end_of_chain)]
+
+    # `)` is only rejected after reducing num to F, T and E
+    session = parser.start()
+    session.feed(chain[0])
+    with pytest.raises(UnexpectedTokenError) as error:
+        session.feed(Token(close))
+    assert error.value.index == 1
+    assert error.value.expected == {plus, end_of_chain}
+
+    for token in chain[1:]:
+        session.feed(token)
+    assert session.finish() == parser.parse(chain)
+
+
+def test_parse_async() -> None:
+    g = _sum_grammar()
+    parser = LALRParser(g)
+    chain = _sum_tokens(g, 6)
+
+    async def arriving(tokens: list[Token]) -> AsyncIterator[Token]:
+        for token in tokens:
+            await asyncio.sleep(0)
+            yield token
+
+    assert asyncio.run(parser.parse_async(arriving(chain))) == parser.parse(chain)
+    with pytest.raises(NoEndOfInputTokenError):
+        asyncio.run(parser.parse_async(arriving(chain[:-1])))
+
+
+@pytest.mark.parametrize("bypass_unit_reductions", [False, True])
+def test_parser_translate_runs_callbacks(bypass_unit_reductions: bool) -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    parser = LALRParser(g, bypass_unit_reductions=bypass_unit_reductions)
+
+    e_to_e_plus_t, e_to_t = g.get_production(E)
+    t_to_t_mult_f, t_to_f = g.get_production(T)
+    f_to_parentheses, f_to_num = g.get_production(F)
+    reduce_callbacks = {
+        e_to_e_plus_t: lambda children: children[0] + children[2],
+        t_to_t_mult_f: lambda children: children[0] * children[2],
+        f_to_parentheses: lambda children: children[1],
+        e_to_t: lambda children: children[0],
+        t_to_f: lambda children: children[0],
+        f_to_num: lambda children: children[0],
+    }
+    shift_callbacks = {num: lambda token: int(token.value)}
+
+    # (2 + 3) * 4 + 1
+    chain = [
+        Token(open),
+        Token(num, "2"),
+        Token(plus),
+        Token(num, "3"),
+        Token(close),
+        Token(mult),
+        Token(num, "4"),
+        Token(plus),
+        Token(num, "1"),
+        Token(get_end_of_chain(g)),
+    ]
+    assert parser.translate(chain, reduce_callbacks, shift_callbacks) == 21
+    # Without callbacks, the AST is built as usual
+    assert parser.translate(chain) == parser.parse(chain)
+
+    with pytest.raises(UnexpectedTokenError) as error:
+        parser.translate(chain[1:], reduce_callbacks, shift_callbacks)
+    assert error.value.index == 3
+
+
+@pytest.mark.parametrize("bypass_unit_reductions", [False, True])
+def test_parser_events_rebuild_ast(bypass_unit_reductions: bool) -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    parser = LALRParser(g, bypass_unit_reductions=bypass_unit_reductions)
+
+    # num * (num + num)
+    chain = [
+        Token(num, "1"),
+        Token(mult),
+        Token(open),
+        Token(num, "2"),
+        Token(plus),
+        Token(num, "3"),
+        Token(close),
+        Token(get_end_of_chain(g)),
+    ]
+    events = list(parser.events(iter(chain)))
+    assert events[0] == ShiftEvent(Token(num, "1"))
+    assert sum(isinstance(event, ShiftEvent) for event in events) == len(chain) - 1
+
+    values: list[ASTNode] = []
+    for event in events:
+        if isinstance(event, ShiftEvent):
+            values.append(TerminalNode(event.token.terminal, event.token.value))
+        else:
+            assert isinstance(event, ReduceEvent)
+            start = len(values) - event.child_count
+            nonterminal = g.production_lines[event.production].nonterminal
+            values[start:] = [NonterminalNode(nonterminal, values[start:])]
+
+    assert values == [parser.parse(chain)]
+
+    with pytest.raises(UnexpectedTokenError):
+        list(parser.events(chain[1:]))
+
+
+def test_parser_validate_and_recognize() -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g, bypass_unit_reductions=True)
+
+    valid = [Token(open), Token(num), Token(plus), Token(num), Token(close)]
+    parser.validate(valid + [end_of_chain])
+    assert parser.recognize(valid + [end_of_chain])
+
+    invalid = [Token(num), Token(plus), Token(close), end_of_chain]
+    with pytest.raises(UnexpectedTokenError) as error:
+        parser.validate(invalid)
+    assert error.value.index == 2
+    assert error.value.expected == {open, num}
+    assert not parser.recognize(invalid)
+    assert not parser.recognize(valid)
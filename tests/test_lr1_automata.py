@@ -0,0 +1,73 @@
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.parser.lalr_automata import LALRAutomata, get_end_of_chain
+from compilers.parser.lr1_automata import LR1Automata
+from compilers.parser.lr_items import items_from_production
+from compilers.parser.lr_sets import LR1Set
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _pointer_grammar() -> Grammar:
+    # S' -> S
+    # S -> L = R | R
+    # L -> *R | id
+    # R -> L
+
+    Sp, S, L, R = get_nonterminals("S'", "S", "L", "R")
+    times, eq, id = get_terminals("*", "=", "id")
+
+    sp_prod = Production(Sp, [S])
+    s_prod = Production(S, [(L, eq, R), R])
+    l_prod = Production(L, [(times, R), id])
+    r_prod = Production(R, [L])
+
+    return Grammar((sp_prod, s_prod, l_prod, r_prod), Sp)
+
+
+def test_lr1_automata_rejects_unaugmented_grammar() -> None:
+    S, A = get_nonterminals("S", "A")
+    (a,) = get_terminals("a")
+
+    g = Grammar([Production(S, [(A, S), a]), Production(A, [a])], S)
+
+    with pytest.raises(ValueError):
+        LR1Automata(g)
+
+
+def test_lr1_automata_splits_lalr_states() -> None:
+    g = _pointer_grammar()
+    Sp, S, L, R = get_nonterminals("S'", "S", "L", "R")
+    times, eq, id = get_terminals("*", "=", "id")
+    end_of_chain = get_end_of_chain(g)
+
+    automata = LR1Automata(g)
+    (l_to_id,) = items_from_production(g.get_production(L))[1:]
+
+    assert len(automata.states) == 14
+    assert LR1Set({l_to_id.next().to_lr1(end_of_chain)}) in automata.states
+    assert LR1Set(l_to_id.next().to_lr1([eq, end_of_chain])) in automata.states
+
+
+def test_lr1_automata_closure_matches_lr1_set_closure() -> None:
+    g = expression_grammar()
+    automata = LR1Automata(g)
+
+    for state in automata.states:
+        assert set(state) == set(LR1Set(state.kernel).closure(g))
+
+
+@pytest.mark.parametrize("grammar", [_pointer_grammar(), expression_grammar()])
+def test_lr1_core_merging_reproduces_lalr(grammar: Grammar) -> None:
+    merged = LR1Automata(grammar, merge_cores=True)
+    lalr = LALRAutomata(grammar)
+
+    assert merged.start_state == lalr.start_state
+    assert merged.states == lalr.states
+    assert merged.transition_count == lalr.transition_count
+
+    merged_table = merged.compute_parsing_table(default_reductions=True)
+    lalr_table = lalr.compute_parsing_table(default_reductions=True)
+    assert set(merged_table.entries()) == set(lalr_table.entries())
+    assert merged_table.default_reductions == lalr_table.default_reductions
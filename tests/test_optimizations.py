@@ -0,0 +1,159 @@
+from compilers.grammar.productions import ProductionLine
+from compilers.parser import actions
+from compilers.parser.lalr_automata import LALRAutomata
+from compilers.parser.lr_items import LRItem
+from compilers.parser.lr_sets import LR0Set
+from compilers.parser.optimizations import (
+    eliminate_unit_reductions,
+    get_unit_reduction,
+    is_unit_production,
+    minimize_states,
+)
+from compilers.parser.tables import LRParsingTable
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def test_unit_production_detection() -> None:
+    A, B = get_nonterminals("A", "B")
+    (a,) = get_terminals("a")
+
+    assert is_unit_production(ProductionLine(A, (B,)))
+    assert not is_unit_production(ProductionLine(A, (a,)))
+    assert not is_unit_production(ProductionLine(A, (B, B)))
+    assert not is_unit_production(ProductionLine(A, ()))
+
+
+def test_unit_reduction_state_detection() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table()
+
+    t_to_f_state = automata.get_transition(automata.start_state, F)
+    e_to_t_state = automata.get_transition(automata.start_state, T)
+
+    t_to_f = g.get_production_id(ProductionLine(T, (F,)))
+    assert get_unit_reduction(table, t_to_f_state, g) == t_to_f
+    # E -> T. shares its state with T -> T.*F, so it depends on the lookahead
+    assert get_unit_reduction(table, e_to_t_state, g) is None
+
+
+def test_unit_reductions_bypassed_through_goto() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table()
+    optimized = eliminate_unit_reductions(table, g)
+
+    start = automata.start_state
+    e_to_t_state = automata.get_transition(start, T)
+    t_to_f = g.get_production_id(ProductionLine(T, (F,)))
+
+    assert optimized[start, F] == actions.Goto(e_to_t_state, (t_to_f,))
+    assert optimized[start, F].bypassed == (t_to_f,)
+    assert optimized[start, T] == table[start, T]
+    assert optimized[start, T].bypassed == ()
+
+
+def test_unit_reduction_elimination_keeps_actions() -> None:
+    g = expression_grammar()
+    table = LALRAutomata(g).compute_parsing_table()
+    optimized = eliminate_unit_reductions(table, g)
+
+    for state, symbol, action in table.entries():
+        if not isinstance(action, actions.Goto):
+            assert optimized[state, symbol] == action
+
+
+def test_default_reductions_replace_consistent_rows() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table(default_reductions=True)
+
+    start = automata.start_state
+    num_state = automata.get_transition(start, num)
+    e_to_t_state = automata.get_transition(start, T)
+    f_to_num = actions.Reduce(g.get_production_id(ProductionLine(F, (num,))))
+
+    assert table.get_default_reduction(num_state) == f_to_num
+    assert table.row(num_state) == {}
+    assert table[num_state, open] == f_to_num
+
+    # Shifts on '*' so its reduction depends on the lookahead
+    assert table.get_default_reduction(e_to_t_state) is None
+    assert isinstance(table[e_to_t_state, open], actions.Error)
+
+
+def test_default_reductions_keep_inconsistent_rows() -> None:
+    g = expression_grammar()
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table()
+    with_defaults = automata.compute_parsing_table(default_reductions=True)
+
+    for state, symbol, action in table.entries():
+        assert with_defaults[state, symbol] == action
+
+
+def test_minimization_merges_equivalent_states() -> None:
+    # S -> aA | bA
+    # A -> #
+
+    S, A = get_nonterminals("S", "A")
+    a, b, end_of_chain = get_terminals("a", "b", "$")
+
+    s_to_a = LRItem(ProductionLine(S, (a, A)))
+    s_to_b = LRItem(ProductionLine(S, (b, A)))
+    a_to_epsilon = 1  # Id of A -> #
+
+    start = LR0Set({s_to_a, s_to_b})
+    after_a = LR0Set({s_to_a.next()})
+    after_b = LR0Set({s_to_b.next()})
+    final = LR0Set({s_to_a.next(2), s_to_b.next(2)})
+    unreachable = LR0Set({s_to_a.next(2)})
+
+    table = LRParsingTable[LR0Set]()
+    table[start, a] = actions.Shift(after_a)
+    table[start, b] = actions.Shift(after_b)
+    for state in (after_a, after_b):
+        table[state, end_of_chain] = actions.Reduce(a_to_epsilon)
+        table[state, A] = actions.Goto(final)
+    table[final, end_of_chain] = actions.Accept()
+    table[unreachable, end_of_chain] = actions.Accept()
+
+    minimized, representatives = minimize_states(table, start)
+
+    assert representatives[start] == start
+    assert representatives[after_a] == representatives[after_b]
+    assert unreachable not in representatives
+    assert len(set(minimized.states)) == 3
+
+    merged = representatives[after_a]
+    assert minimized[start, a] == actions.Shift(merged)
+    assert minimized[start, b] == actions.Shift(merged)
+    assert minimized[merged, A] == actions.Goto(final)
+
+
+def test_minimization_keeps_distinct_states() -> None:
+    g = expression_grammar()
+    automata = LALRAutomata(g)
+    table = automata.compute_parsing_table()
+
+    minimized, representatives = minimize_states(table, automata.start_state)
+
+    assert set(minimized.states) == automata.states
+    assert all(state == target for state, target in representatives.items())
+
+
+def test_minimization_drops_bypassed_states() -> None:
+    g = expression_grammar()
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    automata = LALRAutomata(g)
+    table = eliminate_unit_reductions(automata.compute_parsing_table(), g)
+
+    minimized, _ = minimize_states(table, automata.start_state)
+
+    t_to_f_state = automata.get_transition(automata.start_state, F)
+    assert t_to_f_state not in set(minimized.states)
+    assert len(set(minimized.states)) == len(automata.states) - 1
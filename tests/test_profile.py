@@ -0,0 +1,80 @@
+from compilers.grammar.grammar import Grammar
+from compilers.lexer.tokens import Token
+from compilers.parser.build import BuildOptions, ParserArtifact, build_parser_artifact
+from compilers.parser.compiled import ERROR
+from compilers.parser.compression import CombTable
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+from compilers.parser.profile import apply_profile, record_profile
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _corpus(g: Grammar) -> list[list[Token]]:
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    end_of_chain = Token(get_end_of_chain(g))
+    return [
+        [Token(num, 1), Token(plus), Token(num, 2), end_of_chain],
+        [Token(num, 1), Token(plus), Token(num, 2), Token(plus), Token(num, 3)]
+        + [end_of_chain],
+        [Token(open), Token(num, 1), Token(close), Token(mult), Token(num, 2)]
+        + [end_of_chain],
+    ]
+
+
+def test_profile_counts_table_usage() -> None:
+    g = expression_grammar()
+    (num,) = get_terminals("num")
+    (F,) = get_nonterminals("F")
+    table = build_parser_artifact(g, keep_states=False).table
+
+    profile = record_profile(table, _corpus(g))
+
+    assert profile.state_counts[0] == 3
+    assert profile.terminal_counts[table.terminal_ids[num]] == 7
+    assert profile.terminal_counts.most_common(1)[0][0] == table.terminal_ids[num]
+    assert profile.nonterminal_counts[table.nonterminal_ids[F]] == 8
+    assert sum(profile.action_counts.values()) == sum(
+        profile.terminal_counts.values()
+    )
+
+
+def test_profiled_table_parses_the_same() -> None:
+    g = expression_grammar()
+    options = BuildOptions(bypass_unit_reductions=True)
+    artifact = build_parser_artifact(g, options, keep_states=False)
+    profile = record_profile(artifact.table, _corpus(g))
+
+    profiled = apply_profile(artifact.table, profile)
+    parser = LALRParser.from_artifact(ParserArtifact(g, profiled))
+    reference = LALRParser(g, bypass_unit_reductions=True)
+
+    for chain in _corpus(g):
+        assert parser.parse(chain) == reference.parse(chain)
+    assert profiled.unit_chains.keys() != artifact.table.unit_chains.keys()
+
+
+def test_profiled_table_puts_hot_entries_first() -> None:
+    g = expression_grammar()
+    (num,) = get_terminals("num")
+    table = build_parser_artifact(g, keep_states=False).table
+    profile = record_profile(table, _corpus(g))
+
+    profiled = apply_profile(table, profile)
+    counts = profile.state_counts
+    # Ties keep state order
+    hottest_state = min((s for s in counts if s != 0), key=lambda s: (-counts[s], s))
+    profiled_counts = record_profile(profiled, _corpus(g)).state_counts
+
+    assert profiled.terminals[0] == num
+    assert profiled.terminal_ids[num] == 0
+    assert profiled_counts[1] == counts[hottest_state]
+    assert [profiled_counts[state] for state in range(1, profiled.state_count)] == (
+        sorted(counts[state] for state in range(1, table.state_count))[::-1]
+    )
+
+    comb = CombTable(profiled, row_order=range(profiled.state_count))
+    for state in range(profiled.state_count):
+        for terminal in range(len(profiled.terminals)):
+            expected = profiled.action(state, terminal)
+            if expected != ERROR:
+                assert comb.action(state, terminal) == expected
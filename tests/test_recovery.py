@@ -0,0 +1,79 @@
+from compilers.lexer.tokens import Token
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import (
+    LALRParser,
+    NoEndOfInputTokenError,
+    UnexpectedTokenError,
+)
+from compilers.parser.recovery import parse_with_recovery
+from tests.utils import expression_grammar, get_terminals
+
+
+def test_recovery_without_errors_matches_parse() -> None:
+    g = expression_grammar()
+    plus, num = get_terminals("+", "num")
+    parser = LALRParser(g)
+
+    chain = [Token(num, "1"), Token(plus), Token(num, "2"), Token(get_end_of_chain(g))]
+    result = parse_with_recovery(parser, chain, [plus])
+
+    assert result.tree == parser.parse(chain)
+    assert result.errors == []
+    assert result.statistics.tokens_skipped == 0
+
+
+def test_recovery_collects_every_error() -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g)
+
+    # 1 + * 2 + 3 ) + 4
+    chain = [
+        Token(num, "1"),
+        Token(plus),
+        Token(mult),
+        Token(num, "2"),
+        Token(plus),
+        Token(num, "3"),
+        Token(close),
+        Token(plus),
+        Token(num, "4"),
+        end_of_chain,
+    ]
+    result = parse_with_recovery(parser, chain, [plus])
+
+    assert [error.index for error in result.errors] == [2, 6]  # type: ignore
+    assert isinstance(result.errors[0], UnexpectedTokenError)
+    assert result.errors[0].expected == {open, num}
+    # Skips "* 2" and ")", and pops the "+" before "*"
+    assert result.statistics.tokens_skipped == 3
+    assert result.statistics.states_popped == 1
+    # Recovered as if the chain was 1 + 3 + 4
+    recovered = [Token(num), Token(plus), Token(num), Token(plus), Token(num)]
+    assert result.tree == parser.parse(recovered + [end_of_chain])
+
+    capped = parse_with_recovery(parser, chain, [plus], max_errors=1)
+    assert capped.tree is None
+    assert len(capped.errors) == 1
+
+
+def test_recovery_at_end_of_chain() -> None:
+    g = expression_grammar()
+    plus, open, num = get_terminals("+", "(", "num")
+    end_of_chain = Token(get_end_of_chain(g))
+    parser = LALRParser(g)
+
+    result = parse_with_recovery(parser, [Token(num), Token(plus), end_of_chain])
+    assert result.tree == parser.parse([Token(num), end_of_chain])
+    assert [error.index for error in result.errors] == [2]  # type: ignore
+
+    # No state on the stack can act on the end of chain
+    result = parse_with_recovery(parser, [Token(open), end_of_chain])
+    assert result.tree is None
+    assert len(result.errors) == 1
+    assert result.statistics.states_popped == 0
+
+    result = parse_with_recovery(parser, [Token(num), Token(plus), Token(plus)])
+    assert result.tree is None
+    assert isinstance(result.errors[-1], NoEndOfInputTokenError)
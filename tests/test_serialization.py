@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser.build import BuildOptions, ParserArtifact, build_parser_artifact
+from compilers.parser.compiled import CompiledTable
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+from compilers.parser.serialization import (
+    VERSION,
+    ArtifactError,
+    dumps,
+    get_artifact_path,
+    load,
+    load_or_build,
+    loads,
+)
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _assert_same_table(loaded: CompiledTable, table: CompiledTable) -> None:
+    assert loaded.terminals == table.terminals
+    assert loaded.nonterminals == table.nonterminals
+    assert loaded.productions == table.productions
+    assert list(loaded.actions) == list(table.actions)
+    assert list(loaded.gotos) == list(table.gotos)
+    assert list(loaded.default_actions) == list(table.default_actions)
+    assert loaded.unit_chains == table.unit_chains
+    assert loaded.conflicts == table.conflicts
+    assert loaded.expected_terminals == table.expected_terminals
+
+
+def test_artifact_round_trips() -> None:
+    g = expression_grammar()
+    options = BuildOptions(bypass_unit_reductions=True)
+    table = build_parser_artifact(g, options).table
+
+    loaded = loads(dumps(table, g), g)
+
+    _assert_same_table(loaded, table)
+    assert isinstance(loaded.actions, memoryview)
+
+
+def test_artifact_rejects_other_grammar() -> None:
+    g = expression_grammar()
+    (S,) = get_nonterminals("S")
+    (a,) = get_terminals("a")
+    other = Grammar([Production(S, [a])], S)
+    data = dumps(build_parser_artifact(g).table, g)
+
+    with pytest.raises(ArtifactError):
+        loads(data, other)
+
+
+def test_artifact_rejects_unknown_format() -> None:
+    g = expression_grammar()
+    data = bytearray(dumps(build_parser_artifact(g).table, g))
+
+    with pytest.raises(ArtifactError):
+        loads(b"not an artifact")
+
+    data[8] += 1  # Version
+    with pytest.raises(ArtifactError):
+        loads(data)
+
+
+def test_artifact_rejects_truncated_buffers() -> None:
+    g = expression_grammar()
+    data = dumps(build_parser_artifact(g).table, g)
+
+    for length in range(len(data)):
+        with pytest.raises(ArtifactError):
+            loads(data[:length], g)
+
+
+def test_parser_runs_on_memory_mapped_artifact(tmp_path: Path) -> None:
+    g = expression_grammar()
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+    input = [Token(open), Token(num), Token(plus), Token(num), Token(close)]
+    input += [Token(mult), Token(num), Token(get_end_of_chain(g))]
+
+    table = load_or_build(tmp_path, g)
+    assert get_artifact_path(tmp_path, g).exists()
+    assert load_or_build(tmp_path, g).nbytes == table.nbytes
+
+    parser = LALRParser.from_artifact(ParserArtifact(g, table))
+    assert parser.parse(input) == LALRParser(g).parse(input)
+
+    reloaded = load(get_artifact_path(tmp_path, g), g)
+    _assert_same_table(reloaded, table)
+
+
+def test_load_or_build_replaces_unreadable_artifacts(tmp_path: Path) -> None:
+    g = expression_grammar()
+    path = get_artifact_path(tmp_path, g)
+    assert f"v{VERSION}" in path.name
+
+    path.write_bytes(b"not an artifact")
+    table = load_or_build(tmp_path, g)
+    _assert_same_table(table, build_parser_artifact(g).table)
+    _assert_same_table(load(path, g), table)
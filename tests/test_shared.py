@@ -0,0 +1,94 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from compilers.grammar.grammar import Grammar
+from compilers.grammar.productions import Production
+from compilers.lexer.tokens import Token
+from compilers.parser import shared as shared_module
+from compilers.parser.ast import ASTNode
+from compilers.parser.build import ParserArtifact, build_parser_artifact
+from compilers.parser.lalr_automata import get_end_of_chain
+from compilers.parser.parser import LALRParser
+from compilers.parser.serialization import ArtifactError
+from compilers.parser.shared import attach_table, publish_table
+from tests.utils import expression_grammar, get_nonterminals, get_terminals
+
+
+def _expression_input(g: Grammar) -> list[Token]:
+    plus, mult, num = get_terminals("+", "*", "num")
+    input = [Token(num, 1), Token(plus), Token(num, 2), Token(mult), Token(num, 3)]
+    return input + [Token(get_end_of_chain(g))]
+
+
+def _parse_in_worker(name: str) -> ASTNode:
+    g = expression_grammar()
+    table = attach_table(name, g)
+    assert memoryview(table.actions).readonly
+    parser = LALRParser.from_artifact(ParserArtifact(g, table))
+    return parser.parse(_expression_input(g))
+
+
+def test_workers_parse_with_shared_table() -> None:
+    g = expression_grammar()
+    table = build_parser_artifact(g, keep_states=False).table
+
+    shared_memory = publish_table(table, g)
+    try:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            trees = list(executor.map(_parse_in_worker, [shared_memory.name] * 4))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+    expected = LALRParser(g).parse(_expression_input(g))
+    assert all(tree == expected for tree in trees)
+
+
+def test_shared_table_checks_grammar() -> None:
+    g = expression_grammar()
+    (S,) = get_nonterminals("S")
+    (a,) = get_terminals("a")
+    other = Grammar([Production(S, [a])], S)
+    table = build_parser_artifact(g, keep_states=False).table
+
+    shared_memory = publish_table(table, g)
+    try:
+        with pytest.raises(ArtifactError):
+            attach_table(shared_memory.name, other)
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def test_attached_table_outlives_block() -> None:
+    g = expression_grammar()
+    table = build_parser_artifact(g, keep_states=False).table
+
+    shared_memory = publish_table(table, g)
+    attached = attach_table(shared_memory.name, g)
+    shared_memory.close()
+    shared_memory.unlink()
+
+    parser = LALRParser.from_artifact(ParserArtifact(g, attached))
+    assert parser.parse(_expression_input(g)) == LALRParser(g).parse(
+        _expression_input(g)
+    )
+
+
+def test_attach_table_without_shared_memory_files(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    g = expression_grammar()
+    table = build_parser_artifact(g, keep_states=False).table
+    monkeypatch.setattr(shared_module, "_SHARED_MEMORY_DIRECTORY", str(tmp_path))
+
+    # The table is not silently copied into every process instead
+    shared_memory = publish_table(table, g)
+    try:
+        with pytest.raises(OSError):
+            attach_table(shared_memory.name, g)
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
@@ -1,6 +1,8 @@
 from typing import Sequence
 
+from compilers.grammar.grammar import Grammar
 from compilers.grammar.nonterminals import Nonterminal
+from compilers.grammar.productions import Production
 from compilers.grammar.terminals import Terminal
 
 
@@ -10,3 +12,20 @@ def get_terminals(*values: str) -> Sequence[Terminal]:
 
 def get_nonterminals(*values: str) -> Sequence[Nonterminal]:
     return tuple(Nonterminal(value) for value in values)
+
+
+def expression_grammar() -> Grammar:
+    # S -> E
+    # E -> E + T | T
+    # T -> T * F | F
+    # F -> (E) | num
+
+    S, E, T, F = get_nonterminals("S", "E", "T", "F")
+    plus, mult, open, close, num = get_terminals("+", "*", "(", ")", "num")
+
+    s_prod = Production(S, [E])
+    e_prod = Production(E, [(E, plus, T), T])
+    t_prod = Production(T, [(T, mult, F), F])
+    f_prod = Production(F, [(open, E, close), num])
+
+    return Grammar([s_prod, e_prod, t_prod, f_prod], S)